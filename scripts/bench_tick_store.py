@@ -0,0 +1,33 @@
+"""
+Per-tick cost of a TickStore recorder against an empty Python call.
+
+Run from the repository root: python -m scripts.bench_tick_store
+"""
+from pathlib import Path
+import tempfile
+import time
+from src.trading.tick_store import TickStore
+
+def empty(ts: float, bid: float, ask: float, last: float, size: float) -> None:
+    pass
+
+def benchmark(ticks: int = 1_000_000) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        store = TickStore(Path(directory), capacity=1 << 16)
+        results = {}
+        for name, record in (('empty call', empty), ('recorder', store.recorder('X'))):
+            best = float('inf')
+            for run in range(5):
+                # 1 kHz within one exchange day, so only spills, no rollovers
+                stamps = [1.7e9 + (run * ticks + i) * 1e-3 for i in range(ticks)]
+                start = time.perf_counter()
+                for ts in stamps:
+                    record(ts, 100.0, 100.5, 100.25, 1.0)
+                best = min(best, time.perf_counter() - start)
+            results[name] = best / ticks * 1e9
+        store.close()
+    for name, ns in results.items():
+        print(f"{name}: {ns:,.0f} ns/tick")
+
+if __name__ == "__main__":
+    benchmark()
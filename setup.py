@@ -7,6 +7,7 @@ setup(
     install_requires=[
         "ib_insync>=0.9.70",
         "pandas>=1.5.0",
+        "numpy>=1.23.0",
         "pyautogui>=0.9.53",
         "Pillow>=9.2.0",
         "python-dotenv>=0.21.0",
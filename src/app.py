@@ -1,26 +1,64 @@
-from typing import Optional, Dict
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Dict, Set, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import signal
 import sys
 import os
+import tempfile
 from datetime import datetime
+from pathlib import Path
+from .config import DaemonSettings, TradingConfig
 from .trading.market import MarketData
 from .trading.order import OrderManager
+from .trading.session import IBSession
+from .trading.triggers import DropTrigger
+from .trading.bar_aggregator import Bar, BarAggregator
+from .trading.history import DailyBarCache
+from .strategy.drop_ladder import DropLadder, LadderOrder
+from .strategy.baseline import RollingPeak
 from .utils.logger import setup_logger
 from .utils.reporter import Reporter
-from .utils.screenshotter import Screenshotter
+from .utils.screenshotter import Screenshotter, display_available
+from .utils.chart_renderer import ChartRenderer
 from .utils.trading_hours import TradingHours
+from .utils.clock import Clock, SimulatedClock
+from .utils.checkpoint import Checkpointer
 from .utils.email_sender import EmailSender, TradingSummary
 from .exceptions.trading_exceptions import TradingException
 
+if TYPE_CHECKING:
+    from .trading.simulator import SimulatorConfig
+
 class TradingApp:
-    def __init__(self):
-        self.logger = setup_logger("trading_app")
-        self.market = MarketData()
-        self.order_manager = OrderManager()
-        self.reporter = Reporter()
-        self.screenshotter = Screenshotter()
-        self.trading_hours = TradingHours()
-        self.email_sender = EmailSender(raise_on_missing_credentials=False)
+    def __init__(self, async_mode: bool = False, clock: Optional[Clock] = None,
+                 ib: Optional[Any] = None, daemon: Optional[DaemonSettings] = None,
+                 config: Optional[TradingConfig] = None):
+        self.async_mode = async_mode
+        # Unattended: prompts are answered from these settings and the app
+        # sleeps through closed markets instead of waiting for input
+        self.daemon = daemon
+        self.config = config or TradingConfig()
+        self.logger = setup_logger("trading_app", self.config)
+        # All time reads and sleeps go through one clock so sessions can be replayed
+        self.clock = clock or getattr(ib, 'clock', None) or Clock()
+        # One connection serves both market data and orders
+        self.session = IBSession(self.config, ib=ib, clock=self.clock)
+        self.market = MarketData(self.session)
+        self.order_manager = OrderManager(self.session)
+        self.reporter = Reporter(clock=self.clock, config=self.config)
+        self.screenshotter = self._create_screenshotter()
+        self.trading_hours = TradingHours(clock=self.clock)
+        self.email_sender = EmailSender(raise_on_missing_credentials=False, clock=self.clock,
+                                        records_dir=self.config.RECORDS_DIR)
         self.spx_base_price: Optional[float] = None
+        self.ladder = DropLadder.from_config(self.config, [])
+        # Levels whose trade failed, kept fired until they may be retried
+        self._held: List[Tuple[float, LadderOrder]] = []
+        self.drop_trigger: Optional[DropTrigger] = None
+        self.bars = BarAggregator(self.market)
+        self.history = DailyBarCache(self.market, calendar=self.trading_hours.calendar)
+        self.baseline: Optional[RollingPeak] = None
+        self.bars.barClosedEvent += self._on_bar_closed
         self.trading_summary: TradingSummary = {
             # Required fields
             'total_trades': 0,
@@ -32,6 +70,58 @@ class TradingApp:
             'total_spx_drop': None,
             'entry_price': None
         }
+        # Async mode: slow I/O runs on dedicated single-thread executors so
+        # that each kind of work stays ordered but never blocks the event loop
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._background: Set[asyncio.Future] = set()
+        # Snapshots plus a write-ahead log of fired levels and fills
+        self.checkpoint = Checkpointer(self.config.CHECKPOINT_DIR)
+        self._last_checkpoint = self.clock.time()
+        self._session_day: Optional[str] = None
+
+    @classmethod
+    def simulated(cls, start: Optional[float] = None, speed: Optional[float] = None,
+                  sim_config: Optional["SimulatorConfig"] = None,
+                  async_mode: bool = False,
+                  daemon: Optional[DaemonSettings] = None,
+                  records_dir: Optional[Path] = None) -> "TradingApp":
+        """
+        App wired to the offline gateway on virtual time starting at ``start``
+        (epoch seconds). speed=None replays as fast as events are processed.
+        Records (ticks, reports, checkpoints, ...) go to records_dir, by
+        default a fresh temporary directory, never the live trading records.
+        """
+        from .trading.simulator import SimulatedIB  # Only needed offline
+
+        records_dir = Path(records_dir or tempfile.mkdtemp(prefix="trading-sim-"))
+        clock = SimulatedClock(start, speed)
+        app = cls(async_mode=async_mode, clock=clock, ib=SimulatedIB(sim_config, clock),
+                  daemon=daemon, config=TradingConfig().relocated(records_dir))
+        app.logger.info(f"Simulation records are kept in {records_dir}")
+        return app
+
+    @classmethod
+    def from_env(cls) -> "TradingApp":
+        """
+        Build the app from TRADING_ASYNC_MODE, TRADING_SIMULATION_SPEED and,
+        with TRADING_DAEMON set, the DaemonSettings variables
+        """
+        async_mode = os.getenv('TRADING_ASYNC_MODE', '').lower() in ('1', 'true', 'yes')
+        daemon = DaemonSettings.from_env()
+        speed = os.getenv('TRADING_SIMULATION_SPEED', '').strip().lower()
+        if not speed:
+            return cls(async_mode=async_mode, daemon=daemon)
+        return cls.simulated(speed=None if speed == 'max' else float(speed),
+                             async_mode=async_mode, daemon=daemon)
+
+    def _create_screenshotter(self) -> Union[Screenshotter, ChartRenderer]:
+        """Screen grabs when a display exists, otherwise charts from recorded ticks"""
+        mode = self.config.SCREENSHOT_MODE.lower()
+        if mode == "chart" or (mode == "auto" and not display_available()):
+            self.logger.info("Using headless chart snapshots for trade evidence")
+            return ChartRenderer(self.market.get_ticks, clock=self.clock,
+                                 config=self.config)
+        return Screenshotter(self.config, clock=self.clock)
 
     def connect_to_server(self, port: int) -> bool:
         """Connect to IBKR server"""
@@ -49,13 +139,200 @@ class TradingApp:
         """Verify connection status"""
         return self.market.is_connected()
 
+    async def _seed_baseline_async(self) -> Optional[float]:
+        """Seed the rolling SPX peak from cached daily bars; None if not in rolling_peak mode"""
+        if self.config.BASELINE_MODE != "rolling_peak":
+            return None
+        try:
+            window = self.config.BASELINE_WINDOW_DAYS
+            today = self.clock.now(self.trading_hours.et_timezone).date()
+            bars = await self.history.get_daily_bars_async("SPX", window, today)
+            self.baseline = RollingPeak(window)
+            peak = self.baseline.seed((bar.day, bar.high) for bar in bars)
+            self.logger.info(f"SPX {window}-day rolling peak: {peak}")
+            return peak
+        except Exception as e:
+            self.logger.warning(f"Could not seed rolling peak, using first price: {str(e)}")
+            self.baseline = None
+            return None
+
+    def _set_base_price(self, price: float) -> None:
+        """Set the SPX drop baseline and checkpoint it on the next loop iteration"""
+        self.spx_base_price = price
+        self.trading_summary['spx_base_price'] = price
+        if self.drop_trigger is not None:
+            self.drop_trigger.base_price = price
+        self.logger.info(f"SPX base price set: ${price}")
+        self._last_checkpoint = float('-inf')
+
+    def _trading_day(self) -> str:
+        return self.clock.now(self.trading_hours.et_timezone).date().isoformat()
+
+    def _checkpoint_state(self) -> Dict[str, Any]:
+        return {
+            'day': self._trading_day(),
+            'saved_at': self.clock.time(),
+            'spx_base_price': self.spx_base_price,
+            'trading_summary': dict(self.trading_summary),
+            'fired': {symbol: self._executed_levels(symbol) for symbol in self.ladder.symbols},
+            'held': [[retry_at, *order] for retry_at, order in self._held],
+            'transactions': [
+                dict(transaction, date=transaction['date'].isoformat())
+                for transaction in list(self.reporter.transactions)
+            ]
+        }
+
+    def _executed_levels(self, symbol: str) -> List[float]:
+        """Fired levels of a symbol, without those held back after a failed trade"""
+        held = {order.level for _, order in self._held if order.symbol == symbol}
+        return [level for level in self.ladder.fired_levels(symbol) if level not in held]
+
+    def save_checkpoint(self) -> None:
+        """Snapshot the session state; in async mode this runs on the reports executor"""
+        try:
+            seq = self.checkpoint.seq  # Events after this are replayed on restore
+            self.checkpoint.save(self._checkpoint_state(), seq)
+            self._last_checkpoint = self.clock.time()
+        except Exception as e:
+            self.logger.error(f"Error saving checkpoint: {str(e)}")
+
+    def _checkpoint_due(self) -> bool:
+        return self.clock.time() - self._last_checkpoint >= self.config.CHECKPOINT_INTERVAL
+
+    def restore_checkpoint(self) -> bool:
+        """Resume today's session from the latest checkpoint; False if there is none"""
+        try:
+            snapshot, events = self.checkpoint.load()
+        except Exception as e:
+            self.logger.error(f"Error loading checkpoint: {str(e)}")
+            return False
+        today = self._trading_day()
+        events = [event for event in events if event.get('day') == today]
+        if snapshot is not None and snapshot.get('day') == today:
+            trading_mode = self.trading_summary['trading_mode']
+            self.trading_summary.update(snapshot['trading_summary'])
+            self.trading_summary['trading_mode'] = trading_mode
+            # A rolling peak is rebuilt from the cached daily bars instead
+            if snapshot['spx_base_price'] and self.config.BASELINE_MODE == "first_price":
+                self._set_base_price(snapshot['spx_base_price'])
+            for symbol, levels in snapshot['fired'].items():
+                for level in levels:
+                    self.ladder.mark_fired(symbol, level)
+            for retry_at, *order in snapshot.get('held', []):
+                self._hold(LadderOrder(*order), retry_at)
+            self.reporter.restore([
+                dict(transaction, date=datetime.fromisoformat(transaction['date']))
+                for transaction in snapshot['transactions']
+            ])
+        elif not events:
+            return False
+        for event in events:
+            self._apply_event(event)
+        self.logger.info(
+            f"Restored checkpoint: {self.trading_summary['total_trades']} trades, "
+            f"SPX base {self.spx_base_price}, {len(events)} logged events replayed"
+        )
+        return True
+
+    def _apply_event(self, event: Dict[str, Any]) -> None:
+        if event['type'] == 'fired':
+            self.ladder.mark_fired(event['symbol'], event['level'])
+        elif event['type'] == 'released':
+            if 'retry_at' in event:
+                order = LadderOrder(event['symbol'], event['level'], event['quantity'])
+                self._hold(order, event['retry_at'])
+            else:
+                self.ladder.release(event['symbol'], event['level'])
+        elif event['type'] == 'fill':
+            self.trading_summary['total_trades'] += 1
+            self.trading_summary['entry_price'] = event['price']
+            self.trading_summary['symbol'] = event['symbol']
+            self.reporter.restore([{
+                'date': datetime.fromisoformat(event['date']),
+                'symbol': event['symbol'],
+                'price': event['price'],
+                'quantity': event['quantity'],
+                'total_cost': event['price'] * event['quantity'],
+                'spx_drop_percentage': event['drop_level'],
+                'screenshot_path': event['screenshot_path']
+            }])
+
+    def _begin_session(self) -> None:
+        """Start each trading day with a fresh ladder, SPX baseline and report"""
+        today = self._trading_day()
+        if self._session_day is not None and today != self._session_day:
+            self.logger.info(f"New trading session {today}: resetting drop ladder and SPX baseline")
+            self._stop_drop_trigger()
+            self.ladder.reset()
+            self._held.clear()
+            # Daily emails and checkpoints only cover today's transactions
+            self.reporter.start_session()
+            self.spx_base_price = None
+            self.baseline = None
+            self.trading_summary.update({
+                'total_trades': 0,
+                'spx_base_price': None,
+                'spx_final_price': None,
+                'total_spx_drop': None,
+                'entry_price': None
+            })
+        self._session_day = today
+
+    def _evaluate_ladder(self, spx_drop: float) -> List[LadderOrder]:
+        """
+        Newly reached ladder levels, logged before any order is placed so a
+        crash mid-order never buys a level twice. Levels whose trade failed
+        are released first once TRADE_RETRY_INTERVAL has passed.
+        """
+        now = self.clock.time()
+        for retry_at, order in list(self._held):
+            if retry_at <= now:
+                self._held.remove((retry_at, order))
+                self.ladder.release(order.symbol, order.level)
+        orders = self.ladder.evaluate(spx_drop)
+        for order in orders:
+            self.checkpoint.log({
+                'type': 'fired', 'day': self._trading_day(),
+                'symbol': order.symbol, 'level': order.level
+            })
+        return orders
+
+    def _trade_failed(self, order: LadderOrder) -> None:
+        """
+        Un-fire the level of an order that was not executed (insufficient
+        funds, no price, market closed, rejected or unfilled). It stays held
+        for TRADE_RETRY_INTERVAL so a lasting failure is not retried on every tick;
+        the hold is logged, so a restart does not cut it short.
+        """
+        retry_at = self.clock.time() + self.config.TRADE_RETRY_INTERVAL
+        self.checkpoint.log({
+            'type': 'released', 'day': self._trading_day(),
+            'symbol': order.symbol, 'level': order.level,
+            'quantity': order.quantity, 'retry_at': retry_at
+        })
+        self._hold(order, retry_at)
+        self.logger.warning(
+            f"{order.level:g}% drop strategy for {order.symbol} was not executed; "
+            f"retrying in {self.config.TRADE_RETRY_INTERVAL:g}s if the drop holds"
+        )
+
+    def _hold(self, order: LadderOrder, retry_at: float) -> None:
+        """Keep a failed level fired until retry_at; _evaluate_ladder releases it"""
+        if (retry_at, order) in self._held:
+            return  # Restored from both the snapshot and the log
+        self.ladder.mark_fired(order.symbol, order.level)
+        self._held.append((retry_at, order))
+
+    def _all_executed(self) -> bool:
+        return self.ladder.all_fired() and not self._held
+
     def monitor_spx(self) -> float:
         """Monitor SPX price and calculate drop percentage"""
         if self.spx_base_price is None:
-            self.spx_base_price = self.market.get_market_price("SPX")
-            if self.spx_base_price:
-                self.trading_summary['spx_base_price'] = self.spx_base_price
-            self.logger.info(f"SPX base price set: ${self.spx_base_price}")
+            base_price = (self.session.run(self._seed_baseline_async())
+                          or self.market.get_market_price("SPX"))
+            if base_price:
+                self._set_base_price(base_price)
         
         current_price = self.market.get_market_price("SPX")
         if current_price and self.spx_base_price:
@@ -64,11 +341,76 @@ class TradingApp:
             return drop
         return 0.0
 
+    def _ensure_drop_trigger(self) -> Optional[DropTrigger]:
+        """Start evaluating SPX drops on ticks once a base price is known"""
+        if self.drop_trigger is None and self.spx_base_price:
+            self.drop_trigger = DropTrigger(
+                self.market, "SPX", self.spx_base_price,
+                self.ladder,
+                min_interval=self.config.TRIGGER_MIN_INTERVAL,
+                confirm_ticks=self.config.TRIGGER_CONFIRM_TICKS
+            )
+            self.drop_trigger.start()
+        return self.drop_trigger
+
+    def _watch_symbols(self, symbols: List[str]) -> None:
+        """Add symbols to the ladder and build bars for them and SPX"""
+        for symbol in symbols:
+            self.ladder.add_symbol(symbol)
+        for symbol in ["SPX"] + symbols:
+            try:
+                self.bars.watch(symbol)
+            except Exception as e:
+                self.logger.warning(f"Could not build bars for {symbol}: {str(e)}")
+
+    async def _watch_symbols_async(self, symbols: List[str]) -> None:
+        """Async variant of _watch_symbols"""
+        for symbol in symbols:
+            self.ladder.add_symbol(symbol)
+        for symbol in ["SPX"] + symbols:
+            try:
+                await self.bars.watch_async(symbol)
+            except Exception as e:
+                self.logger.warning(f"Could not build bars for {symbol}: {str(e)}")
+
+    def _on_bar_closed(self, symbol: str, interval: float, bar: Bar) -> None:
+        if symbol == "SPX" and interval == 60:
+            self.trading_summary['spx_final_price'] = bar.close
+            if self.baseline is not None:
+                day = datetime.fromtimestamp(bar.start, self.trading_hours.et_timezone).date()
+                peak = self.baseline.update(day, bar.high)
+                if peak is not None and peak != self.spx_base_price:
+                    self.logger.info(f"SPX rolling peak raised to {peak:.2f}")
+                    self._set_base_price(peak)
+        self.logger.debug(f"{symbol} {interval:g}s bar: O {bar.open:.2f} H {bar.high:.2f} "
+                          f"L {bar.low:.2f} C {bar.close:.2f}")
+
+    def _stop_drop_trigger(self) -> None:
+        if self.drop_trigger is not None:
+            self.drop_trigger.stop()
+            self.drop_trigger = None
+
+    async def _wait_for_drop_async(self, timeout: float) -> Optional[float]:
+        """Wait until the SPX drop trigger fires; returns the drop or None on timeout"""
+        trigger = self._ensure_drop_trigger()
+        if trigger is None:
+            await self.clock.sleep_async(timeout)
+            return None
+        return await trigger.wait_async(timeout)
+
     def handle_market_closed(self) -> bool:
         """Handle market closed situation. Returns True if should continue, False if should exit"""
-        wait_time = self.trading_hours.time_until_market_open()
+        wait_time = int(self.trading_hours.time_until_market_open())
         hours = wait_time // 3600
         minutes = (wait_time % 3600) // 60
+
+        if self.daemon:
+            if self.daemon.market_closed == "exit":
+                self.logger.info("Market closed; exiting as configured (TRADING_MARKET_CLOSED=exit)")
+                return False
+            self.logger.info(f"Market closed; sleeping {hours} hours and {minutes} minutes "
+                             f"until the next session")
+            return True
         
         print(f"\nMarket is currently closed.")
         print(f"Time until market opens: {hours} hours and {minutes} minutes")
@@ -87,9 +429,17 @@ class TradingApp:
             else:
                 print("Invalid choice. Please enter 1 or 2.")
 
+    def _closed_wait_time(self) -> float:
+        """How long to sleep while closed; unattended runs sleep through to the open"""
+        wait_time = self.trading_hours.time_until_market_open()
+        return wait_time if self.daemon else min(wait_time, 3600)
+
     def send_trading_report(self) -> None:
         """Generate and send trading report via email"""
         try:
+            # Close the last bars of symbols that stopped ticking before the close
+            self.bars.flush(self.clock.time())
+
             # Update final SPX price
             current_spx = self.market.get_market_price("SPX")
             if current_spx and self.spx_base_price:
@@ -111,7 +461,7 @@ class TradingApp:
         except Exception as e:
             self.logger.error(f"Error sending trading report: {str(e)}")
 
-    def execute_trade(self, symbol: str, drop_level: int) -> bool:
+    def execute_trade(self, symbol: str, drop_level: float, quantity: int = 1) -> bool:
         """Execute trade based on SPX drop level"""
         try:
             # Check if market is open
@@ -131,24 +481,19 @@ class TradingApp:
                 return False
 
             # Execute order
-            success = self.order_manager.place_buy_order(symbol, 1, price)
+            success = self.order_manager.place_buy_order(symbol, quantity, price)
             if success:
-                # Update trading summary
-                self.trading_summary['total_trades'] += 1
-                self.trading_summary['entry_price'] = price
-                self.trading_summary['symbol'] = symbol
-                
+                # Record what was actually filled
+                result = self.order_manager.last_result
+                quantity = int(result.filled) if result else quantity
+                if result and result.avg_fill_price:
+                    price = result.avg_fill_price
+
                 # Take screenshot
                 screenshot_path = self.screenshotter.capture(symbol)
                 
-                # Record transaction
-                self.reporter.record_transaction(
-                    symbol=symbol,
-                    price=price,
-                    quantity=1,
-                    spx_drop=drop_level,
-                    screenshot_path=screenshot_path
-                )
+                # Log the fill, update the trading summary and record the transaction
+                self._record_trade(symbol, price, quantity, drop_level, screenshot_path)
                 return True
             
             return False
@@ -157,21 +502,248 @@ class TradingApp:
             self.logger.error(f"Trading error: {str(e)}")
             return False
 
+    def _executor(self, name: str) -> ThreadPoolExecutor:
+        executor = self._executors.get(name)
+        if executor is None:
+            executor = self._executors[name] = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"trading-{name}"
+            )
+        return executor
+
+    def _in_executor(self, name: str, func: Callable[..., Any], *args: Any) -> asyncio.Future:
+        """Run blocking I/O on a named executor"""
+        loop = asyncio.get_event_loop()
+        return loop.run_in_executor(self._executor(name), func, *args)
+
+    def _spawn(self, awaitable: Any) -> asyncio.Future:
+        """Start a background task that is awaited before shutdown"""
+        task = asyncio.ensure_future(awaitable)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
+
+    def _shutdown_executors(self) -> None:
+        for executor in self._executors.values():
+            executor.shutdown(wait=True)
+        self._executors.clear()
+
+    async def monitor_spx_async(self) -> float:
+        """Async variant of monitor_spx"""
+        if self.spx_base_price is None:
+            base_price = (await self._seed_baseline_async()
+                          or await self.market.get_market_price_async("SPX"))
+            if base_price:
+                self._set_base_price(base_price)
+
+        current_price = await self.market.get_market_price_async("SPX")
+        if current_price and self.spx_base_price:
+            drop = ((self.spx_base_price - current_price) / self.spx_base_price) * 100
+            self.logger.info(f"SPX Drop: {drop:.2f}%")
+            return drop
+        return 0.0
+
+    async def send_trading_report_async(self) -> None:
+        """Async variant of send_trading_report; report and email run on executors"""
+        try:
+            current_spx = await self.market.get_market_price_async("SPX")
+            if current_spx and self.spx_base_price:
+                self.trading_summary['spx_final_price'] = current_spx
+                self.trading_summary['total_spx_drop'] = (
+                    (self.spx_base_price - current_spx) / self.spx_base_price * 100
+                )
+
+            report_paths = await self._in_executor("reports", self.reporter.generate_report)
+
+            recipient_email = os.getenv('TRADING_REPORT_EMAIL')
+            if recipient_email:
+                await self._in_executor(
+                    "email", self.email_sender.send_report,
+                    recipient_email, report_paths, dict(self.trading_summary)
+                )
+            else:
+                self.logger.info("No recipient email configured. Skipping email report.")
+
+        except Exception as e:
+            self.logger.error(f"Error sending trading report: {str(e)}")
+
+    def _record_trade(self, symbol: str, price: float, quantity: int,
+                      drop_level: float, screenshot_path: Optional[Any]) -> None:
+        # In async mode this runs on the reports executor, ordered with checkpoints
+        try:
+            self.checkpoint.log({
+                'type': 'fill', 'day': self._trading_day(),
+                'date': self.clock.now().isoformat(), 'symbol': symbol, 'price': price,
+                'quantity': quantity, 'drop_level': drop_level,
+                'screenshot_path': str(screenshot_path) if screenshot_path else None
+            })
+        except Exception as e:
+            self.logger.error(f"Error logging fill: {str(e)}")
+        self.trading_summary['total_trades'] += 1
+        self.trading_summary['entry_price'] = price
+        self.trading_summary['symbol'] = symbol
+        self.reporter.record_transaction(
+            symbol=symbol,
+            price=price,
+            quantity=quantity,
+            spx_drop=drop_level,
+            screenshot_path=screenshot_path
+        )
+
+    async def _capture_and_record(self, symbol: str, price: float,
+                                  quantity: int, drop_level: float) -> None:
+        # Returns immediately; the image is encoded on the screenshotter's worker
+        screenshot_path = self.screenshotter.capture(symbol)
+        await self._in_executor(
+            "reports", self._record_trade, symbol, price, quantity, drop_level, screenshot_path
+        )
+
+    async def execute_trade_async(self, symbol: str, drop_level: float,
+                                  quantity: int = 1) -> bool:
+        """Async variant of execute_trade; evidence capture runs in the background"""
+        try:
+            if not self.trading_hours.is_market_open():
+                self.logger.warning("Cannot execute trade - Market is closed")
+                return False
+
+            if not await self.order_manager.check_sufficient_funds_async():
+                self.logger.warning("Insufficient funds for trade")
+                return False
+
+            price = await self.market.get_market_price_async(symbol)
+            if not price:
+                self.logger.error("Could not get current price")
+                return False
+
+            success = await self.order_manager.place_buy_order_async(symbol, quantity, price)
+            if success:
+                result = self.order_manager.last_result
+                quantity = int(result.filled) if result else quantity
+                if result and result.avg_fill_price:
+                    price = result.avg_fill_price
+
+                self._spawn(self._capture_and_record(symbol, price, quantity, drop_level))
+                return True
+
+            return False
+
+        except TradingException as e:
+            self.logger.error(f"Trading error: {str(e)}")
+            return False
+
+    async def _order_task(self, orders: "asyncio.Queue") -> None:
+        """Consume trade requests queued by the monitoring task"""
+        while True:
+            order: LadderOrder = await orders.get()
+            try:
+                if await self.execute_trade_async(order.symbol, order.level, order.quantity):
+                    self.logger.info(
+                        f"Successfully executed {order.level:g}% drop strategy for {order.symbol}"
+                    )
+                else:
+                    self._trade_failed(order)
+            finally:
+                orders.task_done()
+
+    async def _monitor_task(self, orders: "asyncio.Queue") -> None:
+        """Watch SPX and queue trades; mirrors the blocking loop in run()"""
+        fired_drop: Optional[float] = None
+        while True:
+            if not self.trading_hours.is_market_open():
+                self._spawn(self.send_trading_report_async())
+                if not await self._in_executor("console", self.handle_market_closed):
+                    print("\nExiting application due to closed market.")
+                    return
+                await self.clock.sleep_async(self._closed_wait_time())
+                continue
+            self._begin_session()
+
+            spx_drop = fired_drop if fired_drop is not None else await self.monitor_spx_async()
+            fired_drop = None
+
+            for order in self._evaluate_ladder(spx_drop):
+                print(f"SPX dropped {spx_drop:.2f}%. "
+                      f"Executing {order.level:g}% strategy for {order.symbol}...")
+                await orders.put(order)
+            if self._checkpoint_due():
+                await self._in_executor("reports", self.save_checkpoint)
+            if self._all_executed():
+                if self.daemon:
+                    # Nothing left to buy today; the close sends the report
+                    await self.clock.sleep_async(self.trading_hours.time_until_market_close())
+                    continue
+                print("\nAll drop levels executed. Ending monitoring session.")
+                return
+
+            time_to_close = self.trading_hours.time_until_market_close()
+            if time_to_close <= 0:
+                if self.daemon:
+                    continue  # Reported and slept through by the closed-market branch
+                print("\nMarket is closing. Ending monitoring session.")
+                self._spawn(self.send_trading_report_async())
+                return
+
+            fired_drop = await self._wait_for_drop_async(min(60, time_to_close))
+            if fired_drop is not None or self.daemon:
+                continue
+
+            answer = await self._in_executor("console", input, "\nContinue monitoring? (y/n): ")
+            if answer.lower() != 'y':
+                self._spawn(self.send_trading_report_async())
+                return
+
+    async def run_async(self, symbols: List[str]) -> None:
+        """Run monitoring, order handling and reporting as separate tasks"""
+        await self._watch_symbols_async(symbols)
+        orders: asyncio.Queue = asyncio.Queue()
+        order_worker = asyncio.ensure_future(self._order_task(orders))
+        try:
+            await self._monitor_task(orders)
+            await orders.join()
+        finally:
+            order_worker.cancel()
+            # Let pending screenshots, records and emails finish
+            while self._background:
+                await asyncio.gather(*list(self._background), return_exceptions=True)
+
+    def _select_trading_mode(self) -> str:
+        """'1' for live, '2' for paper; asks unless running unattended"""
+        if self.daemon:
+            return '1' if self.daemon.trading_mode == 'live' else '2'
+
+        print("\nSelect trading mode:")
+        print(f"1. Live Trading (Port {self.config.LIVE_PORT})")
+        print(f"2. Paper Trading (Port {self.config.PAPER_PORT})")
+        
+        while True:
+            mode = input("Enter choice (1 or 2): ")
+            if mode in ['1', '2']:
+                return mode
+            print("Invalid choice. Please enter 1 or 2.")
+
+    def _select_symbols(self) -> List[str]:
+        if self.daemon:
+            return list(self.daemon.symbols)
+        entered = input("\nEnter stock symbol(s), comma separated (e.g., MSFT): ")
+        return [part.strip().upper() for part in entered.split(',') if part.strip()]
+
+    @staticmethod
+    def _on_sigterm(signum: int, frame: Any) -> None:
+        # Pod shutdown: unwind like Ctrl+C so the report and checkpoint are written
+        raise KeyboardInterrupt
+
     def run(self):
         """Main trading loop"""
         try:
+            if self.daemon:
+                signal.signal(signal.SIGTERM, self._on_sigterm)
+                self.logger.info(
+                    f"Running unattended: {self.daemon.trading_mode} trading on "
+                    f"{', '.join(self.daemon.symbols)}, market closed -> {self.daemon.market_closed}"
+                )
+
             # Get trading mode
-            print("\nSelect trading mode:")
-            print("1. Live Trading (Port 7496)")
-            print("2. Paper Trading (Port 7497)")
-            
-            while True:
-                mode = input("Enter choice (1 or 2): ")
-                if mode in ['1', '2']:
-                    break
-                print("Invalid choice. Please enter 1 or 2.")
-            
-            port = 7496 if mode == "1" else 7497
+            mode = self._select_trading_mode()
+            port = self.config.LIVE_PORT if mode == "1" else self.config.PAPER_PORT
             self.trading_summary['trading_mode'] = 'Live' if mode == '1' else 'Paper'
             
             # Connect to server
@@ -179,11 +751,26 @@ class TradingApp:
                 self.logger.error("Failed to connect to IBKR")
                 return
             
-            # Get symbol
-            symbol = input("\nEnter stock symbol (e.g., MSFT): ").upper()
-            self.trading_summary['symbol'] = symbol
+            # Get symbols
+            symbols = self._select_symbols()
+            if not symbols:
+                self.logger.error("No stock symbol entered")
+                return
+            self.trading_summary['symbol'] = ', '.join(symbols)
+            self.restore_checkpoint()
+
+            if self.async_mode:
+                try:
+                    self.session.run(self.run_async(symbols))
+                except KeyboardInterrupt:
+                    print("\nMonitoring interrupted by user")
+                    self.send_trading_report()
+                return
             
+            self._watch_symbols(symbols)
+
             # Main monitoring loop
+            fired_drop: Optional[float] = None
             while True:
                 try:
                     # Check if market is open
@@ -193,45 +780,53 @@ class TradingApp:
                         if not self.handle_market_closed():
                             print("\nExiting application due to closed market.")
                             break
-                        self.market.sleep(min(self.trading_hours.time_until_market_open(), 3600))
+                        self.market.sleep(self._closed_wait_time())
                         continue
+                    self._begin_session()
 
-                    # Monitor SPX
-                    spx_drop = self.monitor_spx()
+                    # Monitor SPX (or use the drop that woke us up)
+                    spx_drop = fired_drop if fired_drop is not None else self.monitor_spx()
+                    fired_drop = None
                     
                     # Check trading conditions
-                    if spx_drop >= 40:
-                        print(f"SPX dropped {spx_drop:.2f}%. Executing 40% strategy...")
-                        if self.execute_trade(symbol, 40):
-                            self.logger.info("Successfully executed 40% drop strategy")
-                        break
-                    elif spx_drop >= 30:
-                        print(f"SPX dropped {spx_drop:.2f}%. Executing 30% strategy...")
-                        if self.execute_trade(symbol, 30):
-                            self.logger.info("Successfully executed 30% drop strategy")
-                        break
-                    elif spx_drop >= 20:
-                        print(f"SPX dropped {spx_drop:.2f}%. Executing 20% strategy...")
-                        if self.execute_trade(symbol, 20):
-                            self.logger.info("Successfully executed 20% drop strategy")
-                        break
-                    elif spx_drop >= 10:
-                        print(f"SPX dropped {spx_drop:.2f}%. Executing 10% strategy...")
-                        if self.execute_trade(symbol, 10):
-                            self.logger.info("Successfully executed 10% drop strategy")
+                    for order in self._evaluate_ladder(spx_drop):
+                        print(f"SPX dropped {spx_drop:.2f}%. "
+                              f"Executing {order.level:g}% strategy for {order.symbol}...")
+                        if self.execute_trade(order.symbol, order.level, order.quantity):
+                            self.logger.info(
+                                f"Successfully executed {order.level:g}% drop strategy "
+                                f"for {order.symbol}"
+                            )
+                        else:
+                            self._trade_failed(order)
+                    if self._checkpoint_due():
+                        self.save_checkpoint()
+                    if self._all_executed():
+                        if self.daemon:
+                            # Nothing left to buy today; the close sends the report
+                            self.market.sleep(self.trading_hours.time_until_market_close())
+                            continue
+                        print("\nAll drop levels executed. Ending monitoring session.")
+                        self.send_trading_report()
                         break
-                    
+
                     # Calculate time until market close
                     time_to_close = self.trading_hours.time_until_market_close()
                     if time_to_close <= 0:
+                        if self.daemon:
+                            continue  # Reported and slept through by the closed-market branch
                         print("\nMarket is closing. Ending monitoring session.")
                         # Send final report
                         self.send_trading_report()
                         break
 
-                    # Wait before next check
-                    wait_time = min(60, time_to_close)  # Wait 1 minute or until market close
-                    self.market.sleep(wait_time)
+                    # Wait for a drop trigger, 1 minute, or market close
+                    wait_time = min(60, time_to_close)
+                    fired_drop = self.session.run(self._wait_for_drop_async(wait_time))
+                    if fired_drop is not None:
+                        continue  # React to the tick right away
+                    if self.daemon:
+                        continue  # Unattended: keep monitoring at full cadence
                     
                     # Ask to continue
                     if input("\nContinue monitoring? (y/n): ").lower() != 'y':
@@ -249,11 +844,20 @@ class TradingApp:
             self.logger.error(f"Application error: {str(e)}")
         
         finally:
+            self._stop_drop_trigger()
+            self.bars.flush(self.clock.time())
+            self.bars.stop()
+            self._shutdown_executors()
+            self.save_checkpoint()
+            self.checkpoint.close()
             self.market.disconnect()
+            self.screenshotter.close()
             self.reporter.generate_report()
+            self.reporter.close()
+            self.email_sender.close()
 
 def main():
-    app = TradingApp()
+    app = TradingApp.from_env()
     app.run()
 
 if __name__ == "__main__":
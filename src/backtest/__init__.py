@@ -0,0 +1,16 @@
+"""Backtest module initialization"""
+from .engine import (
+    BacktestResult,
+    load_bars,
+    run_backtest,
+    parameter_grid,
+    sweep
+)
+
+__all__ = [
+    'BacktestResult',
+    'load_bars',
+    'run_backtest',
+    'parameter_grid',
+    'sweep'
+]
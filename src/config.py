@@ -1,6 +1,8 @@
 from pathlib import Path
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, replace
+from typing import List, NamedTuple, Optional, Tuple
+import os
+from .exceptions.trading_exceptions import ConfigurationException
 
 @dataclass
 class TradingConfig:
@@ -10,21 +12,118 @@ class TradingConfig:
     PAPER_PORT: int = 7497
     CLIENT_ID: int = 1
 
+    # Market data settings
+    MARKET_DATA_TIMEOUT: float = 10.0  # Seconds to wait for a first quote
+    INDEX_SYMBOLS: Tuple[str, ...] = ("SPX",)
+    # Ticker fields tried in order when picking a price
+    INDEX_PRICE_FIELDS: Tuple[str, ...] = ("last", "close")
+    STOCK_PRICE_FIELDS: Tuple[str, ...] = ("last", "close", "bid", "ask", "high", "low")
+    TICK_STORE_CAPACITY: int = 1 << 18  # Live ticks kept per symbol before older ones are only on disk
+    BAR_INTERVALS: Tuple[float, ...] = (1.0, 60.0, 300.0)  # OHLCV bar sizes in seconds
+    BAR_CAPACITY: int = 4096  # Closed bars kept in memory per symbol and interval
+
     # Trading parameters
     RESERVE_PERCENTAGE: float = 50.0  # Keep 50% of funds in reserve
+    ORDER_FILL_TIMEOUT: float = 30.0  # Seconds to wait for an order to fill
+    ORDER_CANCEL_TIMEOUT: float = 5.0  # Seconds to wait for an unfilled order to be cancelled
+    TRADE_RETRY_INTERVAL: float = 60.0  # Seconds before a level whose trade failed can fire again
     SPX_DROP_LEVELS: List[int] = (10, 20, 30, 40)  # type: ignore
+    SPX_DROP_QUANTITIES: List[int] = (1, 1, 1, 1)  # type: ignore  # Shares bought per level
     PRICE_CHECK_THRESHOLD: float = 10.0  # 10% threshold for price reasonability
+    TRIGGER_MIN_INTERVAL: float = 0.25  # Min seconds between tick-driven drop evaluations
+    TRIGGER_CONFIRM_TICKS: int = 2  # Evaluations a drop must hold before firing
+    # Drop baseline: "first_price" (first SPX price seen) or "rolling_peak"
+    # (highest SPX high over the last BASELINE_WINDOW_DAYS trading days)
+    BASELINE_MODE: str = "first_price"
+    BASELINE_WINDOW_DAYS: int = 20
+
+    # Transaction journal ("csv", "sqlite" or "parquet")
+    JOURNAL_BACKEND: str = "csv"
+    JOURNAL_FSYNC_BATCH: int = 16  # fsync after this many records...
+    JOURNAL_FSYNC_INTERVAL: float = 1.0  # ...or this many seconds
+
+    # Crash recovery: state snapshot every CHECKPOINT_INTERVAL seconds plus a
+    # write-ahead log of fired levels and fills in between
+    CHECKPOINT_INTERVAL: float = 30.0
+
+    # Screenshots
+    SCREENSHOT_MODE: str = "auto"  # "screen", "chart" (headless), or "auto" (chart without a display)
+    CHART_WINDOW: float = 900.0  # Seconds of price history drawn before a trade
+    CHART_SIZE: Tuple[int, int] = (640, 360)
+    CHART_RESOLUTION: float = 1.0  # Seconds; windows ending within the same step share a chart
+    SCREENSHOT_FORMAT: str = "png"  # "png", "webp" or "jpeg"
+    SCREENSHOT_PNG_COMPRESS_LEVEL: int = 1  # 0-9; low is fast
+    SCREENSHOT_QUALITY: int = 80  # webp/jpeg quality
+    SCREENSHOT_SCALE: float = 0.5  # Downscale factor; 1.0 keeps full resolution
+    SCREENSHOT_REGION: Optional[Tuple[int, int, int, int]] = (0, 0, 1280, 800)  # x, y, w, h; None = full screen
+    SCREENSHOT_QUEUE_SIZE: int = 4  # Max captures pending at once
+
+    # Logging (LOG_LEVEL, LOG_JSON and LOG_ROTATION can be overridden from the environment)
+    LOG_ROTATION: str = "size"  # "size" (LOG_MAX_BYTES) or "time" (daily, at midnight)
+    LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    LOG_BACKUP_COUNT: int = 5  # Rotated files kept per logger
+    LOG_JSON: bool = False  # One JSON object per line in the log files
+    LOG_QUEUE_SIZE: int = 10000  # Records buffered for the writer thread; overflow is dropped
 
     # File paths
     BASE_DIR: Path = Path(__file__).parent.parent
     LOGS_DIR: Path = BASE_DIR / "logs"
+    RECORDS_DIR: Path = BASE_DIR / "trading_records"  # Emailed screenshots and reports
     SCREENSHOTS_DIR: Path = BASE_DIR / "trading_records" / "screenshots"
     REPORTS_DIR: Path = BASE_DIR / "trading_records" / "reports"
+    TICK_STORE_DIR: Path = BASE_DIR / "trading_records" / "ticks"
+    HISTORY_DIR: Path = BASE_DIR / "trading_records" / "history"
+    CHECKPOINT_DIR: Path = BASE_DIR / "trading_records" / "state"
 
     # Ensure directories exist
     def __post_init__(self):
         self.LOGS_DIR.mkdir(parents=True, exist_ok=True)
         self.SCREENSHOTS_DIR.mkdir(parents=True, exist_ok=True)
         self.REPORTS_DIR.mkdir(parents=True, exist_ok=True)
-        # Convert tuple to list for SPX_DROP_LEVELS
-        self.SPX_DROP_LEVELS = list(self.SPX_DROP_LEVELS)
\ No newline at end of file
+        # Convert tuples to lists for the drop ladder settings
+        self.SPX_DROP_LEVELS = list(self.SPX_DROP_LEVELS)
+        self.SPX_DROP_QUANTITIES = list(self.SPX_DROP_QUANTITIES)
+
+    def relocated(self, records_dir: Path) -> "TradingConfig":
+        """Copy of this config that keeps every trading record and log under records_dir"""
+        records_dir = Path(records_dir)
+        return replace(
+            self,
+            RECORDS_DIR=records_dir,
+            SCREENSHOTS_DIR=records_dir / "screenshots",
+            REPORTS_DIR=records_dir / "reports",
+            TICK_STORE_DIR=records_dir / "ticks",
+            HISTORY_DIR=records_dir / "history",
+            CHECKPOINT_DIR=records_dir / "state",
+            LOGS_DIR=records_dir / "logs"
+        )
+
+class DaemonSettings(NamedTuple):
+    """Answers to the interactive prompts, for running unattended (e.g. in a pod)"""
+    trading_mode: str  # "paper" or "live"
+    symbols: Tuple[str, ...]
+    market_closed: str = "wait"  # "wait" for the next session or "exit"
+
+    @classmethod
+    def from_env(cls) -> Optional["DaemonSettings"]:
+        """
+        Settings from TRADING_MODE, TRADING_SYMBOLS and TRADING_MARKET_CLOSED,
+        or None unless TRADING_DAEMON is set
+        """
+        if os.getenv('TRADING_DAEMON', '').lower() not in ('1', 'true', 'yes'):
+            return None
+        mode = os.getenv('TRADING_MODE', 'paper').strip().lower()
+        if mode not in ('paper', 'live'):
+            raise ConfigurationException(f"TRADING_MODE must be 'paper' or 'live', got {mode!r}")
+        symbols = tuple(
+            part.strip().upper() for part in os.getenv('TRADING_SYMBOLS', '').split(',')
+            if part.strip()
+        )
+        if not symbols:
+            raise ConfigurationException("TRADING_SYMBOLS is required in daemon mode")
+        market_closed = os.getenv('TRADING_MARKET_CLOSED', 'wait').strip().lower()
+        if market_closed not in ('wait', 'exit'):
+            raise ConfigurationException(
+                f"TRADING_MARKET_CLOSED must be 'wait' or 'exit', got {market_closed!r}"
+            )
+        return cls(mode, symbols, market_closed)
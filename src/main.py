@@ -1,7 +1,7 @@
 from .app import TradingApp
 
 def main():
-    app = TradingApp()
+    app = TradingApp.from_env()
     app.run()
 
 if __name__ == "__main__":
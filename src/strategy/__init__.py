@@ -0,0 +1,9 @@
+"""Strategy module initialization"""
+from .drop_ladder import DropLadder, LadderOrder
+from .baseline import RollingPeak
+
+__all__ = [
+    'DropLadder',
+    'LadderOrder',
+    'RollingPeak'
+]
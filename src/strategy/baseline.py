@@ -0,0 +1,59 @@
+from collections import deque
+from datetime import date
+from typing import Deque, Iterable, Optional, Tuple
+import math
+
+class RollingPeak:
+    """
+    Highest high over the last ``window`` trading days, including the day in
+    progress. Completed days sit in a monotonic deque (decreasing highs), so
+    updates are amortized O(1) and the peak is read from the front.
+    """
+
+    def __init__(self, window: int):
+        if window < 1:
+            raise ValueError("window must be at least one day")
+        self.window = window
+        self._days: Deque[Tuple[int, float]] = deque()  # (day index, high)
+        self._index = 0
+        self._day: Optional[date] = None
+        self._today_high = -math.inf
+
+    @property
+    def day(self) -> Optional[date]:
+        """The day currently in progress"""
+        return self._day
+
+    @property
+    def peak(self) -> Optional[float]:
+        """Rolling high, or None before any data"""
+        best = max(self._days[0][1] if self._days else -math.inf, self._today_high)
+        return None if best == -math.inf else best
+
+    def update(self, day: date, high: float) -> Optional[float]:
+        """Fold a bar's high into the peak; returns the new peak"""
+        if self._day is None or day > self._day:
+            self._roll(day)
+        elif day < self._day:
+            return self.peak  # Older than the window's newest day
+        if high > self._today_high:
+            self._today_high = high
+        return self.peak
+
+    def seed(self, bars: Iterable[Tuple[date, float]]) -> Optional[float]:
+        """Feed (day, high) pairs in date order"""
+        for day, high in bars:
+            self.update(day, high)
+        return self.peak
+
+    def _roll(self, day: date) -> None:
+        if self._day is not None and self._today_high != -math.inf:
+            while self._days and self._days[-1][1] <= self._today_high:
+                self._days.pop()
+            self._days.append((self._index, self._today_high))
+            self._index += 1
+        self._day = day
+        self._today_high = -math.inf
+        # Keep completed days with index > today's index - window
+        while self._days and self._days[0][0] <= self._index - self.window:
+            self._days.popleft()
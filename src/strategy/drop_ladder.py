@@ -0,0 +1,126 @@
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+import numpy as np
+from src.config import TradingConfig
+from src.exceptions.trading_exceptions import ConfigurationException
+
+class LadderOrder(NamedTuple):
+    symbol: str
+    level: float
+    quantity: int
+
+class DropLadder:
+    """
+    Multi-level drop ladder over a watchlist.
+
+    Each (symbol, level) pair fires at most once per session, unless it is
+    released again because its order failed. All symbols and levels are
+    evaluated in a single vectorized comparison, so the cost per tick barely
+    grows with the size of the watchlist or the depth of the ladder.
+    """
+
+    def __init__(self, symbols: Iterable[str], levels: Sequence[float],
+                 quantities: Optional[Sequence[int]] = None):
+        if not levels:
+            raise ConfigurationException("At least one drop level is required")
+        if quantities is None:
+            quantities = [1] * len(levels)
+        if len(quantities) != len(levels):
+            raise ConfigurationException(
+                f"Got {len(quantities)} quantities for {len(levels)} drop levels"
+            )
+
+        order = np.argsort(np.asarray(levels, dtype=np.float64))
+        self.levels = np.asarray(levels, dtype=np.float64)[order]
+        self.quantities = np.asarray(quantities, dtype=np.int64)[order]
+        self.symbols: List[str] = []
+        self.fired = np.zeros((0, len(self.levels)), dtype=bool)
+        for symbol in symbols:
+            self.add_symbol(symbol)
+
+    @classmethod
+    def from_config(cls, config: TradingConfig, symbols: Iterable[str]) -> "DropLadder":
+        """Build a ladder from TradingConfig.SPX_DROP_LEVELS/SPX_DROP_QUANTITIES"""
+        return cls(symbols, config.SPX_DROP_LEVELS, config.SPX_DROP_QUANTITIES)
+
+    def add_symbol(self, symbol: str) -> None:
+        """Add a symbol to the watchlist with no levels fired"""
+        if symbol in self.symbols:
+            return
+        self.symbols.append(symbol)
+        self.fired = np.vstack([self.fired, np.zeros((1, len(self.levels)), dtype=bool)])
+
+    def evaluate(self, drops: Union[float, Sequence[float], np.ndarray]) -> List[LadderOrder]:
+        """
+        Mark and return every (symbol, level) newly reached by the drop.
+        ``drops`` is either one SPX drop for all symbols or one drop per symbol.
+        """
+        if not self.symbols:
+            return []
+        drops = np.broadcast_to(np.asarray(drops, dtype=np.float64), (len(self.symbols),))
+        new = (drops[:, None] >= self.levels[None, :]) & ~self.fired
+        if not new.any():
+            return []
+        self.fired |= new
+        rows, cols = np.nonzero(new)
+        return [
+            LadderOrder(self.symbols[row], float(self.levels[col]), int(self.quantities[col]))
+            for row, col in zip(rows, cols)
+        ]
+
+    def first_hits(self, drops: np.ndarray,
+                   sessions: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Replay a series of SPX drops at once, as evaluate() would see them one
+        by one on a fresh ladder with reset() whenever the session id changes.
+        Returns (drop index, level index) of every firing, in firing order.
+        """
+        drops = np.asarray(drops, dtype=np.float64)
+        if sessions is None:
+            sessions = np.zeros(len(drops), dtype=np.int64)
+        hit = drops[:, None] >= self.levels[None, :]
+        rows, cols = np.nonzero(hit)  # rows ascending
+        # First hit of each level in each session
+        _, first = np.unique(sessions[rows] * len(self.levels) + cols, return_index=True)
+        rows, cols = rows[first], cols[first]
+        order = np.lexsort((cols, rows))
+        return rows[order], cols[order]
+
+    def has_pending(self, drop: float) -> bool:
+        """True if the drop reaches any level that has not fired yet"""
+        reached = self.levels <= drop
+        return bool((reached[None, :] & ~self.fired).any())
+
+    def next_level(self) -> Optional[float]:
+        """Lowest level that has not fired for at least one symbol"""
+        pending = ~self.fired.all(axis=0)
+        if not pending.any():
+            return None
+        return float(self.levels[np.argmax(pending)])
+
+    def all_fired(self) -> bool:
+        """True once every level has fired for every symbol"""
+        return bool(self.fired.all())
+
+    def fired_levels(self, symbol: str) -> List[float]:
+        """Levels already fired for a symbol"""
+        row = self.symbols.index(symbol)
+        return [float(level) for level in self.levels[self.fired[row]]]
+
+    def mark_fired(self, symbol: str, level: float) -> None:
+        """Mark a level as fired for a symbol, e.g. when restoring saved state"""
+        self.add_symbol(symbol)
+        col = np.flatnonzero(np.isclose(self.levels, level))
+        if col.size:
+            self.fired[self.symbols.index(symbol), col[0]] = True
+
+    def release(self, symbol: str, level: float) -> None:
+        """Un-mark a fired level, e.g. when its order could not be executed"""
+        if symbol not in self.symbols:
+            return
+        col = np.flatnonzero(np.isclose(self.levels, level))
+        if col.size:
+            self.fired[self.symbols.index(symbol), col[0]] = False
+
+    def reset(self) -> None:
+        """Clear fired state, e.g. at the start of a new session"""
+        self.fired[:] = False
@@ -1,3 +1,9 @@
 # src/trading/__init__.py
-from .market import MarketData
-from .order import OrderManager
\ No newline at end of file
+from .market import MarketData, QuoteBatch
+from .order import OrderManager
+from .order_tracker import OrderTracker, OrderResult
+from .session import IBSession
+from .simulator import SimulatedIB, SimulatorConfig
+from .tick_store import TickStore, TickColumns
+from .bar_aggregator import Bar, BarAggregator
+from .history import DailyBar, DailyBarCache
\ No newline at end of file
@@ -0,0 +1,206 @@
+"""
+Streaming OHLCV bars built from ticker updates.
+
+Each (symbol, interval) pair keeps its forming bar in plain floats and its
+closed bars in preallocated NumPy columns, so every tick is O(1) and memory
+stays flat however long the session runs. Closed bars are published on
+``barClosedEvent`` as ``(symbol, interval, bar)``.
+"""
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from ib_insync import Event, Ticker
+from src.trading.market import MarketData
+import math
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BAR_FIELDS = ('start', 'open', 'high', 'low', 'close', 'volume', 'ticks')
+
+class Bar(NamedTuple):
+    start: float  # Epoch seconds at the start of the interval
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    ticks: int
+
+class BarColumns(NamedTuple):
+    start: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    ticks: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+class BarSeries:
+    """Closed bars of one symbol and interval plus the bar being formed"""
+
+    def __init__(self, symbol: str, interval: float, capacity: int):
+        self.symbol = symbol
+        self.interval = interval
+        self.capacity = capacity
+        # Twice the capacity so the latest bars are always one contiguous slice
+        self._columns = np.full((len(BAR_FIELDS), 2 * capacity), np.nan)
+        self._pos = 0
+        self.closed_count = 0
+        self._start: Optional[float] = None
+        self._open = self._high = self._low = self._close = 0.0
+        self._volume = 0.0
+        self._ticks = 0
+
+    def update(self, ts: float, price: float, volume: float = 0.0) -> Optional[Bar]:
+        """Add one tick; returns the bar it closed, if any"""
+        start = ts - ts % self.interval
+        closed = None
+        if start != self._start:
+            if self._start is not None:
+                if start < self._start:
+                    return None  # Late tick for an already closed bar
+                closed = self._close_bar()
+            self._start = start
+            self._open = self._high = self._low = price
+            self._volume = 0.0
+            self._ticks = 0
+        elif price > self._high:
+            self._high = price
+        elif price < self._low:
+            self._low = price
+        self._close = price
+        self._volume += volume
+        self._ticks += 1
+        return closed
+
+    def flush(self, now: float) -> Optional[Bar]:
+        """Close the forming bar if its interval has ended by ``now``"""
+        if self._start is None or now < self._start + self.interval:
+            return None
+        bar = self._close_bar()
+        self._start = None
+        return bar
+
+    def _close_bar(self) -> Bar:
+        bar = Bar(self._start, self._open, self._high, self._low, self._close,
+                  self._volume, self._ticks)
+        if self._pos == 2 * self.capacity:
+            self._columns[:, :self.capacity] = self._columns[:, self.capacity:]
+            self._pos = self.capacity
+        self._columns[:, self._pos] = bar
+        self._pos += 1
+        self.closed_count += 1
+        return bar
+
+    @property
+    def current(self) -> Optional[Bar]:
+        """The bar being formed, if any"""
+        if self._start is None:
+            return None
+        return Bar(self._start, self._open, self._high, self._low, self._close,
+                   self._volume, self._ticks)
+
+    def bars(self, n: Optional[int] = None) -> BarColumns:
+        """Views of the latest n closed bars (default: all kept), oldest first"""
+        available = min(self._pos, self.capacity)
+        n = available if n is None else max(0, min(n, available))
+        return BarColumns(*self._columns[:, self._pos - n:self._pos])
+
+    def last(self) -> Optional[Bar]:
+        """The most recently closed bar"""
+        if not self._pos:
+            return None
+        values = self._columns[:, self._pos - 1]
+        return Bar(*values[:-1].tolist(), int(values[-1]))
+
+class BarAggregator:
+    """Turns the ticker stream of watched symbols into OHLCV bars"""
+
+    def __init__(self, market: MarketData, intervals: Optional[Iterable[float]] = None,
+                 capacity: Optional[int] = None):
+        config = market.config
+        self.market = market
+        self.intervals: Tuple[float, ...] = tuple(intervals or config.BAR_INTERVALS)
+        self.capacity = capacity or config.BAR_CAPACITY
+        self.series: Dict[Tuple[str, float], BarSeries] = {}
+        self.barClosedEvent = Event('barClosedEvent')
+        self._handlers: Dict[str, Tuple[Ticker, object]] = {}
+        self._volumes: Dict[str, float] = {}
+
+    def watch(self, symbol: str) -> None:
+        """Start building bars for a symbol from its live ticker"""
+        if symbol not in self._handlers:
+            self._attach(symbol, self.market.subscribe(symbol))
+
+    async def watch_async(self, symbol: str) -> None:
+        """Async variant of watch, for use inside the running event loop"""
+        if symbol not in self._handlers:
+            ticker = await self.market.subscribe_async(symbol)
+            if symbol not in self._handlers:
+                self._attach(symbol, ticker)
+
+    def _attach(self, symbol: str, ticker: Ticker) -> None:
+        series = [self._series(symbol, interval) for interval in self.intervals]
+        now = self.market.clock.time
+
+        def on_update(updated: Ticker) -> None:
+            price = self.market.ticker_price(symbol, updated)
+            if price is not None:
+                self._on_tick(symbol, series, now(), price, self._volume_delta(symbol, updated))
+
+        ticker.updateEvent += on_update
+        self._handlers[symbol] = (ticker, on_update)
+
+    def unwatch(self, symbol: str) -> None:
+        """Stop building bars for a symbol; closed bars are kept"""
+        entry = self._handlers.pop(symbol, None)
+        if entry is not None:
+            ticker, handler = entry
+            ticker.updateEvent -= handler
+
+    def stop(self) -> None:
+        for symbol in list(self._handlers):
+            self.unwatch(symbol)
+
+    def _series(self, symbol: str, interval: float) -> BarSeries:
+        key = (symbol, interval)
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = BarSeries(symbol, interval, self.capacity)
+        return series
+
+    def _volume_delta(self, symbol: str, ticker: Ticker) -> float:
+        """Traded volume since the previous update (0 for indices)"""
+        volume = ticker.volume
+        if volume is None or math.isnan(volume):
+            return 0.0
+        previous = self._volumes.get(symbol)
+        self._volumes[symbol] = volume
+        return max(0.0, volume - previous) if previous is not None else 0.0
+
+    def _on_tick(self, symbol: str, series: List[BarSeries], ts: float,
+                 price: float, volume: float) -> None:
+        for bars in series:
+            closed = bars.update(ts, price, volume)
+            if closed is not None:
+                self.barClosedEvent.emit(symbol, bars.interval, closed)
+
+    def on_tick(self, symbol: str, ts: float, price: float, volume: float = 0.0) -> None:
+        """Feed a tick directly, e.g. when replaying recorded data"""
+        series = [self._series(symbol, interval) for interval in self.intervals]
+        self._on_tick(symbol, series, ts, price, volume)
+
+    def flush(self, now: Optional[float] = None) -> None:
+        """Close bars whose interval has ended, for symbols that stopped ticking"""
+        now = self.market.clock.time() if now is None else now
+        for (symbol, interval), series in self.series.items():
+            closed = series.flush(now)
+            if closed is not None:
+                self.barClosedEvent.emit(symbol, interval, closed)
+
+    def bars(self, symbol: str, interval: float, n: Optional[int] = None) -> BarColumns:
+        """Latest closed bars of a symbol, as column views"""
+        return self._series(symbol, interval).bars(n)
@@ -0,0 +1,117 @@
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+import csv
+import math
+import logging
+from src.trading.market import MarketData
+from src.utils.market_calendar import MarketCalendar
+from src.exceptions.trading_exceptions import MarketDataException
+
+logger = logging.getLogger(__name__)
+
+class DailyBar(NamedTuple):
+    day: date
+    open: float
+    high: float
+    low: float
+    close: float
+
+class DailyBarCache:
+    """
+    Daily bars from reqHistoricalData, cached on disk per symbol.
+    Only days after the newest cached bar are requested from IBKR, unless the
+    cache holds fewer bars than asked for. Once the session has opened, the
+    bar of the day in progress is always requested; it is returned but never
+    cached.
+    """
+
+    def __init__(self, market: MarketData, directory: Optional[Path] = None,
+                 calendar: Optional[MarketCalendar] = None):
+        self.market = market
+        self.calendar = calendar or MarketCalendar(clock=market.clock.time)
+        self.directory = Path(directory or market.config.HISTORY_DIR)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.requests = 0
+
+    def _path(self, symbol: str) -> Path:
+        return self.directory / f"{symbol}_1day.csv"
+
+    def load(self, symbol: str) -> List[DailyBar]:
+        """Cached bars, oldest first"""
+        path = self._path(symbol)
+        if not path.exists():
+            return []
+        with open(path, newline='') as f:
+            return [
+                DailyBar(date.fromisoformat(row['day']), float(row['open']),
+                         float(row['high']), float(row['low']), float(row['close']))
+                for row in csv.DictReader(f)
+            ]
+
+    def save(self, symbol: str, bars: List[DailyBar]) -> None:
+        path = self._path(symbol)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(DailyBar._fields)
+            for bar in bars:
+                writer.writerow([bar.day.isoformat(), bar.open, bar.high, bar.low, bar.close])
+        tmp.replace(path)
+
+    async def get_daily_bars_async(self, symbol: str, days: int,
+                                   today: date) -> List[DailyBar]:
+        """The last ``days`` completed daily bars plus today's partial bar, if any"""
+        cached = self.load(symbol)
+        last = cached[-1].day if cached else None
+        backfill = len(cached) < days  # Empty cache, or the window has grown
+        if backfill:
+            # Roughly ``days`` trading days plus holidays
+            span = math.ceil(days * 7 / 5) + 7
+        else:
+            span = (today - last).days
+
+        fetched: List[DailyBar] = []
+        if span > 0 and (backfill or self._missing_days(last, today)
+                         or self._session_started(today)):
+            fetched = await self._fetch_async(symbol, span)
+        known = {bar.day for bar in cached}
+
+        completed = [bar for bar in fetched if bar.day < today and bar.day not in known]
+        if completed:
+            cached = sorted(cached + completed)
+            self.save(symbol, cached)
+            logger.info(f"Cached {len(completed)} new daily bars for {symbol}")
+        partial = [bar for bar in fetched if bar.day >= today]
+        return cached[-days:] + partial
+
+    def _session_started(self, today: date) -> bool:
+        """Whether today's session has opened, i.e. there is a partial bar to fetch"""
+        session = self.calendar.session(today)
+        return session is not None and self.market.clock.time() >= session[0]
+
+    def _missing_days(self, last: date, today: date) -> bool:
+        """Whether any trading day lies strictly between the cached bar and today"""
+        day = last + timedelta(days=1)
+        while day < today:
+            if self.calendar.is_trading_day(day):
+                return True
+            day += timedelta(days=1)
+        return False
+
+    async def _fetch_async(self, symbol: str, span_days: int) -> List[DailyBar]:
+        contract = await self.market.get_contract_async(symbol)
+        duration = f"{span_days} D" if span_days <= 365 else f"{math.ceil(span_days / 365)} Y"
+        self.requests += 1
+        bars = await self.market.ib.reqHistoricalDataAsync(
+            contract, endDateTime='', durationStr=duration, barSizeSetting='1 day',
+            whatToShow='TRADES', useRTH=True, formatDate=1
+        )
+        if bars is None:
+            raise MarketDataException(f"No historical data for {symbol}")
+        result = []
+        for bar in bars:
+            day = bar.date.date() if isinstance(bar.date, datetime) else bar.date
+            result.append(DailyBar(day, bar.open, bar.high, bar.low, bar.close))
+        logger.info(f"Fetched {len(result)} daily bars for {symbol} ({duration})")
+        return result
@@ -1,108 +1,274 @@
-from typing import Optional
-from ib_insync import IB, Stock, Index
+from typing import Callable, Optional, Dict, Iterable, List, NamedTuple, Tuple
+from ib_insync import Stock, Index, Contract, Ticker, util
+from src.config import TradingConfig
+from src.trading.session import IBSession
+from src.trading.tick_store import TickColumns, TickStore
 from src.exceptions.trading_exceptions import MarketDataException
+from src.utils.metrics import LatencyHistogram
+import asyncio
+import math
 import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+class QuoteBatch(NamedTuple):
+    prices: Dict[str, float]
+    missing: List[str]
+
 class MarketData:
-    def __init__(self):
-        self.ib = IB()
-        self.connection_timeout = 30  # 30 seconds timeout
-        self.retry_interval = 5      # 5 seconds between retries
-        self.max_retries = 3        # Maximum number of connection attempts
+    def __init__(self, session: Optional[IBSession] = None,
+                 config: Optional[TradingConfig] = None,
+                 tick_store: Optional[TickStore] = None):
+        self.config = config or (session.config if session else TradingConfig())
+        self.session = session or IBSession(self.config)
+        self.ib = self.session.ib
+        self.clock = self.session.clock
+        # Qualified contracts are shared through the session; tickers are per connection
+        self._contracts: Dict[str, Contract] = self.session.contracts
+        self._tickers: Dict[str, Ticker] = {}
+        # Time spent waiting on the gateway for a usable quote, per symbol
+        self.wait_histograms: Dict[str, LatencyHistogram] = {}
+        # Every ticker update is recorded for charts, analysis and post-mortems
+        self.tick_store = tick_store or TickStore(
+            self.config.TICK_STORE_DIR, self.config.TICK_STORE_CAPACITY
+        )
+        self._tick_handlers: Dict[str, Callable[[Ticker], None]] = {}
+        self.ib.disconnectedEvent += self._on_disconnected
 
     def connect(self, port: int, host: str = "127.0.0.1", client_id: int = 1) -> bool:
-        """Connect to IBKR with retries"""
-        for attempt in range(self.max_retries):
-            try:
-                # Try to disconnect if there's an existing connection
-                if self.ib.isConnected():
-                    self.ib.disconnect()
-                    time.sleep(1)  # Wait a bit before reconnecting
-                
-                # Attempt connection with timeout
-                self.ib.connect(
-                    host=host,
-                    port=port,
-                    clientId=client_id,
-                    timeout=self.connection_timeout
-                )
-                
-                # Wait for connection to stabilize
-                time.sleep(1)
-                
-                # Enable delayed market data
-                self.ib.reqMarketDataType(3)  # 3 = Delayed data
-                logger.info("Enabled delayed market data")
-                
-                # Verify connection
-                if self.ib.isConnected():
-                    print(f"Successfully connected to IBKR on port {port}")
-                    return True
-                    
-            except Exception as e:
-                print(f"Connection attempt {attempt + 1} failed: {str(e)}")
-                if attempt < self.max_retries - 1:  # Don't sleep on last attempt
-                    print(f"Retrying in {self.retry_interval} seconds...")
-                    time.sleep(self.retry_interval)
-                    
-        raise MarketDataException("Failed to connect after all retry attempts")
+        """Connect the shared session to IBKR"""
+        if self.session.is_connected():
+            self.disconnect()
+        return self.session.connect(port, host, client_id)
 
     def disconnect(self):
         """Disconnect from IBKR"""
-        if self.ib.isConnected():
-            self.ib.disconnect()
+        if self.session.is_connected():
+            self.unsubscribe_all()
+        self.session.disconnect()
+        self._tickers.clear()
+        self.tick_store.close()
+
+    def _on_disconnected(self) -> None:
+        # Tickers die with the connection; resubscribe on next read
+        self._tickers.clear()
 
     def is_connected(self) -> bool:
         """Check if connected to IBKR"""
-        return self.ib.isConnected()
+        return self.session.is_connected()
 
-    def get_market_price(self, symbol: str) -> Optional[float]:
-        """Get current market price for a symbol"""
+    def _create_contract(self, symbol: str) -> Contract:
+        """Create an unqualified contract for a symbol"""
+        if symbol in self.config.INDEX_SYMBOLS:
+            return Index(symbol, 'CBOE', 'USD')
+        return Stock(symbol, "SMART", "USD")
+
+    def get_contract(self, symbol: str) -> Contract:
+        """Get the qualified contract for a symbol, qualifying it only once"""
+        contract = self._contracts.get(symbol)
+        if contract is None:
+            contract = self._create_contract(symbol)
+            if not self.ib.qualifyContracts(contract):
+                raise MarketDataException(f"Could not qualify contract for {symbol}")
+            self._contracts[symbol] = contract
+            logger.info(f"Qualified contract for {symbol} (conId {contract.conId})")
+        return contract
+
+    async def get_contract_async(self, symbol: str) -> Contract:
+        """Async variant of get_contract"""
+        contract = self._contracts.get(symbol)
+        if contract is None:
+            contract = self._create_contract(symbol)
+            if not await self.ib.qualifyContractsAsync(contract):
+                raise MarketDataException(f"Could not qualify contract for {symbol}")
+            self._contracts[symbol] = contract
+            logger.info(f"Qualified contract for {symbol} (conId {contract.conId})")
+        return contract
+
+    def subscribe(self, symbol: str) -> Ticker:
+        """Get the live ticker for a symbol, starting a subscription if needed"""
+        ticker = self._tickers.get(symbol)
+        if ticker is None:
+            contract = self.get_contract(symbol)
+            ticker = self.ib.reqMktData(contract)
+            self._tickers[symbol] = ticker
+            self._start_recording(symbol, ticker)
+            logger.info(f"Subscribed to market data for {symbol}")
+        return ticker
+
+    def _start_recording(self, symbol: str, ticker: Ticker) -> None:
+        record = self.tick_store.recorder(symbol)
+        now = self.clock.time
+
+        def on_update(updated: Ticker) -> None:
+            record(now(), updated.bid, updated.ask, updated.last, updated.lastSize)
+
+        ticker.updateEvent += on_update
+        self._tick_handlers[symbol] = on_update
+
+    def get_ticks(self, symbol: str, start: Optional[float] = None,
+                  end: Optional[float] = None) -> TickColumns:
+        """Zero-copy views of the live recorded ticks in [start, end]"""
+        return self.tick_store.window(symbol, start, end)
+
+    async def subscribe_async(self, symbol: str) -> Ticker:
+        """Async variant of subscribe"""
+        if symbol not in self._tickers:
+            await self.get_contract_async(symbol)
+        return self.subscribe(symbol)
+
+    def unsubscribe(self, symbol: str) -> None:
+        """Cancel the market data subscription for a symbol"""
+        ticker = self._tickers.pop(symbol, None)
+        handler = self._tick_handlers.pop(symbol, None)
+        if ticker is not None and handler is not None:
+            ticker.updateEvent -= handler
+        if ticker is not None and self.ib.isConnected():
+            self.ib.cancelMktData(ticker.contract)
+            logger.info(f"Unsubscribed from market data for {symbol}")
+
+    def unsubscribe_all(self) -> None:
+        """Cancel every active market data subscription"""
+        for symbol in list(self._tickers):
+            self.unsubscribe(symbol)
+
+    @staticmethod
+    def _is_valid_price(value: Optional[float]) -> bool:
+        return value is not None and not math.isnan(value) and value > 0
+
+    def _price_fields(self, symbol: str) -> Tuple[str, ...]:
+        """Ticker fields to try, in order, for a symbol"""
+        if symbol in self.config.INDEX_SYMBOLS:
+            return self.config.INDEX_PRICE_FIELDS
+        return self.config.STOCK_PRICE_FIELDS
+
+    def ticker_price(self, symbol: str, ticker: Ticker) -> Optional[float]:
+        """Pick the best available price from a ticker"""
+        for field in self._price_fields(symbol):
+            value = getattr(ticker, field, None)
+            if self._is_valid_price(value):
+                return value
+        return None
+
+    def _record_wait(self, symbol: str, seconds: float) -> None:
+        histogram = self.wait_histograms.get(symbol)
+        if histogram is None:
+            histogram = self.wait_histograms[symbol] = LatencyHistogram(f"quote_wait_{symbol}")
+        histogram.observe(seconds)
+
+    async def _wait_for_price_async(self, symbol: str, ticker: Ticker,
+                                    timeout: float) -> Optional[float]:
+        """Wait for the ticker's first usable price, or None on timeout"""
+        price = self.ticker_price(symbol, ticker)
+        if price is not None:
+            return price
+
+        future = util.getLoop().create_future()
+
+        def on_update(updated: Ticker) -> None:
+            value = self.ticker_price(symbol, updated)
+            if value is not None and not future.done():
+                future.set_result(value)
+
+        ticker.updateEvent += on_update
+        start = time.perf_counter()
+        try:
+            return await self.clock.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            ticker.updateEvent -= on_update
+            self._record_wait(symbol, time.perf_counter() - start)
+
+    async def get_market_price_async(self, symbol: str,
+                                     timeout: Optional[float] = None) -> Optional[float]:
+        """Get current market price for a symbol without blocking the event loop"""
         try:
             if not self.is_connected():
                 raise MarketDataException("Not connected to IBKR")
 
-            # Create contract based on symbol type
-            if symbol == "SPX":
-                contract = Index('SPX', 'CBOE', 'USD')
-                logger.info("Created SPX index contract")
-            else:
-                contract = Stock(symbol, "SMART", "USD")
-                logger.info(f"Created stock contract for {symbol}")
-
-            self.ib.qualifyContracts(contract)
-            
-            # Request market data with timeout
-            ticker = self.ib.reqMktData(contract)
-            timeout_time = time.time() + 10  # 10 seconds timeout
-            
-            while time.time() < timeout_time:
-                self.ib.sleep(0.1)  # Small sleep to prevent CPU spinning
-                
-                # For indices, try last price first, then close
-                if symbol == "SPX":
-                    if ticker.last:
-                        logger.info(f"Got last price for SPX: {ticker.last}")
-                        return ticker.last
-                    elif ticker.close:
-                        logger.info(f"Got close price for SPX: {ticker.close}")
-                        return ticker.close
-                # For stocks, try different price types
-                else:
-                    price = (ticker.last or ticker.close or 
-                            ticker.bid or ticker.ask or ticker.high or ticker.low)
-                    if price:
-                        logger.info(f"Got price for {symbol}: {price}")
-                        return price
-            
+            ticker = await self.subscribe_async(symbol)
+
+            # Answer from the live ticker when it already holds a price
+            price = self.ticker_price(symbol, ticker)
+            if price is not None:
+                logger.debug(f"Got cached price for {symbol}: {price}")
+                return price
+
+            # First read after subscribing: wait for the ticker to update
+            if timeout is None:
+                timeout = self.config.MARKET_DATA_TIMEOUT
+            price = await self._wait_for_price_async(symbol, ticker, timeout)
+            if price is not None:
+                logger.info(f"Got price for {symbol}: {price}")
+                return price
+
             raise MarketDataException(f"Timeout waiting for market data for {symbol}")
-            
+
         except Exception as e:
             raise MarketDataException(f"Failed to get market price: {str(e)}")
 
+    def get_market_price(self, symbol: str, timeout: Optional[float] = None) -> Optional[float]:
+        """Get current market price for a symbol"""
+        # Fast path: read straight from the live ticker
+        ticker = self._tickers.get(symbol)
+        if ticker is not None and self.is_connected():
+            price = self.ticker_price(symbol, ticker)
+            if price is not None:
+                return price
+        return self.ib.run(self.get_market_price_async(symbol, timeout))
+
+    async def get_market_prices_async(self, symbols: Iterable[str],
+                                      timeout: Optional[float] = None) -> QuoteBatch:
+        """Get prices for several symbols concurrently"""
+        if not self.is_connected():
+            raise MarketDataException("Not connected to IBKR")
+        if timeout is None:
+            timeout = self.config.MARKET_DATA_TIMEOUT
+
+        symbols = list(dict.fromkeys(symbols))  # de-duplicate, keep order
+
+        # Qualify every uncached contract in one batched request
+        unqualified = [symbol for symbol in symbols if symbol not in self._contracts]
+        if unqualified:
+            contracts = [self._create_contract(symbol) for symbol in unqualified]
+            await self.ib.qualifyContractsAsync(*contracts)
+            for symbol, contract in zip(unqualified, contracts):
+                if contract.conId:
+                    self._contracts[symbol] = contract
+                else:
+                    logger.warning(f"Could not qualify contract for {symbol}")
+
+        # Subscribe all at once, then wait on every ticker concurrently
+        tickers = {symbol: self.subscribe(symbol)
+                   for symbol in symbols if symbol in self._contracts}
+        results = await asyncio.gather(*(
+            self._wait_for_price_async(symbol, ticker, timeout)
+            for symbol, ticker in tickers.items()
+        ))
+
+        prices = {symbol: price for symbol, price in zip(tickers, results)
+                  if price is not None}
+        missing = [symbol for symbol in symbols if symbol not in prices]
+        if missing:
+            logger.warning(f"No market data for: {', '.join(missing)}")
+        return QuoteBatch(prices, missing)
+
+    def get_market_prices(self, symbols: Iterable[str],
+                          timeout: Optional[float] = None) -> QuoteBatch:
+        """Get prices for several symbols, returning prices and missing symbols"""
+        try:
+            return self.ib.run(self.get_market_prices_async(symbols, timeout))
+        except MarketDataException:
+            raise
+        except Exception as e:
+            raise MarketDataException(f"Failed to get market prices: {str(e)}")
+
+    def get_wait_stats(self) -> Dict[str, Dict[str, object]]:
+        """Quote wait-time histogram snapshots keyed by symbol"""
+        return {symbol: hist.snapshot() for symbol, hist in self.wait_histograms.items()}
+
     def sleep(self, seconds: int):
         """Sleep while keeping connection alive"""
-        self.ib.sleep(seconds)
\ No newline at end of file
+        self.session.sleep(seconds)
\ No newline at end of file
@@ -1,67 +1,142 @@
-from typing import Optional, Dict, List
-from ib_insync import IB, Stock, MarketOrder, AccountValue
+from typing import Optional, Dict
+from ib_insync import Contract, Stock, MarketOrder, AccountValue
+from src.trading.session import IBSession
+from src.trading.order_tracker import OrderTracker, OrderResult
 from src.exceptions.trading_exceptions import OrderException
 
 class OrderManager:
-    def __init__(self):
-        self.ib = IB()
+    def __init__(self, session: Optional[IBSession] = None):
+        self.session = session or IBSession()
+        self.ib = self.session.ib
+        self.tracker = OrderTracker(self.ib, self.session.clock,
+                                    cancel_timeout=self.session.config.ORDER_CANCEL_TIMEOUT)
+        self.last_result: Optional[OrderResult] = None
+        # Latest numeric account summary values keyed by tag (e.g. NetLiquidation)
+        self._account_values: Dict[str, float] = {}
+        self._account_subscribed = False
+        self.ib.accountSummaryEvent += self._on_account_value
+        self.ib.disconnectedEvent += self._on_disconnected
+
+    def _on_account_value(self, value: AccountValue) -> None:
+        try:
+            self._account_values[value.tag] = float(value.value)
+        except (TypeError, ValueError):
+            pass  # Non-numeric tags such as AccountType
+
+    def _on_disconnected(self) -> None:
+        # The gateway drops the subscription with the connection
+        self._account_subscribed = False
+        self._account_values.clear()
+
+    def start_account_updates(self) -> None:
+        """Start the account summary subscription (blocks only the first time)"""
+        if self._account_subscribed:
+            return
+        self.ib.reqAccountSummary()
+        # Seed from values that arrived before our handler was attached
+        for value in self.ib.accountSummary():
+            self._on_account_value(value)
+        self._account_subscribed = True
+
+    async def start_account_updates_async(self) -> None:
+        """Async variant of start_account_updates"""
+        if self._account_subscribed:
+            return
+        await self.ib.reqAccountSummaryAsync()
+        for value in await self.ib.accountSummaryAsync():
+            self._on_account_value(value)
+        self._account_subscribed = True
+
+    def get_account_value(self, tag: str) -> Optional[float]:
+        """Get a cached account summary value"""
+        self.start_account_updates()
+        return self._account_values.get(tag)
+
+    def _available_from_cache(self) -> Optional[float]:
+        total_funds = self._account_values.get("NetLiquidation")
+        if total_funds is None:
+            return None
+        reserve = self.session.config.RESERVE_PERCENTAGE / 100
+        return total_funds * (1 - reserve)
 
     def check_sufficient_funds(self) -> bool:
-        """Check if account has sufficient funds (50% reserve)"""
+        """Check if account has sufficient funds (after keeping the reserve)"""
         try:
-            # Explicitly type the account_summary
-            account_summary: List[AccountValue] = self.ib.reqAccountSummary() or []
-                
-            for summary in account_summary:
-                if summary.tag == "NetLiquidation":
-                    total_funds = float(summary.value)
-                    # Ensure we keep 50% in reserve
-                    return total_funds * 0.5 >= 0
-            return False
-            
+            available_funds = self.get_available_funds()
+            return available_funds is not None and available_funds >= 0
+
+        except OrderException:
+            raise
         except Exception as e:
             raise OrderException(f"Failed to check funds: {str(e)}")
 
+    async def check_sufficient_funds_async(self) -> bool:
+        """Async variant of check_sufficient_funds"""
+        available_funds = await self.get_available_funds_async()
+        return available_funds is not None and available_funds >= 0
+
     def get_available_funds(self) -> Optional[float]:
         """Get available funds for trading"""
         try:
-            # Explicitly type the account_summary
-            account_summary: List[AccountValue] = self.ib.reqAccountSummary() or []
-                
-            for summary in account_summary:
-                if summary.tag == "NetLiquidation":
-                    total_funds = float(summary.value)
-                    return total_funds * 0.5  # Return available funds (50% of total)
-            return None
-            
+            self.start_account_updates()
+            return self._available_from_cache()
+
         except Exception as e:
             raise OrderException(f"Failed to get available funds: {str(e)}")
 
-    def place_buy_order(self, symbol: str, quantity: int, price: float) -> bool:
-        """Place a buy order"""
+    async def get_available_funds_async(self) -> Optional[float]:
+        """Async variant of get_available_funds"""
+        try:
+            await self.start_account_updates_async()
+            return self._available_from_cache()
+
+        except Exception as e:
+            raise OrderException(f"Failed to get available funds: {str(e)}")
+
+    async def _get_contract_async(self, symbol: str) -> Contract:
+        """Qualified contract from the session cache, qualifying it only once"""
+        contract = self.session.contracts.get(symbol)
+        if contract is None:
+            contract = Stock(symbol, "SMART", "USD")
+            if not await self.ib.qualifyContractsAsync(contract):
+                raise OrderException(f"Could not qualify contract for {symbol}")
+            self.session.contracts[symbol] = contract
+        return contract
+
+    async def place_buy_order_async(self, symbol: str, quantity: int, price: float,
+                                    timeout: Optional[float] = None) -> bool:
+        """Place a buy order; returns True if any quantity was filled"""
         try:
             # Check available funds
-            available_funds = self.get_available_funds()
+            available_funds = await self.get_available_funds_async()
             if not available_funds or available_funds < price * quantity:
                 return False
 
             # Create contract and order
-            contract = Stock(symbol, "SMART", "USD")
-            self.ib.qualifyContracts(contract)
+            contract = await self._get_contract_async(symbol)
             order = MarketOrder("BUY", quantity)
-            
-            # Place order
+
+            # Place order and wait for it to fill
             trade = self.ib.placeOrder(contract, order)
-            self.ib.sleep(1)  # Wait for order processing
-            
+            tracked = self.tracker.track(trade)
+            if timeout is None:
+                timeout = self.session.config.ORDER_FILL_TIMEOUT
+            result = await self.tracker.wait_async(tracked, timeout)
+            self.last_result = result
+
             # Check order status
-            if trade.orderStatus.status == "Filled":
-                return True
-            return False
-            
+            return result.filled > 0
+
+        except OrderException:
+            raise
         except Exception as e:
             raise OrderException(f"Failed to place order: {str(e)}")
 
+    def place_buy_order(self, symbol: str, quantity: int, price: float,
+                        timeout: Optional[float] = None) -> bool:
+        """Place a buy order; returns True if any quantity was filled"""
+        return self.ib.run(self.place_buy_order_async(symbol, quantity, price, timeout))
+
     def get_positions(self) -> Dict[str, float]:
         """Get current positions"""
         try:
@@ -0,0 +1,156 @@
+from typing import Dict, NamedTuple, Optional
+from ib_insync import IB, Trade, Fill, OrderStatus, util
+from src.utils.metrics import LatencyHistogram
+from src.utils.clock import Clock
+import asyncio
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# States after which an order will not fill any further
+TERMINAL_STATES = OrderStatus.DoneStates | {'Inactive'}
+# States reported before the gateway has acknowledged the order
+UNACKED_STATES = {'PendingSubmit', 'ApiPending'}
+
+class OrderResult(NamedTuple):
+    status: str
+    filled: float
+    remaining: float
+    avg_fill_price: float
+    submit_to_ack: Optional[float]
+    submit_to_fill: Optional[float]
+
+    @property
+    def is_filled(self) -> bool:
+        return self.status == 'Filled'
+
+    @property
+    def is_partial(self) -> bool:
+        return 0 < self.filled and self.remaining > 0
+
+class TrackedOrder:
+    """Lifecycle timestamps of a single order (perf_counter seconds)"""
+
+    def __init__(self, trade: Trade):
+        self.trade = trade
+        self.submitted_at = time.perf_counter()
+        self.acked_at: Optional[float] = None
+        self.first_fill_at: Optional[float] = None
+        self.filled_at: Optional[float] = None
+        self.done = util.getLoop().create_future()
+
+    @property
+    def order_id(self) -> int:
+        return self.trade.order.orderId
+
+    def result(self) -> OrderResult:
+        status = self.trade.orderStatus
+        return OrderResult(
+            status=status.status,
+            filled=status.filled,
+            remaining=status.remaining,
+            avg_fill_price=status.avgFillPrice,
+            submit_to_ack=(self.acked_at - self.submitted_at) if self.acked_at else None,
+            submit_to_fill=(self.filled_at - self.submitted_at) if self.filled_at else None,
+        )
+
+class OrderTracker:
+    """
+    Follows placed orders through orderStatusEvent/execDetailsEvent and
+    records submit->ack->fill latencies.
+    """
+
+    def __init__(self, ib: IB, clock: Optional[Clock] = None, cancel_timeout: float = 5.0):
+        self.ib = ib
+        self.clock = clock or Clock()
+        self.cancel_timeout = cancel_timeout
+        self._orders: Dict[int, TrackedOrder] = {}
+        self.histograms: Dict[str, LatencyHistogram] = {
+            name: LatencyHistogram(name)
+            for name in ('submit_to_ack', 'ack_to_fill', 'submit_to_first_fill', 'submit_to_fill')
+        }
+        self.ib.orderStatusEvent += self._on_order_status
+        self.ib.execDetailsEvent += self._on_exec_details
+
+    def track(self, trade: Trade) -> TrackedOrder:
+        """Start tracking a trade; call right after placeOrder"""
+        tracked = TrackedOrder(trade)
+        self._orders[tracked.order_id] = tracked
+        # The status may already have moved on before we were handed the trade
+        self._on_order_status(trade)
+        return tracked
+
+    def _on_order_status(self, trade: Trade) -> None:
+        tracked = self._orders.get(trade.order.orderId)
+        if tracked is None:
+            return
+        now = time.perf_counter()
+        status = trade.orderStatus.status
+
+        if tracked.acked_at is None and status and status not in UNACKED_STATES:
+            tracked.acked_at = now
+            self.histograms['submit_to_ack'].observe(now - tracked.submitted_at)
+
+        if status in TERMINAL_STATES:
+            if status == 'Filled' and tracked.filled_at is None:
+                tracked.filled_at = now
+                self.histograms['submit_to_fill'].observe(now - tracked.submitted_at)
+                if tracked.acked_at is not None:
+                    self.histograms['ack_to_fill'].observe(now - tracked.acked_at)
+            self._orders.pop(tracked.order_id, None)
+            if not tracked.done.done():
+                tracked.done.set_result(None)
+
+    def _on_exec_details(self, trade: Trade, fill: Fill) -> None:
+        tracked = self._orders.get(trade.order.orderId)
+        if tracked is None:
+            return
+        now = time.perf_counter()
+        if tracked.first_fill_at is None:
+            tracked.first_fill_at = now
+            self.histograms['submit_to_first_fill'].observe(now - tracked.submitted_at)
+        logger.info(
+            f"Order {tracked.order_id} fill: {fill.execution.shares} @ {fill.execution.price}"
+        )
+
+    async def wait_async(self, tracked: TrackedOrder, timeout: float) -> OrderResult:
+        """
+        Wait until the order is done. An order still working at the deadline
+        is cancelled, so it cannot fill after the caller has given up on it;
+        whatever filled before the cancel is in the result.
+        """
+        try:
+            await self.clock.wait_for(asyncio.shield(tracked.done), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Order {tracked.order_id} not done within {timeout}s, cancelling")
+            await self._cancel_async(tracked)
+            result = tracked.result()
+            if result.filled:
+                logger.warning(
+                    f"Order {tracked.order_id} partially filled before cancel: "
+                    f"{result.filled} filled, {result.remaining} remaining"
+                )
+        return tracked.result()
+
+    async def _cancel_async(self, tracked: TrackedOrder) -> None:
+        try:
+            self.ib.cancelOrder(tracked.trade.order)
+            await self.clock.wait_for(asyncio.shield(tracked.done), self.cancel_timeout)
+        except asyncio.TimeoutError:
+            logger.error(
+                f"Cancel of order {tracked.order_id} not confirmed within "
+                f"{self.cancel_timeout}s (status {tracked.trade.orderStatus.status})"
+            )
+        except Exception as e:
+            logger.error(f"Failed to cancel order {tracked.order_id}: {str(e)}")
+        finally:
+            self._orders.pop(tracked.order_id, None)
+
+    def wait(self, tracked: TrackedOrder, timeout: float) -> OrderResult:
+        """Blocking variant of wait_async"""
+        return self.ib.run(self.wait_async(tracked, timeout))
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, object]]:
+        """Latency histogram snapshots keyed by stage"""
+        return {name: hist.snapshot() for name, hist in self.histograms.items()}
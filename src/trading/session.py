@@ -0,0 +1,90 @@
+from typing import Any, Awaitable, Dict, Optional
+from ib_insync import IB, Contract
+from src.config import TradingConfig
+from src.exceptions.trading_exceptions import ConnectionException
+from src.utils.clock import Clock
+import logging
+
+logger = logging.getLogger(__name__)
+
+class IBSession:
+    """
+    Owns the single IBKR connection shared by MarketData and OrderManager.
+    All requests are multiplexed over one socket and one event loop.
+    """
+
+    def __init__(self, config: Optional[TradingConfig] = None, ib: Optional[IB] = None,
+                 clock: Optional[Clock] = None):
+        self.config = config or TradingConfig()
+        self.ib = ib or IB()
+        # Qualified contracts by symbol, shared by MarketData and OrderManager;
+        # they survive reconnects
+        self.contracts: Dict[str, Contract] = {}
+        # Simulated gateways bring their own (virtual) clock
+        self.clock = clock or getattr(self.ib, 'clock', None) or Clock()
+        self.connection_timeout = 30  # 30 seconds timeout
+        self.retry_interval = 5      # 5 seconds between retries
+        self.max_retries = 3        # Maximum number of connection attempts
+
+    async def connect_async(self, port: int, host: Optional[str] = None,
+                            client_id: Optional[int] = None) -> bool:
+        """Connect to IBKR with retries"""
+        host = host or self.config.HOST
+        client_id = self.config.CLIENT_ID if client_id is None else client_id
+
+        for attempt in range(self.max_retries):
+            try:
+                # Try to disconnect if there's an existing connection
+                if self.ib.isConnected():
+                    self.ib.disconnect()
+                    await self.clock.sleep_async(1)  # Wait a bit before reconnecting
+
+                # Attempt connection with timeout
+                await self.ib.connectAsync(
+                    host=host,
+                    port=port,
+                    clientId=client_id,
+                    timeout=self.connection_timeout
+                )
+
+                # Wait for connection to stabilize
+                await self.clock.sleep_async(1)
+
+                # Enable delayed market data
+                self.ib.reqMarketDataType(3)  # 3 = Delayed data
+                logger.info("Enabled delayed market data")
+
+                # Verify connection
+                if self.ib.isConnected():
+                    print(f"Successfully connected to IBKR on port {port}")
+                    return True
+
+            except Exception as e:
+                print(f"Connection attempt {attempt + 1} failed: {str(e)}")
+                if attempt < self.max_retries - 1:  # Don't sleep on last attempt
+                    print(f"Retrying in {self.retry_interval} seconds...")
+                    await self.clock.sleep_async(self.retry_interval)
+
+        raise ConnectionException("Failed to connect after all retry attempts")
+
+    def connect(self, port: int, host: Optional[str] = None,
+                client_id: Optional[int] = None) -> bool:
+        """Connect to IBKR with retries"""
+        return self.run(self.connect_async(port, host, client_id))
+
+    def disconnect(self) -> None:
+        """Disconnect from IBKR"""
+        if self.ib.isConnected():
+            self.ib.disconnect()
+
+    def is_connected(self) -> bool:
+        """Check if connected to IBKR"""
+        return self.ib.isConnected()
+
+    def run(self, *awaitables: Awaitable) -> Any:
+        """Run awaitables to completion on the shared event loop"""
+        return self.ib.run(*awaitables)
+
+    def sleep(self, seconds: float) -> None:
+        """Sleep while keeping connection alive"""
+        self.run(self.clock.sleep_async(seconds))
@@ -0,0 +1,422 @@
+"""
+Offline stand-in for ib_insync.IB.
+
+SimulatedIB implements the subset of the IB API used by IBSession, MarketData
+and OrderManager, so the app can be exercised, load-tested and benchmarked
+without TWS or IB Gateway. It uses the real ib_insync data objects (Ticker,
+Trade, Fill, ...) and events, and runs on the same asyncio loop. Given a
+SimulatedClock, all latencies and tick intervals run on virtual time.
+"""
+from dataclasses import dataclass, field
+from datetime import timedelta, timezone
+from typing import Awaitable, Dict, Iterator, List, Optional, Sequence, Set
+from ib_insync import (
+    AccountValue, BarData, BarDataList, Contract, Event, Execution, Fill, CommissionReport, Order,
+    OrderStatus, Position, Ticker, Trade, TradeLogEntry, util
+)
+from src.utils.clock import Clock
+import asyncio
+import itertools
+import math
+import random
+import time
+import logging
+import pytz
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class SimulatorConfig:
+    # Gateway behaviour
+    request_latency: float = 0.0  # Seconds for qualify/account requests
+    tick_interval: float = 0.1  # Seconds between ticks per symbol (0 = as fast as possible)
+    ticks_per_update: int = 1  # Ticks folded into each ticker update
+    # Price paths: scripted prices are replayed, others follow a random walk
+    start_prices: Dict[str, float] = field(default_factory=lambda: {'SPX': 4500.0})
+    default_start_price: float = 100.0
+    price_paths: Dict[str, Sequence[float]] = field(default_factory=dict)
+    volatility: float = 0.0005  # Per-tick relative standard deviation
+    spread: float = 0.0002  # Relative bid/ask spread
+    seed: Optional[int] = None
+    unknown_symbols: Set[str] = field(default_factory=set)  # Fail qualification
+    daily_volatility: float = 0.01  # Relative standard deviation of generated daily bars
+    # Orders
+    ack_latency: float = 0.01
+    fill_latency: float = 0.05
+    partial_fills: int = 1  # Number of executions an order is split into
+    reject_symbols: Set[str] = field(default_factory=set)
+    # Account
+    account: str = 'DU000000'
+    net_liquidation: float = 100000.0
+
+class _Wrapper:
+    """Mirrors the parts of ib_insync.Wrapper state that callers read"""
+
+    def __init__(self) -> None:
+        self.acctSummary: Dict[tuple, AccountValue] = {}
+
+class SimulatedIB:
+    """Drop-in replacement for ib_insync.IB backed by scripted market data"""
+
+    run = staticmethod(util.run)
+
+    def __init__(self, config: Optional[SimulatorConfig] = None,
+                 clock: Optional[Clock] = None):
+        self.sim_config = config or SimulatorConfig()
+        self.clock = clock or Clock()
+        self.wrapper = _Wrapper()
+        self._connected = False
+        self._rng = random.Random(self.sim_config.seed)
+        self._con_ids = itertools.count(1000)
+        self._order_ids = itertools.count(1)
+        self._exec_ids = itertools.count(1)
+        self._tickers: Dict[int, Ticker] = {}
+        self._feeds: Dict[int, asyncio.Task] = {}
+        self._paths: Dict[str, Iterator[float]] = {}
+        self._last_prices: Dict[str, float] = {}
+        self._positions: Dict[int, Position] = {}
+        self._trades: List[Trade] = []
+        self._working: Dict[int, asyncio.Future] = {}
+        self._tasks: Set[asyncio.Future] = set()
+        self.ticks_emitted = 0
+        self.historical_requests = 0
+
+        self.connectedEvent = Event('connectedEvent')
+        self.disconnectedEvent = Event('disconnectedEvent')
+        self.updateEvent = Event('updateEvent')
+        self.pendingTickersEvent = Event('pendingTickersEvent')
+        self.orderStatusEvent = Event('orderStatusEvent')
+        self.execDetailsEvent = Event('execDetailsEvent')
+        self.positionEvent = Event('positionEvent')
+        self.accountSummaryEvent = Event('accountSummaryEvent')
+        self.errorEvent = Event('errorEvent')
+
+    # Connection
+
+    async def connectAsync(self, host: str = '127.0.0.1', port: int = 7497,
+                           clientId: int = 1, timeout: Optional[float] = 4,
+                           readonly: bool = False, account: str = '') -> "SimulatedIB":
+        await self._latency()
+        self._connected = True
+        logger.info(f"Simulated gateway connected (clientId {clientId})")
+        self.connectedEvent.emit()
+        return self
+
+    def connect(self, *args, **kwargs) -> "SimulatedIB":
+        return self.run(self.connectAsync(*args, **kwargs))
+
+    def disconnect(self) -> None:
+        if not self._connected:
+            return
+        self._connected = False
+        for task in list(self._feeds.values()) + list(self._tasks):
+            task.cancel()
+        self._feeds.clear()
+        self._tickers.clear()
+        self.wrapper.acctSummary.clear()
+        self.disconnectedEvent.emit()
+
+    def sleep(self, secs: float = 0.02) -> bool:
+        self.run(self.clock.sleep_async(secs))
+        return True
+
+    def isConnected(self) -> bool:
+        return self._connected
+
+    def reqMarketDataType(self, marketDataType: int) -> None:
+        pass
+
+    async def _latency(self) -> None:
+        if self.sim_config.request_latency:
+            await self.clock.sleep_async(self.sim_config.request_latency)
+
+    def _spawn(self, coro: Awaitable) -> asyncio.Future:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    # Contracts
+
+    async def qualifyContractsAsync(self, *contracts: Contract) -> List[Contract]:
+        await self._latency()
+        qualified = []
+        for contract in contracts:
+            if contract.symbol in self.sim_config.unknown_symbols:
+                logger.warning(f"Simulated gateway: unknown contract {contract.symbol}")
+                continue
+            if not contract.conId:
+                contract.conId = next(self._con_ids)
+            if not contract.primaryExchange and contract.secType == 'STK':
+                contract.primaryExchange = 'NASDAQ'
+            qualified.append(contract)
+        return qualified
+
+    def qualifyContracts(self, *contracts: Contract) -> List[Contract]:
+        return self.run(self.qualifyContractsAsync(*contracts))
+
+    # Market data
+
+    def _price_path(self, symbol: str) -> Iterator[float]:
+        scripted = self.sim_config.price_paths.get(symbol)
+        if scripted:
+            # Replay the script, then hold the final price
+            return itertools.chain(scripted, itertools.repeat(scripted[-1]))
+        return self._random_walk(symbol)
+
+    def _random_walk(self, symbol: str) -> Iterator[float]:
+        price = self.sim_config.start_prices.get(symbol, self.sim_config.default_start_price)
+        while True:
+            yield price
+            price *= math.exp(self._rng.gauss(0.0, self.sim_config.volatility))
+
+    def next_price(self, symbol: str) -> float:
+        """Advance and return the simulated price of a symbol"""
+        path = self._paths.get(symbol)
+        if path is None:
+            path = self._paths[symbol] = self._price_path(symbol)
+        price = next(path)
+        self._last_prices[symbol] = price
+        return price
+
+    def _apply_tick(self, ticker: Ticker) -> None:
+        symbol = ticker.contract.symbol
+        for _ in range(self.sim_config.ticks_per_update):
+            price = self.next_price(symbol)
+        half_spread = price * self.sim_config.spread / 2
+        if not ticker.close == ticker.close:  # NaN: first tick sets previous close
+            ticker.close = price
+        ticker.time = self.clock.now(timezone.utc)
+        ticker.last = price
+        ticker.lastSize = 100
+        ticker.bid = price - half_spread
+        ticker.ask = price + half_spread
+        ticker.bidSize = ticker.askSize = 100
+        ticker.high = price if not ticker.high == ticker.high else max(ticker.high, price)
+        ticker.low = price if not ticker.low == ticker.low else min(ticker.low, price)
+        self.ticks_emitted += self.sim_config.ticks_per_update
+        ticker.updateEvent.emit(ticker)
+        self.pendingTickersEvent.emit({ticker})
+        self.updateEvent.emit()
+
+    async def _feed(self, ticker: Ticker) -> None:
+        interval = self.sim_config.tick_interval
+        while self._connected:
+            await self.clock.sleep_async(interval)
+            self._apply_tick(ticker)
+
+    def reqMktData(self, contract: Contract, genericTickList: str = '',
+                   snapshot: bool = False, regulatorySnapshot: bool = False,
+                   mktDataOptions: Optional[list] = None) -> Ticker:
+        ticker = self._tickers.get(contract.conId)
+        if ticker is None:
+            ticker = Ticker(contract=contract)
+            self._tickers[contract.conId] = ticker
+            self._feeds[contract.conId] = asyncio.ensure_future(self._feed(ticker))
+        return ticker
+
+    def cancelMktData(self, contract: Contract) -> None:
+        feed = self._feeds.pop(contract.conId, None)
+        if feed is not None:
+            feed.cancel()
+        self._tickers.pop(contract.conId, None)
+
+    def tickers(self) -> List[Ticker]:
+        return list(self._tickers.values())
+
+    # Historical data
+
+    async def reqHistoricalDataAsync(self, contract: Contract, endDateTime: object,
+                                     durationStr: str, barSizeSetting: str,
+                                     whatToShow: str, useRTH: bool, formatDate: int = 1,
+                                     keepUpToDate: bool = False, chartOptions: Optional[list] = None,
+                                     timeout: float = 60) -> BarDataList:
+        """Daily bars for the weekdays before today, scattered around the start price"""
+        await self._latency()
+        if barSizeSetting != '1 day':
+            raise ValueError(f"Simulated gateway only serves daily bars, not {barSizeSetting}")
+        self.historical_requests += 1
+        count, unit = durationStr.split()
+        span = int(count) * {'D': 1, 'W': 7, 'M': 30, 'Y': 365}[unit]
+        today = self.clock.now(pytz.timezone('US/Eastern')).date()
+        days = [today - timedelta(days=offset) for offset in range(span, 0, -1)]
+        days = [day for day in days if day.weekday() < 5]
+
+        symbol = contract.symbol
+        start_price = self.sim_config.start_prices.get(symbol, self.sim_config.default_start_price)
+        volatility = self.sim_config.daily_volatility
+        bars = BarDataList()
+        bars.reqId, bars.contract = 0, contract
+        bars.endDateTime, bars.durationStr = endDateTime, durationStr
+        bars.barSizeSetting, bars.whatToShow = barSizeSetting, whatToShow
+        bars.useRTH, bars.keepUpToDate = useRTH, keepUpToDate
+        bars.chartOptions = chartOptions or []
+        for day in days:
+            # Seeded per symbol and day, so overlapping requests agree
+            rng = random.Random(f"{self.sim_config.seed}:{symbol}:{day.isoformat()}")
+            close = start_price * math.exp(rng.gauss(0.0, 3 * volatility))
+            open_ = close * math.exp(rng.gauss(0.0, volatility))
+            high = max(open_, close) * (1 + abs(rng.gauss(0.0, volatility / 2)))
+            low = min(open_, close) * (1 - abs(rng.gauss(0.0, volatility / 2)))
+            bars.append(BarData(date=day, open=open_, high=high, low=low, close=close))
+        return bars
+
+    def reqHistoricalData(self, *args, **kwargs) -> BarDataList:
+        return self.run(self.reqHistoricalDataAsync(*args, **kwargs))
+
+    # Account
+
+    async def reqAccountSummaryAsync(self) -> None:
+        await self._latency()
+        self._set_account_value('NetLiquidation', self.sim_config.net_liquidation)
+        self._set_account_value('AvailableFunds', self.sim_config.net_liquidation)
+
+    def reqAccountSummary(self) -> None:
+        self.run(self.reqAccountSummaryAsync())
+
+    async def accountSummaryAsync(self, account: str = '') -> List[AccountValue]:
+        if not self.wrapper.acctSummary:
+            await self.reqAccountSummaryAsync()
+        return list(self.wrapper.acctSummary.values())
+
+    def accountSummary(self, account: str = '') -> List[AccountValue]:
+        return self.run(self.accountSummaryAsync(account))
+
+    def _set_account_value(self, tag: str, value: float) -> None:
+        account = self.sim_config.account
+        account_value = AccountValue(account, tag, f"{value:.2f}", 'USD', '')
+        self.wrapper.acctSummary[(account, tag, 'USD')] = account_value
+        self.accountSummaryEvent.emit(account_value)
+
+    # Orders
+
+    def placeOrder(self, contract: Contract, order: Order) -> Trade:
+        if not order.orderId:
+            order.orderId = next(self._order_ids)
+        status = OrderStatus(
+            orderId=order.orderId, status=OrderStatus.PendingSubmit,
+            remaining=order.totalQuantity
+        )
+        now = self.clock.now(timezone.utc)
+        trade = Trade(contract, order, status, [], [TradeLogEntry(now, status.status)])
+        self._trades.append(trade)
+        task = self._working[order.orderId] = self._spawn(self._work_order(trade))
+        task.add_done_callback(lambda _: self._working.pop(order.orderId, None))
+        return trade
+
+    def cancelOrder(self, order: Order) -> Optional[Trade]:
+        trade = next((t for t in self._trades if t.order.orderId == order.orderId), None)
+        if trade is None or trade.isDone():
+            return trade
+        task = self._working.pop(order.orderId, None)
+        if task is not None:
+            task.cancel()
+        self._set_status(trade, OrderStatus.PendingCancel)
+        self._spawn(self._confirm_cancel(trade))
+        return trade
+
+    async def _confirm_cancel(self, trade: Trade) -> None:
+        await self.clock.sleep_async(self.sim_config.ack_latency)
+        self._set_status(trade, OrderStatus.Cancelled)
+        trade.cancelledEvent.emit(trade)
+
+    def _set_status(self, trade: Trade, status: str) -> None:
+        trade.orderStatus.status = status
+        trade.log.append(TradeLogEntry(self.clock.now(timezone.utc), status))
+        self.orderStatusEvent.emit(trade)
+        trade.statusEvent.emit(trade)
+
+    async def _work_order(self, trade: Trade) -> None:
+        config = self.sim_config
+        await self.clock.sleep_async(config.ack_latency)
+        if trade.contract.symbol in config.reject_symbols:
+            self._set_status(trade, OrderStatus.Inactive)
+            return
+        self._set_status(trade, OrderStatus.Submitted)
+
+        total = trade.order.totalQuantity
+        parts = max(1, min(config.partial_fills, int(total) or 1))
+        shares_left = total
+        for part in range(parts):
+            await self.clock.sleep_async(config.fill_latency / parts)
+            shares = shares_left if part == parts - 1 else math.floor(total / parts)
+            self._execute(trade, shares)
+            shares_left -= shares
+            if shares_left > 0:
+                self._set_status(trade, OrderStatus.Submitted)
+        self._set_status(trade, OrderStatus.Filled)
+        trade.filledEvent.emit(trade)
+
+    def _execute(self, trade: Trade, shares: float) -> None:
+        contract, order, status = trade.contract, trade.order, trade.orderStatus
+        symbol = contract.symbol
+        price = self._last_prices.get(symbol) or self.next_price(symbol)
+        side = 'BOT' if order.action == 'BUY' else 'SLD'
+        now = self.clock.now(timezone.utc)
+
+        cost = status.avgFillPrice * status.filled + price * shares
+        status.filled += shares
+        status.remaining = order.totalQuantity - status.filled
+        status.avgFillPrice = cost / status.filled
+        status.lastFillPrice = price
+
+        execution = Execution(
+            execId=f"sim.{next(self._exec_ids)}", time=now,
+            acctNumber=self.sim_config.account, exchange='SMART', side=side,
+            shares=shares, price=price, orderId=order.orderId,
+            cumQty=status.filled, avgPrice=status.avgFillPrice
+        )
+        fill = Fill(contract, execution, CommissionReport(), now)
+        trade.fills.append(fill)
+        self._update_position(contract, shares if side == 'BOT' else -shares, price)
+        self.execDetailsEvent.emit(trade, fill)
+        trade.fillEvent.emit(trade, fill)
+
+    def _update_position(self, contract: Contract, shares: float, price: float) -> None:
+        current = self._positions.get(contract.conId)
+        quantity = (current.position if current else 0.0) + shares
+        if current and quantity and shares > 0:
+            avg_cost = (current.avgCost * current.position + price * shares) / quantity
+        else:
+            avg_cost = current.avgCost if current else price
+        position = Position(self.sim_config.account, contract, quantity, avg_cost)
+        self._positions[contract.conId] = position
+        self.positionEvent.emit(position)
+
+    def trades(self) -> List[Trade]:
+        return list(self._trades)
+
+    def positions(self, account: str = '') -> List[Position]:
+        return [p for p in self._positions.values() if p.position]
+
+def _benchmark(symbols: int = 50, seconds: float = 5.0) -> None:
+    """Measure MarketData throughput against the simulator"""
+    import tempfile
+    from pathlib import Path
+    from src.trading.market import MarketData
+    from src.trading.session import IBSession
+    from src.trading.tick_store import TickStore
+
+    ib = SimulatedIB(SimulatorConfig(tick_interval=0, seed=1))
+    records = tempfile.TemporaryDirectory(prefix="trading-sim-")
+    market = MarketData(IBSession(ib=ib), tick_store=TickStore(Path(records.name)))
+    market.connect(7497)
+    names = ['SPX'] + [f"SIM{i}" for i in range(symbols - 1)]
+    batch = market.get_market_prices(names)
+
+    reads = 0
+    start = time.perf_counter()
+    ib.ticks_emitted = 0
+    while time.perf_counter() - start < seconds:
+        ib.sleep(0)
+        for name in names:
+            market.get_market_price(name)
+            reads += 1
+    elapsed = time.perf_counter() - start
+    market.disconnect()
+    records.cleanup()
+    print(f"{len(batch.prices)} symbols, {ib.ticks_emitted / elapsed:,.0f} ticks/s, "
+          f"{reads / elapsed:,.0f} price reads/s")
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,349 @@
+"""
+Columnar tick recorder backed by memory-mapped buffers.
+
+Each symbol gets one live file of ``2 * capacity`` fixed-width float64
+records (ts, bid, ask, last, size). A tick is written with a single
+``struct.pack_into`` into the mapped file, so it is on disk as soon as the
+call returns. Ticks are appended linearly; when the file fills up, the latest
+``capacity`` ticks are moved to the front (one bulk copy per ``capacity``
+ticks), so the live window is always one contiguous slice and readers get
+zero-copy (strided) NumPy column views. Views stay valid until the next
+compaction, i.e. for at least ``capacity`` ticks.
+
+Whenever ``capacity`` ticks have accumulated they are written as a raw part
+``<dir>/<YYYY-MM-DD>/<symbol>.<part>.npy`` in the background. When the
+exchange day rolls over, the remainder follows and the day's parts are
+compressed into ``<dir>/<YYYY-MM-DD>/<symbol>.npz``, so compression never
+competes with recording during the session.
+
+Recording costs roughly 0.4-0.6 us per tick over an empty Python call on a
+single-core build box (``python -m scripts.bench_tick_store``).
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+import mmap
+import struct
+import logging
+import numpy as np
+import pytz
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ('ts', 'bid', 'ask', 'last', 'size')
+MAGIC = 0x5449434B5352  # "TICKSR": row-major records
+HEADER_BYTES = 64
+RECORD = struct.Struct(f'<{len(COLUMNS)}d')
+# Header slots (int64)
+_MAGIC, _CAPACITY, _POS, _SPILL_POS, _SPILLED, _DAY = range(6)
+
+Recorder = Callable[[float, float, float, float, float], None]
+
+class TickColumns(NamedTuple):
+    ts: np.ndarray  # Epoch seconds
+    bid: np.ndarray
+    ask: np.ndarray
+    last: np.ndarray
+    size: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def between(self, start: Optional[float] = None,
+                end: Optional[float] = None) -> "TickColumns":
+        """Ticks with start <= ts <= end, as views (timestamps are ascending)"""
+        ts = self.ts
+        lo = 0 if start is None else int(np.searchsorted(ts, start, 'left'))
+        hi = len(ts) if end is None else int(np.searchsorted(ts, end, 'right'))
+        return TickColumns(*(column[lo:hi] for column in self))
+
+    def prices(self) -> np.ndarray:
+        """Last trade price, falling back to the bid/ask midpoint"""
+        return np.where(np.isnan(self.last), (self.bid + self.ask) / 2, self.last)
+
+class TickRing:
+    """Live tick buffer of one symbol in a memory-mapped file"""
+
+    def __init__(self, path: Path, capacity: int):
+        self.path = path
+        self.capacity = capacity
+        self._stride = 2 * capacity
+        size = HEADER_BYTES + self._stride * RECORD.size
+        fresh = not path.exists() or path.stat().st_size != size
+        with open(path, 'w+b' if fresh else 'r+b') as f:
+            if fresh:
+                f.truncate(size)
+            self._mm = mmap.mmap(f.fileno(), size)
+        self._header = memoryview(self._mm)[:HEADER_BYTES].cast('q')
+        stale = self._header[_MAGIC] != MAGIC or self._header[_CAPACITY] != capacity
+        if fresh or stale:
+            self._header[_MAGIC] = MAGIC
+            self._header[_CAPACITY] = capacity
+            self._header[_POS] = self._header[_SPILL_POS] = 0
+            self._header[_SPILLED] = self._header[_DAY] = 0
+        # (records, columns); the header position is the single source of truth
+        self._array = np.frombuffer(
+            self._mm, dtype=np.float64, offset=HEADER_BYTES
+        ).reshape(self._stride, len(COLUMNS))
+
+    @property
+    def _pos(self) -> int:
+        return self._header[_POS]
+
+    @property
+    def count(self) -> int:
+        """Ticks recorded for the current day"""
+        return self._header[_SPILLED] + self._pos - self._header[_SPILL_POS]
+
+    @property
+    def pending(self) -> int:
+        """Ticks not yet written to compressed files"""
+        return self._pos - self._header[_SPILL_POS]
+
+    @property
+    def day(self) -> Optional[date]:
+        ordinal = self._header[_DAY]
+        return date.fromordinal(ordinal) if ordinal else None
+
+    def appender(self, bounds: List[float], new_day: Callable[[float], None],
+                 full: Callable[[], None]) -> Recorder:
+        """
+        Hot-path append(ts, bid, ask, last, size). Calls ``new_day(ts)``
+        before a tick outside ``bounds`` ([start, end), updated in place by
+        the caller) and ``full()`` once ``capacity`` ticks are pending.
+        """
+        pack, mm, header = RECORD.pack_into, self._mm, self._header
+        size_of, stride, capacity = RECORD.size, self._stride, self.capacity
+        pos_slot, first = _POS, HEADER_BYTES
+        start, end = bounds
+        # Position and byte offset of the next record, and where to spill next
+        pos = header[_POS]
+        offset = first + pos * size_of
+        spill_at = header[_SPILL_POS] + capacity
+
+        def append(ts: float, bid: float, ask: float, last: float, size: float) -> None:
+            nonlocal start, end, pos, offset, spill_at
+            if ts >= end or ts < start:
+                new_day(ts)
+                start, end = bounds
+                pos, offset, spill_at = 0, first, capacity
+            pack(mm, offset, ts, bid, ask, last, size)
+            pos += 1
+            offset += size_of
+            if pos == stride:
+                pos = self._compact()
+                offset = first + pos * size_of
+                spill_at -= capacity
+            header[pos_slot] = pos
+            if pos >= spill_at:
+                full()
+                spill_at = pos + capacity
+
+        return append
+
+    def _compact(self) -> int:
+        """Move the latest capacity ticks to the front; returns the new position"""
+        capacity = self.capacity
+        self._array[:capacity] = self._array[capacity:]
+        self._header[_SPILL_POS] = max(0, self._header[_SPILL_POS] - capacity)
+        return capacity
+
+    def window(self, n: Optional[int] = None) -> TickColumns:
+        """Zero-copy views of the latest n ticks (default: up to capacity)"""
+        end = self._pos
+        n = min(end, self.capacity) if n is None else max(0, min(n, end, self.capacity))
+        return TickColumns(*self._array[end - n:end].T)
+
+    def take_pending(self) -> np.ndarray:
+        """Copy of the unarchived ticks as a (columns, n) array; marks them spilled"""
+        start = self._header[_SPILL_POS]
+        block = self._array[start:self._pos].T.copy()
+        self._header[_SPILLED] += self._pos - start
+        self._header[_SPILL_POS] = self._pos
+        return block
+
+    def reset(self, day: date) -> None:
+        """Start recording a new day"""
+        self._header[_POS] = self._header[_SPILL_POS] = self._header[_SPILLED] = 0
+        self._header[_DAY] = day.toordinal()
+
+    def close(self) -> None:
+        self._mm.flush()
+        self._header.release()
+        del self._array
+        try:
+            self._mm.close()
+        except BufferError:
+            # Readers still hold views; the map is released with them
+            logger.debug(f"Tick ring {self.path.name} still has live views")
+
+class TickStore:
+    """Per-symbol tick rings plus the compressed daily archive"""
+
+    def __init__(self, directory: Path, capacity: int = 1 << 18,
+                 timezone: str = 'US/Eastern'):
+        self.directory = Path(directory)
+        self.live_dir = self.directory / "live"
+        self.live_dir.mkdir(parents=True, exist_ok=True)
+        self.capacity = capacity
+        self.timezone = pytz.timezone(timezone)
+        self._rings: Dict[str, TickRing] = {}
+        self._days: Dict[str, List[float]] = {}  # [start, end) of each ring's day
+        self._parts: Dict[str, int] = {}
+        self._recorders: Dict[str, Recorder] = {}
+        self._executor = self._new_executor()
+
+    @staticmethod
+    def _new_executor() -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="tick-store")
+
+    def ring(self, symbol: str) -> TickRing:
+        """Open (or create) the live ring of a symbol"""
+        ring = self._rings.get(symbol)
+        if ring is None:
+            path = self.live_dir / f"{symbol}.ticks"
+            ring = self._rings[symbol] = TickRing(path, self.capacity)
+            self._days[symbol] = self._bounds(ring.day) if ring.day else [0.0, 0.0]
+            self._parts[symbol] = self._next_part(symbol, ring.day)
+        return ring
+
+    def recorder(self, symbol: str) -> Recorder:
+        """
+        Hot-path record(ts, bid, ask, last, size) for one symbol.
+        Valid until close(); call again afterwards.
+        """
+        record = self._recorders.get(symbol)
+        if record is None:
+            ring = self.ring(symbol)
+            record = self._recorders[symbol] = ring.appender(
+                self._days[symbol],
+                lambda ts: self._rollover(symbol, ring, ts),
+                lambda: self._spill(symbol, ring)
+            )
+        return record
+
+    def record(self, symbol: str, ts: float, bid: float, ask: float,
+               last: float, size: float) -> None:
+        """Append one tick for a symbol"""
+        self.recorder(symbol)(ts, bid, ask, last, size)
+
+    def window(self, symbol: str, start: Optional[float] = None,
+               end: Optional[float] = None) -> TickColumns:
+        """Zero-copy views of the live ticks of a symbol in [start, end]"""
+        ring = self._rings.get(symbol)
+        if ring is None:
+            empty = np.empty(0)
+            return TickColumns(empty, empty, empty, empty, empty)
+        return ring.window().between(start, end)
+
+    def load_day(self, symbol: str, day: date) -> TickColumns:
+        """All archived ticks of a symbol for one exchange day"""
+        # Parts are only deleted once merged, so list them before the daily file
+        parts = self._parts_of(symbol, day)
+        block, merged = self._load_daily(symbol, day)
+        blocks = [block] if block is not None else []
+        blocks.extend(np.load(path) for part, path in parts if part > merged)
+        if not blocks:
+            empty = np.empty(0)
+            return TickColumns(empty, empty, empty, empty, empty)
+        return TickColumns(*np.hstack(blocks))
+
+    def _day_of(self, ts: float) -> date:
+        return datetime.fromtimestamp(ts, self.timezone).date()
+
+    def _bounds(self, day: date) -> List[float]:
+        """[start, end) of an exchange-local day in epoch seconds"""
+        return [self.timezone.localize(datetime.combine(d, time(0))).timestamp()
+                for d in (day, day + timedelta(days=1))]
+
+    def _day_dir(self, day: date) -> Path:
+        return self.directory / day.isoformat()
+
+    def _daily_path(self, symbol: str, day: date) -> Path:
+        return self._day_dir(day) / f"{symbol}.npz"
+
+    def _parts_of(self, symbol: str, day: date) -> List[Tuple[int, Path]]:
+        """Raw parts of a day not yet compressed, in order"""
+        paths = self._day_dir(day).glob(f"{symbol}.*.npy")
+        return sorted((int(p.suffixes[-2][1:]), p) for p in paths)
+
+    def _load_daily(self, symbol: str, day: date) -> Tuple[Optional[np.ndarray], int]:
+        """The compressed ticks of a day and the last part merged into them"""
+        path = self._daily_path(symbol, day)
+        if not path.exists():
+            return None, -1
+        with np.load(path) as data:
+            block = np.vstack([data[column] for column in COLUMNS])
+            return block, int(data['last_part'])
+
+    def _next_part(self, symbol: str, day: Optional[date]) -> int:
+        if day is None:
+            return 0
+        parts = self._parts_of(symbol, day)
+        if parts:
+            return parts[-1][0] + 1
+        return self._load_daily(symbol, day)[1] + 1
+
+    def _rollover(self, symbol: str, ring: TickRing, ts: float) -> None:
+        """Archive the ring's day and reset the ring for the day of ts"""
+        if ring.day is not None:
+            if ring.pending:
+                self._spill(symbol, ring)
+            self._executor.submit(self._compress_day, symbol, ring.day)
+        day = self._day_of(ts)
+        ring.reset(day)
+        # Updated in place: recorders hold on to this list
+        self._days[symbol][:] = self._bounds(day)
+        self._parts[symbol] = self._next_part(symbol, day)
+        logger.info(f"Tick store for {symbol} rolled over to {day}")
+
+    def _spill(self, symbol: str, ring: TickRing) -> None:
+        """Write the ticks not yet archived as a raw part, off the recording thread"""
+        block = ring.take_pending()
+        day = ring.day or self._day_of(float(block[0, 0]))
+        part = self._parts.get(symbol, 0)
+        self._parts[symbol] = part + 1
+        path = self._day_dir(day) / f"{symbol}.{part}.npy"
+        self._executor.submit(self._write_part, path, block)
+
+    @staticmethod
+    def _write_part(path: Path, block: np.ndarray) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + ".tmp")
+            with open(tmp, 'wb') as f:
+                np.save(f, block)
+            tmp.replace(path)
+        except Exception as e:
+            logger.error(f"Error archiving ticks to {path}: {str(e)}")
+
+    def _compress_day(self, symbol: str, day: date) -> None:
+        """Merge a finished day's raw parts into its compressed daily file"""
+        path = self._daily_path(symbol, day)
+        try:
+            parts = self._parts_of(symbol, day)
+            if not parts:
+                return
+            block, merged = self._load_daily(symbol, day)
+            blocks = [block] if block is not None else []
+            blocks.extend(np.load(p) for part, p in parts if part > merged)
+            tmp = path.with_name(path.name + ".tmp")
+            with open(tmp, 'wb') as f:
+                np.savez_compressed(f, last_part=parts[-1][0],
+                                    **dict(zip(COLUMNS, np.hstack(blocks))))
+            tmp.replace(path)
+            # A crash before this leaves parts that load_day skips as merged
+            for _, p in parts:
+                p.unlink()
+        except Exception as e:
+            logger.error(f"Error compressing ticks to {path}: {str(e)}")
+
+    def close(self) -> None:
+        """Finish pending archives and unmap the live files (they survive restarts)"""
+        self._executor.shutdown(wait=True)
+        self._executor = self._new_executor()
+        self._recorders.clear()
+        for ring in self._rings.values():
+            ring.close()
+        self._rings.clear()
@@ -0,0 +1,126 @@
+from typing import Callable, List, Optional
+from ib_insync import Ticker, util
+from src.trading.market import MarketData
+from src.strategy.drop_ladder import DropLadder
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+class DropTrigger:
+    """
+    Evaluates the SPX drop ladder on every ticker update instead of on a
+    fixed poll. It fires whenever the drop reaches a ladder level that has
+    not fired yet.
+
+    Evaluations are throttled to one per ``min_interval`` seconds, with a
+    trailing evaluation so the latest tick of a burst is never skipped. A
+    drop only fires once it has stayed at or above a level for
+    ``confirm_ticks`` consecutive evaluations, which filters out single bad
+    prints. A firing nobody is waiting for (e.g. while a trade is executing)
+    is kept, and the next ``wait_async`` returns the latest one at once.
+    """
+
+    def __init__(self, market: MarketData, symbol: str, base_price: float,
+                 ladder: DropLadder, min_interval: float = 0.25,
+                 confirm_ticks: int = 2):
+        self.market = market
+        self.symbol = symbol
+        self.base_price = base_price
+        self.ladder = ladder
+        self.min_interval = min_interval
+        self.confirm_ticks = max(1, confirm_ticks)
+        self.last_drop: Optional[float] = None
+        self.evaluations = 0
+        self._ticker: Optional[Ticker] = None
+        self._last_eval = 0.0
+        self._trailing: Optional[asyncio.Future] = None
+        self._consecutive_hits = 0
+        self._waiters: List[asyncio.Future] = []
+        self._unclaimed: Optional[float] = None  # Latest drop fired with no waiter
+        self._listeners: List[Callable[[float], None]] = []
+
+    def start(self) -> None:
+        """Subscribe to the ticker and start evaluating on updates"""
+        if self._ticker is None:
+            self._ticker = self.market.subscribe(self.symbol)
+            self._ticker.updateEvent += self._on_update
+
+    def stop(self) -> None:
+        """Detach from the ticker and cancel any pending evaluation"""
+        if self._ticker is not None:
+            self._ticker.updateEvent -= self._on_update
+            self._ticker = None
+        if self._trailing is not None:
+            self._trailing.cancel()
+            self._trailing = None
+
+    def add_listener(self, listener: Callable[[float], None]) -> None:
+        """Call listener(drop) every time the trigger fires"""
+        self._listeners.append(listener)
+
+    def _on_update(self, ticker: Ticker) -> None:
+        elapsed = self.market.clock.time() - self._last_eval
+        if elapsed >= self.min_interval:
+            self._evaluate()
+        elif self._trailing is None:
+            self._trailing = util.getLoop().create_task(
+                self._evaluate_later(self.min_interval - elapsed)
+            )
+
+    async def _evaluate_later(self, delay: float) -> None:
+        await self.market.clock.sleep_async(delay)
+        self._trailing = None
+        self._evaluate()
+
+    def _evaluate(self) -> None:
+        if self._trailing is not None:
+            self._trailing.cancel()
+            self._trailing = None
+        self._last_eval = self.market.clock.time()
+        if self._ticker is None:
+            return
+        price = self.market.ticker_price(self.symbol, self._ticker)
+        if price is None or not self.base_price:
+            return
+
+        self.evaluations += 1
+        drop = (self.base_price - price) / self.base_price * 100
+        self.last_drop = drop
+        logger.debug(f"{self.symbol} drop: {drop:.2f}%")
+
+        if self.ladder.has_pending(drop):
+            self._consecutive_hits += 1
+            if self._consecutive_hits >= self.confirm_ticks:
+                self._consecutive_hits = 0
+                self._fire(drop)
+        else:
+            self._consecutive_hits = 0
+
+    def _fire(self, drop: float) -> None:
+        logger.info(f"{self.symbol} drop trigger fired at {drop:.2f}%")
+        waiters, self._waiters = self._waiters, []
+        waiters = [waiter for waiter in waiters if not waiter.done()]
+        for waiter in waiters:
+            waiter.set_result(drop)
+        self._unclaimed = None if waiters else drop
+        for listener in self._listeners:
+            listener(drop)
+
+    async def wait_async(self, timeout: Optional[float] = None) -> Optional[float]:
+        """
+        Wait for the next firing, or take one that fired since the last wait;
+        returns the drop or None on timeout
+        """
+        if self._unclaimed is not None:
+            drop, self._unclaimed = self._unclaimed, None
+            return drop
+        waiter = util.getLoop().create_future()
+        self._waiters.append(waiter)
+        try:
+            return await self.market.clock.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
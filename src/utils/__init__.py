@@ -1,10 +1,26 @@
 """Utils module initialization"""
-from .logger import setup_logger
+from .logger import setup_logger, shutdown_logging
 from .reporter import Reporter
 from .screenshotter import Screenshotter
+from .chart_renderer import ChartRenderer
+from .journal import TransactionJournal, create_journal
+from .email_queue import EmailQueue, SmtpConfig
+from .market_calendar import MarketCalendar
+from .clock import Clock, SimulatedClock
+from .checkpoint import Checkpointer
 
 __all__ = [
     'setup_logger',
+    'shutdown_logging',
     'Reporter',
-    'Screenshotter'
+    'Screenshotter',
+    'ChartRenderer',
+    'TransactionJournal',
+    'create_journal',
+    'EmailQueue',
+    'SmtpConfig',
+    'MarketCalendar',
+    'Clock',
+    'SimulatedClock',
+    'Checkpointer'
 ]
\ No newline at end of file
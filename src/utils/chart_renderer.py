@@ -0,0 +1,187 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
+import threading
+import logging
+import math
+import numpy as np
+from PIL import Image, ImageDraw
+from ..config import TradingConfig
+from .screenshotter import PendingScreenshot
+from .clock import Clock
+
+if TYPE_CHECKING:
+    from ..trading.tick_store import TickColumns
+
+logger = logging.getLogger(__name__)
+
+# (epoch seconds, price) columns
+Ticks = Tuple[np.ndarray, np.ndarray]
+# Recorded ticks of a symbol in [start, end], e.g. MarketData.get_ticks
+TickSource = Callable[[str, Optional[float], Optional[float]], "TickColumns"]
+
+BACKGROUND = (255, 255, 255)
+GRID = (230, 230, 230)
+TEXT = (60, 60, 60)
+SPX_LINE = (31, 119, 180)
+SYMBOL_LINE = (214, 39, 40)
+TRADE_LINE = (120, 120, 120)
+
+class ChartRenderer:
+    """
+    Draws the SPX and symbol price paths leading up to a trade from recorded
+    ticks, as a headless alternative to Screenshotter. Same capture() API;
+    rendering happens on a background worker. Windows end on a multiple of
+    CHART_RESOLUTION, and captures landing on the same window share one
+    render.
+    """
+
+    def __init__(self, tick_source: TickSource, reference_symbol: str = "SPX",
+                 cache_size: int = 64, clock: Optional[Clock] = None,
+                 config: Optional[TradingConfig] = None):
+        self.config = config or TradingConfig()
+        self.clock = clock or Clock()
+        self.tick_source = tick_source
+        self.reference_symbol = reference_symbol
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="charts")
+        self._slots = threading.BoundedSemaphore(self.config.SCREENSHOT_QUEUE_SIZE)
+        self._cache: "OrderedDict[Tuple[str, int], PendingScreenshot]" = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+        self._last_timestamp = ""
+        self._timestamp_seq = 0
+
+    def submit(self, symbol: str, at: Optional[float] = None) -> Optional[PendingScreenshot]:
+        """Queue a chart of the window ending at ``at``; None if the queue is full"""
+        end = self.clock.time() if at is None else at
+        resolution = self.config.CHART_RESOLUTION
+        if resolution > 0:
+            end = math.floor(end / resolution) * resolution
+        start = end - self.config.CHART_WINDOW
+        key = (symbol, round(end * 1000))
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and self._reusable(cached):
+                self._cache.move_to_end(key)
+                return cached
+
+        if not self._slots.acquire(blocking=False):
+            logger.warning(f"Chart queue full, skipping chart for {symbol}")
+            return None
+        try:
+            # Snapshot the ticks now so the worker never races the live feed
+            symbol_ticks = self._snapshot(symbol, start, end)
+            spx_ticks = (self._snapshot(self.reference_symbol, start, end)
+                         if symbol != self.reference_symbol else None)
+            with self._lock:
+                filepath = self._filepath(symbol, end)
+            future = self._executor.submit(
+                self._render, filepath, symbol, symbol_ticks, spx_ticks, start, end
+            )
+        except Exception:
+            # Never reaches _render (e.g. submitted after close), so free the slot here
+            self._slots.release()
+            raise
+
+        pending = PendingScreenshot(filepath, future)
+        with self._lock:
+            self._cache[key] = pending
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return pending
+
+    @staticmethod
+    def _reusable(pending: PendingScreenshot) -> bool:
+        """Still rendering, or rendered to a file that is still there"""
+        if not pending.future.done():
+            return True
+        return pending.future.result() is not None and pending.path.exists()
+
+    def _snapshot(self, symbol: str, start: float, end: float) -> Ticks:
+        """Copy of the recorded prices in [start, end]"""
+        ticks = self.tick_source(symbol, start, end)
+        prices = ticks.prices()
+        valid = prices > 0  # Also drops NaN; boolean indexing copies
+        return ticks.ts[valid], prices[valid]
+
+    def _filepath(self, symbol: str, end: float) -> Path:
+        """Chart path for a window ending at ``end``; call with the lock held"""
+        stamp = datetime.fromtimestamp(end, timezone.utc).strftime("%Y%m%d_%H%M%S_%f")[:-3]
+        # Number charts of windows ending within the same millisecond
+        if stamp == self._last_timestamp:
+            self._timestamp_seq += 1
+            stamp = f"{stamp}_{self._timestamp_seq}"
+        else:
+            self._last_timestamp = stamp
+            self._timestamp_seq = 0
+        return self.config.SCREENSHOTS_DIR / f"{symbol}_{stamp}_chart.png"
+
+    def capture(self, symbol: str) -> Optional[Path]:
+        """Render a chart of recent prices; returns the path it will be saved to"""
+        pending = self.submit(symbol)
+        return pending.path if pending else None
+
+    def _render(self, filepath: Path, symbol: str,
+                symbol_ticks: Ticks, spx_ticks: Optional[Ticks], start: float,
+                end: float) -> Optional[Path]:
+        try:
+            width, height = self.config.CHART_SIZE
+            image = Image.new('RGB', (width, height), BACKGROUND)
+            draw = ImageDraw.Draw(image)
+            panels = [(symbol, symbol_ticks, SYMBOL_LINE)]
+            if spx_ticks is not None and len(spx_ticks[0]):
+                panels.insert(0, (self.reference_symbol, spx_ticks, SPX_LINE))
+            panel_height = height // len(panels)
+            for i, (name, ticks, colour) in enumerate(panels):
+                box = (0, i * panel_height, width, (i + 1) * panel_height)
+                self._draw_panel(draw, box, name, ticks, colour, start, end)
+            image.save(str(filepath), 'PNG', compress_level=self.config.SCREENSHOT_PNG_COMPRESS_LEVEL)
+            return filepath
+
+        except Exception as e:
+            logger.error(f"Error rendering chart: {str(e)}")
+            return None
+        finally:
+            self._slots.release()
+
+    def _draw_panel(self, draw: ImageDraw.ImageDraw, box: Tuple[int, int, int, int],
+                    name: str, ticks: Ticks, colour: Tuple[int, int, int],
+                    start: float, end: float) -> None:
+        left, top, right, bottom = box
+        margin_left, margin_right, margin_top, margin_bottom = 60, 10, 20, 10
+        x0, x1 = left + margin_left, right - margin_right
+        y0, y1 = top + margin_top, bottom - margin_bottom
+
+        for fraction in (0.0, 0.25, 0.5, 0.75, 1.0):
+            y = y0 + (y1 - y0) * fraction
+            draw.line([(x0, y), (x1, y)], fill=GRID)
+        draw.rectangle([x0, y0, x1, y1], outline=TEXT)
+        # The trade happens at the right edge of the window
+        draw.line([(x1, y0), (x1, y1)], fill=TRADE_LINE, width=2)
+
+        ts, prices = ticks
+        if not len(ts):
+            draw.text((x0 + 5, y0 + 5), f"{name}: no ticks recorded", fill=TEXT)
+            return
+
+        low, high = float(prices.min()), float(prices.max())
+        span = (high - low) or max(abs(high) * 0.001, 0.01)
+        duration = (end - start) or 1.0
+        xs = x0 + (ts - start) / duration * (x1 - x0)
+        ys = y1 - (prices - low) / span * (y1 - y0)
+        points = list(zip(xs.tolist(), ys.tolist()))
+        if len(points) == 1:
+            points.append((x1, points[0][1]))
+        draw.line(points, fill=colour, width=2)
+
+        draw.text((left + 5, top + 4), f"{name}  last {prices[-1]:.2f}", fill=TEXT)
+        draw.text((left + 2, y0), f"{high:.2f}", fill=TEXT)
+        draw.text((left + 2, y1 - 10), f"{low:.2f}", fill=TEXT)
+
+    def close(self, wait: bool = True) -> None:
+        """Finish pending renders and stop the worker"""
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,122 @@
+"""Crash-safe app state: atomic JSON snapshots plus a write-ahead log of events"""
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+import json
+import os
+import threading
+import logging
+from .fileio import fsync_directory
+
+logger = logging.getLogger(__name__)
+
+class Restored(NamedTuple):
+    snapshot: Optional[Dict[str, Any]]  # Latest snapshot, if any
+    events: List[Dict[str, Any]]  # Logged events newer than the snapshot, in order
+
+class Checkpointer:
+    """
+    Persists app state so a restart resumes where it left off.
+
+    ``log`` appends one JSON line to ``events.wal`` and fsyncs it before
+    returning, so an event is durable before the action it describes.
+    ``save`` atomically replaces ``state.json`` (write, fsync, rename) and
+    then drops the events the snapshot covers from the log. Events carry
+    sequence numbers and the snapshot records the last one it includes, so
+    a crash at any point never loses an event or applies it twice.
+    """
+
+    SNAPSHOT = "state.json"
+    LOG = "events.wal"
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.snapshot_path = self.directory / self.SNAPSHOT
+        self.wal_path = self.directory / self.LOG
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._pending: List[Tuple[int, str]] = []  # Logged lines not yet in a snapshot
+        self._wal = None
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the last logged event"""
+        return self._seq
+
+    def load(self) -> Restored:
+        """Read the latest snapshot and the events logged after it"""
+        snapshot = None
+        if self.snapshot_path.exists():
+            try:
+                snapshot = json.loads(self.snapshot_path.read_text())
+            except (OSError, ValueError) as e:
+                logger.error(f"Ignoring unreadable checkpoint: {str(e)}")
+        covered = snapshot.get('wal_seq', 0) if snapshot else 0
+
+        events = []
+        pending = []
+        if self.wal_path.exists():
+            with open(self.wal_path) as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        break  # Torn write at the tail
+                    if event['seq'] > covered:
+                        events.append(event)
+                        pending.append((event['seq'], line.rstrip("\n")))
+        with self._lock:
+            self._seq = max([covered] + [seq for seq, _ in pending])
+            self._pending = pending
+            # Rewrite the log so a torn tail is not appended to
+            self._rewrite_log()
+        return Restored(snapshot, events)
+
+    def log(self, event: Dict[str, Any]) -> int:
+        """Durably append an event; returns its sequence number"""
+        with self._lock:
+            if self._wal is None:
+                self._wal = open(self.wal_path, 'a')
+            self._seq += 1
+            line = json.dumps(dict(event, seq=self._seq), separators=(',', ':'))
+            self._wal.write(line + "\n")
+            self._wal.flush()
+            os.fsync(self._wal.fileno())
+            self._pending.append((self._seq, line))
+            return self._seq
+
+    def save(self, state: Dict[str, Any], seq: Optional[int] = None) -> None:
+        """
+        Atomically write a snapshot. ``seq`` is the last event the state
+        includes (read it before building the state); defaults to all of them.
+        """
+        with self._lock:
+            seq = self._seq if seq is None else min(seq, self._seq)
+            tmp = self.snapshot_path.with_suffix('.tmp')
+            with open(tmp, 'w') as f:
+                json.dump(dict(state, wal_seq=seq), f, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.snapshot_path)
+            fsync_directory(self.directory)
+            self._pending = [(n, line) for n, line in self._pending if n > seq]
+            self._rewrite_log()
+
+    def _rewrite_log(self) -> None:
+        """Replace the log with the events no snapshot covers yet"""
+        if self._wal is not None:
+            self._wal.close()
+        tmp = self.wal_path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            f.writelines(line + "\n" for _, line in self._pending)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.wal_path)
+        fsync_directory(self.directory)
+        self._wal = open(self.wal_path, 'a')
+
+    def close(self) -> None:
+        with self._lock:
+            if self._wal is not None:
+                self._wal.close()
+                self._wal = None
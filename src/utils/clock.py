@@ -0,0 +1,95 @@
+from datetime import datetime, tzinfo
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+import asyncio
+import heapq
+import itertools
+import time
+
+class Clock:
+    """Wall-clock time and sleeps; the default for live trading"""
+
+    # Current time as epoch seconds. The builtin itself, so hot paths that
+    # hold on to clock.time pay no extra Python call
+    time: Callable[[], float] = staticmethod(time.time)
+
+    def now(self, tz: Optional[tzinfo] = None) -> datetime:
+        """Current time as a datetime (naive local time without tz)"""
+        return datetime.fromtimestamp(self.time(), tz)
+
+    async def sleep_async(self, seconds: float) -> None:
+        await asyncio.sleep(max(0.0, seconds))
+
+    async def wait_for(self, awaitable: Awaitable, timeout: Optional[float]) -> Any:
+        """asyncio.wait_for with the timeout measured on this clock"""
+        return await asyncio.wait_for(awaitable, timeout)
+
+class SimulatedClock(Clock):
+    """
+    Virtual time for replays and tests.
+
+    With ``speed`` set, virtual time runs that many times faster than real
+    time. Without it the clock is event driven: sleeps are queued as timers
+    and, once the event loop has settled, time jumps straight to the next
+    timer, so a trading day replays as fast as its events can be processed.
+    """
+
+    def __init__(self, start: Optional[float] = None, speed: Optional[float] = None,
+                 settle_passes: int = 3):
+        self.speed = speed
+        self.settle_passes = settle_passes
+        self._now = time.time() if start is None else start
+        self._anchor = time.monotonic()
+        self._timers: List[Tuple[float, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._driver: Optional[asyncio.Task] = None
+
+    def time(self) -> float:
+        if self.speed:
+            return self._now + (time.monotonic() - self._anchor) * self.speed
+        return self._now
+
+    def advance(self, seconds: float) -> None:
+        """Move virtual time forward without waking timers (for tests)"""
+        self._now += max(0.0, seconds)
+
+    async def sleep_async(self, seconds: float) -> None:
+        if self.speed:
+            await asyncio.sleep(max(0.0, seconds) / self.speed)
+            return
+        if seconds <= 0:
+            await asyncio.sleep(0)
+            return
+        loop = asyncio.get_event_loop()
+        waiter = loop.create_future()
+        heapq.heappush(self._timers, (self._now + seconds, next(self._seq), waiter))
+        if self._driver is None or self._driver.done():
+            self._driver = loop.create_task(self._drive())
+        await waiter
+
+    async def wait_for(self, awaitable: Awaitable, timeout: Optional[float]) -> Any:
+        if timeout is None:
+            return await awaitable
+        if self.speed:
+            return await asyncio.wait_for(awaitable, max(0.0, timeout) / self.speed)
+
+        task = asyncio.ensure_future(awaitable)
+        timer = asyncio.ensure_future(self.sleep_async(timeout))
+        try:
+            await asyncio.wait({task, timer}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            timer.cancel()
+        if task.done():
+            return task.result()
+        task.cancel()
+        raise asyncio.TimeoutError()
+
+    async def _drive(self) -> None:
+        """Let pending callbacks run, then jump to and fire the earliest timer"""
+        while self._timers:
+            for _ in range(self.settle_passes):
+                await asyncio.sleep(0)
+            wake, _, waiter = heapq.heappop(self._timers)
+            if waiter.done():  # Cancelled sleep
+                continue
+            self._now = max(self._now, wake)
+            waiter.set_result(None)
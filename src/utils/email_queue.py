@@ -0,0 +1,231 @@
+"""Background delivery of outgoing email through a disk spool"""
+from email import message_from_bytes, policy
+from email.message import Message
+from pathlib import Path
+from typing import Any, Callable, Dict, NamedTuple, Optional
+import json
+import os
+import queue
+import smtplib
+import threading
+import time
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SmtpConfig(NamedTuple):
+    server: str = "smtp.gmail.com"
+    port: int = 587
+    use_tls: bool = True  # STARTTLS before login
+    login: bool = True  # Disable for local SMTP stand-ins without AUTH
+    timeout: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "SmtpConfig":
+        """Defaults overridden by SMTP_SERVER, SMTP_PORT, SMTP_STARTTLS and SMTP_LOGIN"""
+        def flag(name: str, default: bool) -> bool:
+            value = os.getenv(name)
+            return default if value is None else value.lower() in ('1', 'true', 'yes')
+
+        defaults = cls()
+        return cls(
+            server=os.getenv('SMTP_SERVER', defaults.server),
+            port=int(os.getenv('SMTP_PORT', defaults.port)),
+            use_tls=flag('SMTP_STARTTLS', defaults.use_tls),
+            login=flag('SMTP_LOGIN', defaults.login),
+        )
+
+class EmailQueue:
+    """
+    Spools messages to disk and delivers them from a worker thread.
+
+    The worker keeps one authenticated SMTP connection open while messages
+    keep arriving and closes it after ``idle_timeout`` seconds without work.
+    Failed deliveries are retried with exponential backoff; after
+    ``max_attempts`` the message is moved to ``spool_dir/failed``. Messages
+    left in the spool by a previous run are delivered on start.
+
+    Metadata given to ``enqueue`` is spooled next to the message and passed
+    to ``on_delivered`` once the SMTP server accepts it, or to ``on_failed``
+    when it is given up on, from the worker thread.
+    """
+
+    def __init__(self, smtp_config: SmtpConfig, sender_email: str,
+                 sender_password: Optional[str], spool_dir: Path,
+                 max_attempts: int = 5, backoff: float = 2.0, max_backoff: float = 300.0,
+                 idle_timeout: float = 30.0,
+                 on_delivered: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 on_failed: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.smtp_config = smtp_config
+        self.sender_email = sender_email
+        self.sender_password = sender_password
+        self.spool_dir = Path(spool_dir)
+        self.failed_dir = self.spool_dir / "failed"
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.idle_timeout = idle_timeout
+        self.on_delivered = on_delivered
+        self.on_failed = on_failed
+        self._queue: "queue.Queue[Path]" = queue.Queue()
+        self._attempts: Dict[Path, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._server: Optional[smtplib.SMTP] = None
+        self.sent_count = 0
+
+    def start(self) -> None:
+        """Start the worker and re-queue messages left from a previous run"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        for path in sorted(self.spool_dir.glob("*.eml")):
+            self._queue.put(path)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="email-queue", daemon=True)
+        self._thread.start()
+
+    def enqueue(self, msg: Message, metadata: Optional[Dict[str, Any]] = None) -> Path:
+        """Write the message (and its metadata) to the spool and queue it for delivery"""
+        self.start()
+        name = f"{time.time_ns()}_{uuid.uuid4().hex[:8]}.eml"
+        path = self.spool_dir / name
+        if metadata is not None:
+            # Written first: a spooled message always finds its metadata
+            self._write_durably(self._metadata_path(path), json.dumps(metadata).encode())
+        self._write_durably(path, msg.as_bytes())
+        self._queue.put(path)
+        return path
+
+    @staticmethod
+    def _write_durably(path: Path, data: bytes) -> None:
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _metadata_path(path: Path) -> Path:
+        return path.with_suffix('.json')
+
+    def _take_metadata(self, path: Path, keep_in: Optional[Path] = None) -> Dict[str, Any]:
+        """Read and remove (or move to keep_in) the metadata of a spooled message"""
+        meta_path = self._metadata_path(path)
+        try:
+            metadata = json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if keep_in is not None:
+            os.replace(meta_path, keep_in / meta_path.name)
+        else:
+            meta_path.unlink(missing_ok=True)
+        return metadata
+
+    def _notify(self, callback: Optional[Callable[[Dict[str, Any]], None]],
+                metadata: Dict[str, Any]) -> None:
+        if callback is None or not metadata:
+            return
+        try:
+            callback(metadata)
+        except Exception as e:
+            logger.error(f"Error in email delivery callback: {str(e)}")
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued message has been delivered or given up on"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """Deliver what can be delivered within timeout, then stop the worker"""
+        if self._thread is None:
+            return
+        self.flush(timeout)
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+        self._thread = None
+
+    @property
+    def pending(self) -> int:
+        return self._queue.unfinished_tasks
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                path = self._queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                self._disconnect()  # Idle: release the connection
+                continue
+            try:
+                self._deliver(path)
+            finally:
+                self._queue.task_done()
+        self._disconnect()
+
+    def _deliver(self, path: Path) -> None:
+        while not self._stop.is_set():
+            try:
+                msg = message_from_bytes(path.read_bytes(), policy=policy.SMTP)
+                self._connection().send_message(msg)
+                path.unlink(missing_ok=True)
+                self._attempts.pop(path, None)
+                self.sent_count += 1
+                logger.info(f"Delivered queued email {path.name}")
+                self._notify(self.on_delivered, self._take_metadata(path))
+                return
+            except FileNotFoundError:
+                return
+            except Exception as e:
+                self._disconnect()
+                attempts = self._attempts.get(path, 0) + 1
+                self._attempts[path] = attempts
+                if attempts >= self.max_attempts:
+                    self.failed_dir.mkdir(parents=True, exist_ok=True)
+                    os.replace(path, self.failed_dir / path.name)
+                    self._attempts.pop(path, None)
+                    logger.error(f"Giving up on email {path.name} after {attempts} attempts: {str(e)}")
+                    self._notify(self.on_failed, self._take_metadata(path, self.failed_dir))
+                    return
+                delay = min(self.backoff * 2 ** (attempts - 1), self.max_backoff)
+                logger.warning(
+                    f"Email delivery failed ({str(e)}); retry {attempts}/{self.max_attempts - 1} "
+                    f"in {delay:.1f}s"
+                )
+                self._stop.wait(delay)
+
+    def _connection(self) -> smtplib.SMTP:
+        """Current SMTP connection, reconnecting if it was dropped"""
+        if self._server is not None:
+            try:
+                if self._server.noop()[0] == 250:
+                    return self._server
+            except (smtplib.SMTPException, OSError):  # OSError: socket dropped
+                pass
+            self._disconnect()
+
+        server = smtplib.SMTP(self.smtp_config.server, self.smtp_config.port,
+                              timeout=self.smtp_config.timeout)
+        try:
+            if self.smtp_config.use_tls:
+                server.starttls()
+            if self.smtp_config.login and self.sender_password:
+                server.login(self.sender_email, self.sender_password)
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+        return server
+
+    def _disconnect(self) -> None:
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                self._server.close()
+            self._server = None
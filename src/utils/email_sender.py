@@ -1,12 +1,17 @@
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime
-from typing import List, Dict, Optional, TypedDict, NamedTuple
+from typing import Any, List, Dict, Optional, TypedDict, NamedTuple, Tuple
+import json
 import os
+import tempfile
+import threading
+import zipfile
 import logging
+from .email_queue import EmailQueue, SmtpConfig
+from .clock import Clock
 
 logger = logging.getLogger(__name__)
 
@@ -23,14 +28,28 @@ class TradingSummary(TradingSummaryRequired, total=False):
     total_spx_drop: Optional[float]
     entry_price: Optional[float]
 
-class SmtpConfig(NamedTuple):
-    server: str = "smtp.gmail.com"
-    port: int = 587
+class AttachmentConfig(NamedTuple):
+    max_bytes: int = 20 * 1024 * 1024  # Cap on the zipped attachment
+    scope: str = "session"  # "session": files from this run not yet sent; "unsent": any unsent file
+
+# Already-compressed formats are stored rather than deflated again
+STORED_SUFFIXES = {'.png', '.jpg', '.jpeg', '.webp', '.gz', '.zip', '.parquet'}
 
 class EmailSender:
-    def __init__(self, raise_on_missing_credentials: bool = False) -> None:
-        self.smtp_config = SmtpConfig()
-        self.trading_records_dir = Path("trading_records")
+    def __init__(self, raise_on_missing_credentials: bool = False,
+                 clock: Optional[Clock] = None,
+                 records_dir: Optional[Path] = None) -> None:
+        self.clock = clock or Clock()
+        self.smtp_config = SmtpConfig.from_env()
+        self.attachment_config = AttachmentConfig()
+        self.trading_records_dir = Path(records_dir or "trading_records")
+        self.manifest_path = self.trading_records_dir / ".sent_manifest.json"
+        self.session_start = self.clock.time()  # Files older than this are from earlier runs
+        # Files attached to queued reports that the SMTP server has not accepted yet
+        self._in_flight: Dict[str, List[float]] = {}
+        self._manifest_lock = threading.Lock()
+        # Reports are zipped and spooled here, never on the trading thread
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="email-report")
         
         # Initialize credentials
         sender_email = os.getenv('TRADING_EMAIL')
@@ -51,6 +70,20 @@ class EmailSender:
             self.sender_email = sender_email
             self.sender_password = sender_password
 
+        # Outgoing mail is spooled and delivered by a background worker
+        self.queue: Optional[EmailQueue] = None
+        if self.is_configured:
+            self.queue = EmailQueue(
+                self.smtp_config,
+                str(self.sender_email),
+                self.sender_password,
+                self.trading_records_dir / "outbox",
+                on_delivered=self._mark_sent,
+                on_failed=self._release
+            )
+            # Deliver whatever a previous run left in the spool right away
+            self.queue.start()
+
     def _format_float(self, value: Optional[float], default: float = 0.0) -> str:
         """Format float value with proper handling of None"""
         if value is None:
@@ -63,80 +96,163 @@ class EmailSender:
             value = default
         return f"{value:.2f}%"
 
-    def _attach_trading_records(self, msg: MIMEMultipart) -> None:
-        """Attach all files from trading_records directory"""
-        # Attach files from screenshots directory
-        screenshots_dir = self.trading_records_dir / "screenshots"
-        if screenshots_dir.exists():
-            for file_path in screenshots_dir.glob("*.*"):
-                if file_path.name == '.gitkeep':
-                    continue
-                try:
-                    with open(file_path, 'rb') as file:
-                        attachment = MIMEApplication(file.read())
-                        attachment.add_header(
-                            'Content-Disposition', 
-                            'attachment', 
-                            filename=f'screenshots/{file_path.name}'
-                        )
-                        msg.attach(attachment)
-                        logger.info(f"Attached screenshot: {file_path.name}")
-                except Exception as e:
-                    logger.error(f"Error attaching screenshot {file_path}: {str(e)}")
-
-        # Attach files from reports directory
-        reports_dir = self.trading_records_dir / "reports"
-        if reports_dir.exists():
-            for file_path in reports_dir.glob("*.*"):
-                if file_path.name == '.gitkeep':
-                    continue
-                try:
-                    with open(file_path, 'rb') as file:
-                        attachment = MIMEApplication(file.read())
-                        attachment.add_header(
-                            'Content-Disposition', 
-                            'attachment', 
-                            filename=f'reports/{file_path.name}'
-                        )
-                        msg.attach(attachment)
-                        logger.info(f"Attached report: {file_path.name}")
-                except Exception as e:
-                    logger.error(f"Error attaching report {file_path}: {str(e)}")
+    def _load_manifest(self) -> Dict[str, List[float]]:
+        """Files already emailed, keyed by path, with the size and mtime sent"""
+        try:
+            return json.loads(self.manifest_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest: Dict[str, List[float]]) -> None:
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(manifest))
+        os.replace(tmp_path, self.manifest_path)
+
+    def _mark_sent(self, metadata: Dict[str, Any]) -> None:
+        """Queue callback: the report was delivered, so its files count as sent"""
+        included = metadata.get('attachments', {})
+        with self._manifest_lock:
+            manifest = self._load_manifest()
+            manifest.update(included)
+            self._save_manifest(manifest)
+            self._release_locked(included)
+
+    def _release(self, metadata: Dict[str, Any]) -> None:
+        """Queue callback: the report was given up on; attach its files again next time"""
+        with self._manifest_lock:
+            self._release_locked(metadata.get('attachments', {}))
+
+    def _release_locked(self, included: Dict[str, List[float]]) -> None:
+        for arcname, entry in included.items():
+            if self._in_flight.get(arcname) == entry:
+                del self._in_flight[arcname]
+
+    def _select_attachments(self, report_paths: List[Path]) -> List[Tuple[Path, str]]:
+        """Pick files not yet sent (and, by default, written during this session)"""
+        with self._manifest_lock:
+            manifest = dict(self._load_manifest(), **self._in_flight)
+        candidates: Dict[Path, str] = {}
+        for folder in ("screenshots", "reports"):
+            directory = self.trading_records_dir / folder
+            if directory.exists():
+                for file_path in directory.glob("*.*"):
+                    candidates[file_path] = f"{folder}/{file_path.name}"
+        for file_path in report_paths:
+            candidates.setdefault(Path(file_path), f"reports/{Path(file_path).name}")
+
+        selected = []
+        for file_path, arcname in sorted(candidates.items(), key=lambda item: item[1]):
+            if file_path.name == '.gitkeep' or not file_path.is_file():
+                continue
+            stat = file_path.stat()
+            if (self.attachment_config.scope == "session"
+                    and stat.st_mtime < self.session_start):
+                continue
+            if manifest.get(arcname) == [stat.st_size, stat.st_mtime]:
+                continue
+            selected.append((file_path, arcname))
+        return selected
+
+    def _attach_trading_records(self, msg: MIMEMultipart,
+                                report_paths: Optional[List[Path]] = None) -> Dict[str, List[float]]:
+        """
+        Zip unsent trading records into one size-capped attachment.
+        Returns the manifest entries for the files that were included.
+        """
+        max_bytes = self.attachment_config.max_bytes
+        included: Dict[str, List[float]] = {}
+
+        with tempfile.TemporaryFile() as archive_file:
+            with zipfile.ZipFile(archive_file, 'w') as archive:
+                for file_path, arcname in self._select_attachments(report_paths or []):
+                    try:
+                        stat = file_path.stat()
+                        # Compression never grows a file, so this keeps us under the cap
+                        if archive_file.tell() + stat.st_size > max_bytes:
+                            logger.warning(f"Attachment size cap reached, deferring {arcname}")
+                            continue
+                        compression = (zipfile.ZIP_STORED
+                                       if file_path.suffix.lower() in STORED_SUFFIXES
+                                       else zipfile.ZIP_DEFLATED)
+                        # Streams the file in chunks rather than reading it whole
+                        archive.write(file_path, arcname, compress_type=compression)
+                        included[arcname] = [stat.st_size, stat.st_mtime]
+                        logger.info(f"Attached {arcname}")
+                    except Exception as e:
+                        logger.error(f"Error attaching {file_path}: {str(e)}")
+
+            if included:
+                archive_file.seek(0)
+                attachment = MIMEApplication(archive_file.read(), _subtype='zip')
+                attachment.add_header(
+                    'Content-Disposition',
+                    'attachment',
+                    filename=f"trading_records_{self.clock.now().strftime('%Y%m%d_%H%M%S')}.zip"
+                )
+                msg.attach(attachment)
+
+        return included
 
     def send_report(self, recipient_email: str, report_paths: List[Path], trading_summary: TradingSummary) -> bool:
-        """Send trading report via email with all trading records"""
+        """
+        Send trading report via email with the trading records not yet sent.
+        The message is built and spooled in the background; returns whether
+        it was accepted.
+        """
         if not self.is_configured or not self.sender_email or not self.sender_password:
             logger.warning("Email sender not configured. Skipping email report.")
             return False
+        if self.queue is None:
+            logger.error("Email delivery queue is not running. Skipping email report.")
+            return False
 
+        try:
+            self._executor.submit(self._queue_report, recipient_email, list(report_paths),
+                                  trading_summary.copy())
+            return True
+        except RuntimeError as e:  # Executor already shut down
+            logger.error(f"Error sending email: {str(e)}")
+            return False
+
+    def _queue_report(self, recipient_email: str, report_paths: List[Path],
+                      trading_summary: TradingSummary) -> None:
+        """Build the report email and hand it to the delivery queue"""
         try:
             # Create message
             msg = MIMEMultipart()
             msg['From'] = str(self.sender_email)
             msg['To'] = recipient_email
-            msg['Subject'] = f"Trading Report - {datetime.now().strftime('%Y-%m-%d')}"
+            msg['Subject'] = f"Trading Report - {self.clock.now().strftime('%Y-%m-%d')}"
 
             # Create email body with trading summary
             body = self._create_email_body(trading_summary)
             msg.attach(MIMEText(body, 'html'))
 
-            # Attach all trading records
-            self._attach_trading_records(msg)
+            # Attach trading records not sent yet
+            included = self._attach_trading_records(msg, report_paths)
 
-            # Send email
-            with smtplib.SMTP(self.smtp_config.server, self.smtp_config.port) as server:
-                server.starttls()
-                assert self.sender_email is not None
-                assert self.sender_password is not None
-                server.login(self.sender_email, self.sender_password)
-                server.send_message(msg)
+            # Hand off to the delivery queue; the spool makes it durable. The
+            # files only count as sent once the server accepts the message
+            if self.queue is None:
+                raise RuntimeError("email delivery queue is not running")
+            with self._manifest_lock:
+                self._in_flight.update(included)
+            try:
+                self.queue.enqueue(msg, {'attachments': included})
+            except Exception:
+                self._release({'attachments': included})
+                raise
 
-            logger.info(f"Trading report sent to {recipient_email}")
-            return True
+            logger.info(f"Trading report queued for {recipient_email}")
 
         except Exception as e:
             logger.error(f"Error sending email: {str(e)}")
-            return False
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Give queued reports up to timeout seconds to go out, then stop the worker"""
+        self._executor.shutdown(wait=True)
+        if self.queue is not None:
+            self.queue.stop(timeout)
 
     def _create_email_body(self, trading_summary: TradingSummary) -> str:
         """Create HTML email body with trading summary"""
@@ -144,7 +260,7 @@ class EmailSender:
         <html>
         <body>
             <h2>Trading Report Summary</h2>
-            <p>Date: {datetime.now().strftime('%Y-%m-%d')}</p>
+            <p>Date: {self.clock.now().strftime('%Y-%m-%d')}</p>
             
             <h3>Trading Summary:</h3>
             <ul>
@@ -0,0 +1,16 @@
+"""Helpers for durable file writes"""
+from pathlib import Path
+import os
+
+def fsync_directory(directory: Path) -> None:
+    """Make renames in a directory durable (a no-op where unsupported)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # Directories cannot be opened on this platform
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -0,0 +1,271 @@
+"""Append-only transaction journals used by Reporter"""
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+import csv
+import io
+import os
+import sqlite3
+import threading
+import time
+from ..exceptions.trading_exceptions import ConfigurationException, ReportingException
+from .fileio import fsync_directory
+
+TRANSACTION_FIELDS = (
+    'date', 'symbol', 'price', 'quantity', 'total_cost',
+    'spx_drop_percentage', 'screenshot_path'
+)
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    return value
+
+def _sql_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    return value
+
+class TransactionJournal(ABC):
+    """
+    Base class for transaction journals.
+
+    Every record is handed to the OS as soon as it is written, so a crash of
+    the process loses nothing; fsync to disk is batched every ``fsync_batch``
+    records or ``fsync_interval`` seconds, whichever comes first. A timer
+    syncs records left behind by a quiet spell once the interval is up.
+    """
+
+    def __init__(self, fields: Sequence[str] = TRANSACTION_FIELDS,
+                 fsync_batch: int = 16, fsync_interval: float = 1.0):
+        self.fields = tuple(fields)
+        self.fsync_batch = max(1, fsync_batch)
+        self.fsync_interval = fsync_interval
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def record_transaction(self, transaction: Dict[str, Any]) -> None:
+        """Append one transaction"""
+        with self._lock:
+            self._write(transaction)
+            self._unsynced += 1
+            remaining = self._last_sync + self.fsync_interval - time.monotonic()
+            if self._unsynced >= self.fsync_batch or remaining <= 0:
+                self._sync()
+            elif self._timer is None:
+                self._timer = threading.Timer(remaining, self.sync)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def sync(self) -> None:
+        """Force everything written so far onto disk"""
+        with self._lock:
+            self._sync()
+
+    def close(self) -> None:
+        """Sync and release the underlying file"""
+        with self._lock:
+            self._sync()
+            self._close()
+
+    def _sync(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._unsynced:
+            self._fsync()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    @abstractmethod
+    def _write(self, transaction: Dict[str, Any]) -> None:
+        """Hand one record to the OS"""
+
+    @abstractmethod
+    def _fsync(self) -> None:
+        """Force the records written so far onto disk"""
+
+    @abstractmethod
+    def _close(self) -> None:
+        """Release the underlying file"""
+
+    def __enter__(self) -> "TransactionJournal":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+class CsvJournal(TransactionJournal):
+    """CSV journal kept open in append mode with a plain buffered writer"""
+
+    def __init__(self, path: Path, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        is_new = not self.path.exists() or self.path.stat().st_size == 0
+        self._file: Optional[io.TextIOWrapper] = open(self.path, 'a', newline='', buffering=65536)
+        self._writer = csv.writer(self._file)
+        if is_new:
+            self._writer.writerow(self.fields)
+            self._file.flush()
+
+    def _write(self, transaction: Dict[str, Any]) -> None:
+        if self._file is None:
+            raise ReportingException(f"Journal {self.path} is closed")
+        self._writer.writerow([_csv_value(transaction.get(f)) for f in self.fields])
+        self._file.flush()  # Hand the row to the OS; fsync is batched
+
+    def _fsync(self) -> None:
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+class SqliteJournal(TransactionJournal):
+    """SQLite journal in WAL mode; each record is its own committed transaction"""
+
+    def __init__(self, path: Path, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn: Optional[sqlite3.Connection] = sqlite3.connect(
+            str(self.path), check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Commits survive a process crash; the WAL is fsynced at checkpoints
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        columns = ", ".join(f'"{f}"' for f in self.fields)
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS transactions ({columns})")
+        self._insert = (
+            f"INSERT INTO transactions ({columns}) "
+            f"VALUES ({', '.join('?' for _ in self.fields)})"
+        )
+
+    def _write(self, transaction: Dict[str, Any]) -> None:
+        if self._conn is None:
+            raise ReportingException(f"Journal {self.path} is closed")
+        row = [_sql_value(transaction.get(f)) for f in self.fields]
+        with self._conn:
+            self._conn.execute(self._insert, row)
+
+    def _fsync(self) -> None:
+        if self._conn is not None:
+            self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+class ParquetJournal(TransactionJournal):
+    """
+    Parquet journal writing one part file per batch. Rows wait in a CSV
+    staging journal until their part is written, so nothing is lost if the
+    process dies between batches. Staging file ``staging-N.csv`` becomes
+    ``part-N.parquet``; if that part already exists after a crash, the
+    staged rows are in it and are not written again.
+    """
+
+    def __init__(self, directory: Path, **kwargs: Any):
+        super().__init__(**kwargs)
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ConfigurationException("The parquet journal backend requires pyarrow")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._number = self._recover()  # Of the part being staged
+        self._rows: List[Dict[str, Any]] = []
+        self._staging: Optional[CsvJournal] = self._open_staging()
+
+    def _part_path(self, number: int) -> Path:
+        return self.directory / f"part-{number:05d}.parquet"
+
+    def _staging_path(self, number: int) -> Path:
+        return self.directory / f"staging-{number:05d}.csv"
+
+    def _open_staging(self) -> CsvJournal:
+        return CsvJournal(
+            self._staging_path(self._number), fields=self.fields,
+            fsync_batch=self.fsync_batch, fsync_interval=self.fsync_interval
+        )
+
+    def _recover(self) -> int:
+        """Write parts for rows staged by a previous run; returns the next part number"""
+        for staging_path in sorted(self.directory.glob("staging-*.csv")):
+            number = int(staging_path.stem.split('-')[1])
+            if not self._part_path(number).exists():
+                with open(staging_path, newline='') as f:
+                    rows = list(csv.DictReader(f))
+                if rows:
+                    self._write_part(number, rows)
+            staging_path.unlink()
+        parts = sorted(self.directory.glob("part-*.parquet"))
+        return int(parts[-1].stem.split('-')[1]) + 1 if parts else 1
+
+    def _write_part(self, number: int, rows: List[Dict[str, Any]]) -> None:
+        """Durably write rows as part-N.parquet; it appears whole or not at all"""
+        import pandas as pd
+        part_path = self._part_path(number)
+        df = pd.DataFrame(rows, columns=list(self.fields)).replace('', None)
+        # Fixed column types so every part shares one schema
+        for column in df.columns:
+            if column == 'date':
+                df[column] = pd.to_datetime(df[column])
+            elif column in ('symbol', 'screenshot_path'):
+                df[column] = df[column].astype('string')
+            else:
+                df[column] = pd.to_numeric(df[column], errors='coerce').astype('float64')
+        tmp_path = part_path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            df.to_parquet(f, index=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, part_path)
+        fsync_directory(self.directory)
+
+    def _commit_part(self) -> None:
+        """Turn the staged rows into the next part and drop their staging file"""
+        self._write_part(self._number, self._rows)
+        self._staging_path(self._number).unlink(missing_ok=True)
+        self._rows = []
+        self._number += 1
+
+    def _write(self, transaction: Dict[str, Any]) -> None:
+        if self._staging is None:
+            raise ReportingException(f"Journal {self.directory} is closed")
+        self._staging.record_transaction(transaction)
+        self._rows.append({f: transaction.get(f) for f in self.fields})
+
+    def _fsync(self) -> None:
+        if self._staging is not None and self._rows:
+            self._staging.close()
+            self._commit_part()
+            self._staging = self._open_staging()
+
+    def _close(self) -> None:
+        if self._staging is not None:
+            self._staging.close()
+            self._staging = None
+        if self._rows:
+            self._commit_part()
+        self._staging_path(self._number).unlink(missing_ok=True)
+
+def create_journal(backend: str, reports_dir: Path, **kwargs: Any) -> TransactionJournal:
+    """Create a journal for backend 'csv', 'sqlite' or 'parquet'"""
+    backend = backend.lower()
+    if backend == 'csv':
+        return CsvJournal(Path(reports_dir) / "transactions.csv", **kwargs)
+    if backend == 'sqlite':
+        return SqliteJournal(Path(reports_dir) / "transactions.db", **kwargs)
+    if backend == 'parquet':
+        return ParquetJournal(Path(reports_dir) / "transactions", **kwargs)
+    raise ConfigurationException(f"Unknown journal backend: {backend}")
@@ -1,38 +1,156 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
-from datetime import datetime
+from typing import Dict, Optional, Tuple
 from ..config import TradingConfig  # Updated import path
 
-def setup_logger(name: str) -> logging.Logger:
-    """Setup logger with file and console handlers"""
-    config = TradingConfig()
-    
-    # Create logger
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
-    
-    # Create formatters
-    file_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    console_formatter = logging.Formatter(
-        '%(levelname)s - %(message)s'
+# One writer thread (and the file it writes) per configured logger
+_listeners: Dict[str, Tuple[Path, "_Listener"]] = {}
+_lock = threading.Lock()
+# Parent of every module logger (src.trading.market, src.utils.journal, ...)
+PACKAGE_LOGGER = __name__.split('.')[0]
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render the message in place instead of copying the record, so the
+        # listener never touches caller objects and enqueueing stays cheap
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class _Listener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Wait for room so a full queue cannot prevent shutdown
+        self.queue.put(self._sentinel)
+
+def _file_handler(log_file: Path, config: TradingConfig) -> logging.Handler:
+    rotation = os.getenv('LOG_ROTATION', config.LOG_ROTATION).lower()
+    if rotation == "time":
+        return logging.handlers.TimedRotatingFileHandler(
+            log_file, when='midnight', backupCount=config.LOG_BACKUP_COUNT, delay=True
+        )
+    return logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=config.LOG_MAX_BYTES,
+        backupCount=config.LOG_BACKUP_COUNT, delay=True
     )
-    
-    # Create file handler
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    log_file = config.LOGS_DIR / f"{name}_{timestamp}.log"
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(file_formatter)
-    
-    # Create console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(console_formatter)
-    
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
-    return logger
\ No newline at end of file
+
+def setup_logger(name: str, config: Optional[TradingConfig] = None) -> logging.Logger:
+    """
+    Setup logger with rotating file and console handlers, writing to
+    ``config.LOGS_DIR``. Records are queued and written by a background
+    listener thread; calling this again for the same name and directory
+    returns the already configured logger, and for another directory moves
+    it there.
+
+    The first logger set up also captures the package's module loggers at
+    INFO and above into its file; on the console they only show warnings.
+    """
+    config = config or TradingConfig()
+    log_file = config.LOGS_DIR / f"{name}.log"
+    logger = logging.getLogger(name)
+    with _lock:
+        if name in _listeners:
+            if _listeners[name][0] == log_file:
+                return logger
+            _stop_listener(name, _listeners.pop(name)[1])
+
+        logger.setLevel(logging.DEBUG)
+
+        # Create formatters
+        if os.getenv('LOG_JSON', str(config.LOG_JSON)).lower() in ('1', 'true', 'yes'):
+            file_formatter: logging.Formatter = JsonFormatter()
+        else:
+            file_formatter = logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            )
+        console_formatter = logging.Formatter(
+            '%(levelname)s - %(message)s'
+        )
+
+        # Create file handler
+        file_handler = _file_handler(log_file, config)
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(file_formatter)
+
+        # Create console handler
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+        console_handler.setFormatter(console_formatter)
+        console_handler.addFilter(
+            lambda record: record.name == name or record.levelno >= logging.WARNING
+        )
+
+        # The calling thread only enqueues; the listener does the I/O
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(config.LOG_QUEUE_SIZE)
+        listener = _Listener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        listener.start()
+        queue_handler = DroppingQueueHandler(log_queue)
+        logger.addHandler(queue_handler)
+        package = logging.getLogger(PACKAGE_LOGGER)
+        if not any(isinstance(h, DroppingQueueHandler) for h in package.handlers):
+            if package.level == logging.NOTSET:
+                package.setLevel(logging.INFO)
+            package.addHandler(queue_handler)
+        _listeners[name] = (log_file, listener)
+
+    return logger
+
+def _stop_listener(name: str, listener: "_Listener") -> None:
+    """Detach a logger's queue handler, then flush and close its listener"""
+    for logger in (logging.getLogger(name), logging.getLogger(PACKAGE_LOGGER)):
+        for handler in list(logger.handlers):
+            if isinstance(handler, DroppingQueueHandler) and handler.queue is listener.queue:
+                logger.removeHandler(handler)
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer threads"""
+    with _lock:
+        listeners = list(_listeners.items())
+        _listeners.clear()
+    for name, (_, listener) in listeners:
+        _stop_listener(name, listener)
+
+atexit.register(shutdown_logging)
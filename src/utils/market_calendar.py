@@ -0,0 +1,180 @@
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import time as _time
+import logging
+import pytz
+
+logger = logging.getLogger(__name__)
+
+# Unscheduled full-day closures (weather, national days of mourning)
+SPECIAL_CLOSURES = (
+    date(2012, 10, 29), date(2012, 10, 30),  # Hurricane Sandy
+    date(2018, 12, 5),  # George H. W. Bush
+    date(2025, 1, 9),  # Jimmy Carter
+)
+
+def _easter(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """The n-th given weekday of a month (n=-1 for the last one)"""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+def _observed(day: date) -> Optional[date]:
+    """Weekend holidays move to Friday/Monday; NYSE skips a Saturday New Year's Day"""
+    if day.weekday() == 5:
+        return None if (day.month, day.day) == (1, 1) else day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+def nyse_holidays(year: int) -> Set[date]:
+    """Full-day NYSE closures observed in the given year"""
+    fixed = [date(year, 1, 1), date(year, 7, 4), date(year, 12, 25)]
+    if year >= 2022:
+        fixed.append(date(year, 6, 19))  # Juneteenth
+    holidays = {observed for observed in map(_observed, fixed) if observed is not None}
+    holidays.update({
+        _nth_weekday(year, 1, 0, 3),  # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),  # Presidents' Day
+        _easter(year) - timedelta(days=2),  # Good Friday
+        _nth_weekday(year, 5, 0, -1),  # Memorial Day
+        _nth_weekday(year, 9, 0, 1),  # Labor Day
+        _nth_weekday(year, 11, 3, 4),  # Thanksgiving
+    })
+    holidays.update(day for day in SPECIAL_CLOSURES if day.year == year)
+    return holidays
+
+def nyse_early_closes(year: int) -> Set[date]:
+    """13:00 ET closes: July 3, the day after Thanksgiving and Christmas Eve"""
+    holidays = nyse_holidays(year)
+    candidates = [
+        date(year, 7, 3),
+        _nth_weekday(year, 11, 3, 4) + timedelta(days=1),
+        date(year, 12, 24),
+    ]
+    return {day for day in candidates if day.weekday() < 5 and day not in holidays}
+
+class MarketCalendar:
+    """
+    NYSE regular sessions precomputed as UTC epoch seconds.
+    Lookups are a binary search over the session opens; years outside the
+    precomputed range are added on first use.
+    """
+
+    def __init__(self, start_year: Optional[int] = None, end_year: Optional[int] = None,
+                 clock: Callable[[], float] = _time.time, timezone: str = 'US/Eastern',
+                 market_open: time = time(9, 30), market_close: time = time(16, 0),
+                 early_close: time = time(13, 0)):
+        self.clock = clock
+        self.timezone = pytz.timezone(timezone)
+        self.market_open = market_open
+        self.market_close = market_close
+        self.early_close = early_close
+        this_year = datetime.fromtimestamp(clock(), self.timezone).year
+        self._start_year = start_year if start_year is not None else this_year - 1
+        self._end_year = end_year if end_year is not None else this_year + 1
+        self._opens: List[float] = []
+        self._closes: List[float] = []
+        self._sessions: Dict[date, Tuple[float, float]] = {}
+        self._build()
+
+    def _build(self) -> None:
+        opens, closes, sessions = [], [], {}
+        for year in range(self._start_year, self._end_year + 1):
+            holidays = nyse_holidays(year)
+            early = nyse_early_closes(year)
+            day = date(year, 1, 1)
+            while day.year == year:
+                if day.weekday() < 5 and day not in holidays:
+                    close_time = self.early_close if day in early else self.market_close
+                    start = self._epoch(day, self.market_open)
+                    end = self._epoch(day, close_time)
+                    opens.append(start)
+                    closes.append(end)
+                    sessions[day] = (start, end)
+                day += timedelta(days=1)
+        self._opens, self._closes, self._sessions = opens, closes, sessions
+        # Instants covered without rebuilding: ts and the session after it
+        self._covered = (self._epoch(date(self._start_year, 1, 1), time(0)),
+                         self._epoch(date(self._end_year, 1, 1), time(0)))
+
+    def _epoch(self, day: date, at: time) -> float:
+        return self.timezone.localize(datetime.combine(day, at)).timestamp()
+
+    def _ensure(self, ts: float) -> None:
+        """Extend the precomputed range so ts and the following session are covered"""
+        if self._covered[0] <= ts < self._covered[1]:
+            return
+        year = datetime.fromtimestamp(ts, self.timezone).year
+        self._start_year = min(self._start_year, year)
+        self._end_year = max(self._end_year, year + 1)
+        logger.debug(f"Extending market calendar to {self._start_year}-{self._end_year}")
+        self._build()
+
+    def _now(self, ts: Optional[float]) -> float:
+        ts = self.clock() if ts is None else ts
+        self._ensure(ts)
+        return ts
+
+    def session(self, day: date) -> Optional[Tuple[float, float]]:
+        """(open, close) epoch seconds for a date, or None if the market is closed"""
+        self._ensure(self._epoch(day, self.market_open))
+        return self._sessions.get(day)
+
+    def is_trading_day(self, day: date) -> bool:
+        return self.session(day) is not None
+
+    def is_early_close(self, day: date) -> bool:
+        session = self.session(day)
+        return session is not None and session[1] != self._epoch(day, self.market_close)
+
+    def current_session(self, ts: Optional[float] = None) -> Optional[Tuple[float, float]]:
+        """The session containing ts (default: now), if any"""
+        ts = self._now(ts)
+        i = bisect_right(self._opens, ts) - 1
+        if i >= 0 and ts < self._closes[i]:
+            return self._opens[i], self._closes[i]
+        return None
+
+    def is_open(self, ts: Optional[float] = None) -> bool:
+        return self.current_session(ts) is not None
+
+    def next_open(self, ts: Optional[float] = None) -> float:
+        """Open of the first session starting after ts (default: now)"""
+        ts = self._now(ts)
+        return self._opens[bisect_right(self._opens, ts)]
+
+    def next_close(self, ts: Optional[float] = None) -> float:
+        """Close of the current session, or of the next one if the market is closed"""
+        ts = self._now(ts)
+        i = bisect_right(self._closes, ts)
+        return self._closes[i]
+
+    def seconds_until_open(self, ts: Optional[float] = None) -> float:
+        ts = self._now(ts)
+        return self.next_open(ts) - ts
+
+    def seconds_until_close(self, ts: Optional[float] = None) -> float:
+        """Seconds left in the current session; 0 when the market is closed"""
+        ts = self._now(ts)
+        session = self.current_session(ts)
+        if session is None:
+            return 0.0
+        return session[1] - ts
@@ -1,19 +1,50 @@
-import pandas as pd
-from datetime import datetime
+from html import escape
 from pathlib import Path
 from typing import Optional, List
+import csv
+from ..config import TradingConfig
+from .journal import TRANSACTION_FIELDS, TransactionJournal, create_journal
+from .clock import Clock
 
 class Reporter:
-    def __init__(self):
-        self.transactions = []
+    def __init__(self, journal: Optional[TransactionJournal] = None,
+                 clock: Optional[Clock] = None,
+                 config: Optional[TradingConfig] = None):
+        self.clock = clock or Clock()
         self.reports_dir = Path("trading_records/reports")
+        if config is not None:
+            self.reports_dir = config.REPORTS_DIR
         self.reports_dir.mkdir(parents=True, exist_ok=True)
+        if journal is None:
+            config = config or TradingConfig()
+            journal = create_journal(
+                config.JOURNAL_BACKEND,
+                self.reports_dir,
+                fsync_batch=config.JOURNAL_FSYNC_BATCH,
+                fsync_interval=config.JOURNAL_FSYNC_INTERVAL
+            )
+        self.journal = journal
+        self.start_session()
+
+    def start_session(self) -> None:
+        """
+        Begin a new CSV/HTML report pair, extended as trades come in.
+        Earlier transactions stay in the journal but leave the reports.
+        """
+        self.transactions = []
+        timestamp = self.clock.now().strftime("%Y%m%d_%H%M%S")
+        self.csv_report_path = self.reports_dir / f"trading_report_{timestamp}.csv"
+        self.html_report_path = self.reports_dir / f"trading_report_{timestamp}.html"
+        self._reported_count = 0  # Transactions already in the CSV and the HTML rows
+        self._html_current = False  # Whether the HTML file shows all of them
+        self._html_rows: List[str] = []
+        self._screenshot_html: List[str] = []
 
     def record_transaction(self, symbol: str, price: float, quantity: int, 
                          spx_drop: float, screenshot_path: Optional[Path] = None) -> None:
         """Record a trading transaction"""
         transaction = {
-            'date': datetime.now(),
+            'date': self.clock.now(),
             'symbol': symbol,
             'price': price,
             'quantity': quantity,
@@ -25,49 +56,95 @@ class Reporter:
         self.transactions.append(transaction)
         self._save_transaction(transaction)
 
+    def restore(self, transactions: List[dict]) -> None:
+        """Reload transactions from a checkpoint without journaling them again"""
+        self.transactions.extend(transactions)
+
     def _save_transaction(self, transaction: dict) -> None:
-        """Save individual transaction to CSV"""
+        """Append individual transaction to the journal"""
         try:
-            df = pd.DataFrame([transaction])
-            csv_path = self.reports_dir / "transactions.csv"
-            
-            if csv_path.exists():
-                df.to_csv(csv_path, mode='a', header=False, index=False)
-            else:
-                df.to_csv(csv_path, index=False)
-                
+            self.journal.record_transaction(transaction)
         except Exception as e:
             print(f"Error saving transaction: {str(e)}")
 
+    def close(self) -> None:
+        """Flush and close the transaction journal"""
+        try:
+            self.journal.close()
+        except Exception as e:
+            print(f"Error closing transaction journal: {str(e)}")
+
     def generate_report(self) -> List[Path]:
-        """Generate reports and return list of report paths"""
+        """
+        Bring the session reports up to date and return their paths.
+        Only transactions added since the last call are written; with nothing
+        new this is a no-op returning the existing paths.
+        """
         try:
             if not self.transactions:
                 return []
 
-            # Create paths
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            csv_path = self.reports_dir / f"trading_report_{timestamp}.csv"
-            html_path = self.reports_dir / f"trading_report_{timestamp}.html"
+            report_paths = [self.csv_report_path, self.html_report_path]
+            start = self._reported_count
+            new_transactions = self.transactions[start:]
+            html_current = self._html_current and self.html_report_path.exists()
+            if not new_transactions and html_current:
+                return report_paths
+
+            if new_transactions:
+                # Render only the new rows up front, so nothing can fail between
+                # the CSV append and counting the rows as reported
+                rows = [self._render_row(start + offset, transaction)
+                        for offset, transaction in enumerate(new_transactions)]
+                screenshots = [self._render_screenshot(transaction)
+                               for transaction in new_transactions
+                               if transaction.get('screenshot_path')]
+
+                # Append new rows to the CSV report
+                is_new = not self.csv_report_path.exists()
+                with open(self.csv_report_path, 'a', newline='') as f:
+                    writer = csv.writer(f)
+                    if is_new:
+                        writer.writerow(TRANSACTION_FIELDS)
+                    for transaction in new_transactions:
+                        writer.writerow([
+                            '' if transaction.get(field) is None else transaction[field]
+                            for field in TRANSACTION_FIELDS
+                        ])
+                self._reported_count = start + len(new_transactions)
+                self._html_rows.extend(rows)
+                self._screenshot_html.extend(screenshots)
+                self._html_current = False
+
+            # Rewrite the HTML from the cached fragments; retried on the next
+            # call if this write fails
+            self.html_report_path.write_text(self._generate_html_report())
+            self._html_current = True
+            return report_paths
 
-            # Create DataFrame
-            df = pd.DataFrame(self.transactions)
-            
-            # Save CSV report
-            df.to_csv(csv_path, index=False)
-            
-            # Generate HTML report
-            html_content = self._generate_html_report(df)
-            html_path.write_text(html_content)
-            
-            return [csv_path, html_path]
-                
         except Exception as e:
             print(f"Error generating report: {str(e)}")
             return []
 
-    def _generate_html_report(self, df: pd.DataFrame) -> str:
+    def _render_row(self, index: int, transaction: dict) -> str:
+        """Render one transaction as an HTML table row"""
+        cells = "".join(
+            f"<td>{escape(str(transaction.get(field)))}</td>" for field in TRANSACTION_FIELDS
+        )
+        return f"<tr><th>{index}</th>{cells}</tr>"
+
+    def _render_screenshot(self, transaction: dict) -> str:
+        """Render the screenshot block for one transaction"""
+        return f"""
+                <div class="screenshot">
+                    <h3>{escape(transaction['symbol'])} - {transaction['date'].strftime('%Y-%m-%d %H:%M:%S')}</h3>
+                    <img src="{escape(transaction['screenshot_path'])}" alt="Trading Screenshot">
+                </div>
+                """
+
+    def _generate_html_report(self) -> str:
         """Generate HTML report content"""
+        header = "".join(f"<th>{field}</th>" for field in TRANSACTION_FIELDS)
         return f"""
         <html>
         <head>
@@ -83,26 +160,18 @@ class Reporter:
         </head>
         <body>
             <h1>Trading Report</h1>
-            <h2>Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</h2>
+            <h2>Generated: {self.clock.now().strftime('%Y-%m-%d %H:%M:%S')}</h2>
             
             <h2>Transaction Summary</h2>
-            {df.to_html(classes='table')}
+            <table class="table">
+                <thead><tr><th></th>{header}</tr></thead>
+                <tbody>
+                {"".join(self._html_rows)}
+                </tbody>
+            </table>
             
             <h2>Screenshots</h2>
-            {self._generate_screenshot_html()}
+            {"".join(self._screenshot_html)}
         </body>
         </html>
         """
-
-    def _generate_screenshot_html(self) -> str:
-        """Generate HTML for screenshots"""
-        html = ""
-        for transaction in self.transactions:
-            if transaction.get('screenshot_path'):
-                html += f"""
-                <div class="screenshot">
-                    <h3>{transaction['symbol']} - {transaction['date'].strftime('%Y-%m-%d %H:%M:%S')}</h3>
-                    <img src="{transaction['screenshot_path']}" alt="Trading Screenshot">
-                </div>
-                """
-        return html
\ No newline at end of file
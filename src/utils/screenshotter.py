@@ -1,51 +1,141 @@
-from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
-import pyautogui
+from typing import NamedTuple, Optional, Tuple
+import threading
+import logging
+from PIL import Image
+try:
+    import pyautogui
+except Exception:  # No display, e.g. inside a container
+    pyautogui = None
 from ..config import TradingConfig  # Updated import path
+from .clock import Clock
+
+logger = logging.getLogger(__name__)
+
+# File suffix and Pillow format name per configured image format
+IMAGE_FORMATS = {
+    'png': ('png', 'PNG'),
+    'webp': ('webp', 'WEBP'),
+    'jpeg': ('jpg', 'JPEG'),
+    'jpg': ('jpg', 'JPEG'),
+}
+
+class PendingScreenshot(NamedTuple):
+    path: Path  # Where the image will be written
+    future: "Future[Optional[Path]]"  # Resolves to path, or None if the capture failed
+
+def display_available() -> bool:
+    """True if pyautogui could be loaded, i.e. there is a screen to grab"""
+    return pyautogui is not None
 
 class Screenshotter:
-    def __init__(self):
-        self.config = TradingConfig()
+    """
+    Captures screenshots on a background worker.
 
-    def capture(self, symbol: str) -> Optional[Path]:
-        """
-        Capture screenshot of trading activity
-        Returns the path to the saved screenshot
-        """
-        try:
-            # Generate filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{symbol}_{timestamp}.png"
-            filepath = self.config.SCREENSHOTS_DIR / filename
+    capture() returns the path the image will be written to straight away;
+    grabbing, scaling and encoding happen off the calling thread. At most
+    SCREENSHOT_QUEUE_SIZE captures are pending at once; further requests are
+    dropped rather than queued without bound.
+    """
 
-            # Take screenshot
-            screenshot = pyautogui.screenshot()
-            screenshot.save(str(filepath))
+    def __init__(self, config: Optional[TradingConfig] = None,
+                 clock: Optional[Clock] = None):
+        self.config = config or TradingConfig()
+        self.clock = clock or Clock()
+        fmt = self.config.SCREENSHOT_FORMAT.lower()
+        if fmt not in IMAGE_FORMATS:
+            logger.warning(f"Unknown screenshot format {fmt}, using png")
+            fmt = 'png'
+        self.suffix, self.pil_format = IMAGE_FORMATS[fmt]
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="screenshots"
+        )
+        self._slots = threading.BoundedSemaphore(self.config.SCREENSHOT_QUEUE_SIZE)
+        self._lock = threading.Lock()  # Guards the filename sequence
+        self._last_timestamp = ""
+        self._timestamp_seq = 0
 
-            return filepath
+    def _filepath(self, symbol: str, tag: str = "") -> Path:
+        with self._lock:
+            # Clock time in UTC, like chart filenames; read under the lock so
+            # a stale stamp never resets the sequence of a newer one
+            now = datetime.fromtimestamp(self.clock.time(), timezone.utc)
+            timestamp = now.strftime("%Y%m%d_%H%M%S_%f")[:-3]
+            # Number captures issued within the same millisecond
+            if timestamp == self._last_timestamp:
+                self._timestamp_seq += 1
+                timestamp = f"{timestamp}_{self._timestamp_seq}"
+            else:
+                self._last_timestamp = timestamp
+                self._timestamp_seq = 0
+        return self.config.SCREENSHOTS_DIR / f"{symbol}_{timestamp}{tag}.{self.suffix}"
 
+    def _save(self, image: Image.Image, filepath: Path) -> None:
+        """Downscale and encode with the configured format and compression"""
+        scale = self.config.SCREENSHOT_SCALE
+        if 0 < scale < 1:
+            size = (max(1, int(image.width * scale)), max(1, int(image.height * scale)))
+            image = image.resize(size, Image.BILINEAR)
+        quality = self.config.SCREENSHOT_QUALITY
+        if self.pil_format == 'PNG':
+            level = self.config.SCREENSHOT_PNG_COMPRESS_LEVEL
+            image.save(str(filepath), 'PNG', compress_level=level)
+        elif self.pil_format == 'WEBP':
+            image.save(str(filepath), 'WEBP', quality=quality, method=0)
+        else:
+            image.convert('RGB').save(str(filepath), 'JPEG', quality=quality)
+
+    def _grab(self, filepath: Path,
+              region: Optional[Tuple[int, int, int, int]]) -> Optional[Path]:
+        try:
+            if pyautogui is None:
+                raise RuntimeError("pyautogui is unavailable (no display)")
+            if region:
+                screenshot = pyautogui.screenshot(region=region)
+            else:
+                screenshot = pyautogui.screenshot()
+            self._save(screenshot, filepath)
+            return filepath
         except Exception as e:
-            print(f"Error capturing screenshot: {str(e)}")
+            logger.error(f"Error capturing screenshot: {str(e)}")
             return None
+        finally:
+            self._slots.release()
+
+    def submit(self, symbol: str, region: Optional[Tuple[int, int, int, int]] = None,
+               tag: str = "") -> Optional[PendingScreenshot]:
+        """Queue a capture; returns None if the queue is full"""
+        if not self._slots.acquire(blocking=False):
+            logger.warning(f"Screenshot queue full, skipping capture for {symbol}")
+            return None
+        filepath = self._filepath(symbol, tag)
+        try:
+            future = self._executor.submit(self._grab, filepath, region)
+        except Exception:
+            # Never reaches _grab (e.g. submitted after close), so free the slot here
+            self._slots.release()
+            raise
+        return PendingScreenshot(filepath, future)
+
+    def capture(self, symbol: str) -> Optional[Path]:
+        """
+        Capture screenshot of trading activity (the configured region by default)
+        Returns the path the screenshot will be saved to
+        """
+        region = self.config.SCREENSHOT_REGION
+        pending = self.submit(symbol, region, "_region" if region else "")
+        return pending.path if pending else None
 
     def capture_region(self, symbol: str, region: tuple) -> Optional[Path]:
         """
         Capture screenshot of specific region (x, y, width, height)
-        Returns the path to the saved screenshot
+        Returns the path the screenshot will be saved to
         """
-        try:
-            # Generate filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{symbol}_{timestamp}_region.png"
-            filepath = self.config.SCREENSHOTS_DIR / filename
-
-            # Take screenshot of specific region
-            screenshot = pyautogui.screenshot(region=region)
-            screenshot.save(str(filepath))
+        pending = self.submit(symbol, region, "_region")
+        return pending.path if pending else None
 
-            return filepath
-
-        except Exception as e:
-            print(f"Error capturing region screenshot: {str(e)}")
-            return None
\ No newline at end of file
+    def close(self, wait: bool = True) -> None:
+        """Finish pending captures and stop the worker"""
+        self._executor.shutdown(wait=wait)
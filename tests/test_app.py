@@ -0,0 +1,105 @@
+from datetime import datetime
+import pytz
+from src.app import TradingApp
+from src.config import DaemonSettings
+
+def simulated_session(tmp_path, async_mode: bool) -> TradingApp:
+    """Run the last ten minutes of a trading day unattended, then exit"""
+    start = pytz.timezone('US/Eastern').localize(datetime(2026, 10, 14, 15, 50))
+    app = TradingApp.simulated(start=start.timestamp(), async_mode=async_mode,
+                               daemon=DaemonSettings('paper', ('MSFT',), 'exit'),
+                               records_dir=tmp_path)
+    app.run()
+    return app
+
+def test_async_session_builds_bars(tmp_path):
+    app = simulated_session(tmp_path, async_mode=True)
+    for symbol in ("SPX", "MSFT"):
+        assert len(app.bars.bars(symbol, 60.0)) == 10
+        assert len(app.bars.bars(symbol, 1.0)) > 0
+
+def test_new_session_starts_new_report(tmp_path):
+    app = TradingApp.simulated(start=1_700_000_000.0, records_dir=tmp_path)
+    app._begin_session()
+    app.reporter.record_transaction("MSFT", 100.0, 1, 10.0)
+    first_report = app.reporter.generate_report()
+    app.clock.advance(86400.0)
+    app._begin_session()
+    assert app.reporter.transactions == []
+    assert app._checkpoint_state()['transactions'] == []
+    app.reporter.record_transaction("MSFT", 90.0, 2, 20.0)
+    second_report = app.reporter.generate_report()
+    assert second_report != first_report
+    assert second_report[0].read_text().count("MSFT") == 1
+
+def test_failed_trade_releases_level_after_retry_interval(tmp_path):
+    app = TradingApp.simulated(start=1_700_000_000.0, records_dir=tmp_path)
+    app.ladder.add_symbol("MSFT")
+    [order] = app._evaluate_ladder(15.0)
+    app._trade_failed(order)
+    # Held back, and not saved as bought
+    assert app._evaluate_ladder(15.0) == []
+    assert app._checkpoint_state()['fired'] == {"MSFT": []}
+    assert not app._all_executed()
+    app.clock.advance(app.config.TRADE_RETRY_INTERVAL)
+    assert app._evaluate_ladder(15.0) == [order]
+
+def test_released_level_is_not_restored_as_fired(tmp_path):
+    app = TradingApp.simulated(start=1_700_000_000.0, records_dir=tmp_path)
+    app.ladder.add_symbol("MSFT")
+    [order] = app._evaluate_ladder(15.0)
+    app._trade_failed(order)
+    app.checkpoint.close()
+    restarted = TradingApp.simulated(start=1_700_000_100.0, records_dir=tmp_path)
+    assert restarted.restore_checkpoint()
+    assert restarted._checkpoint_state()['fired'] == {"MSFT": []}
+
+def test_retry_hold_survives_restart(tmp_path):
+    app = TradingApp.simulated(start=1_700_000_000.0, records_dir=tmp_path)
+    app.ladder.add_symbol("MSFT")
+    [first] = app._evaluate_ladder(15.0)
+    app._trade_failed(first)
+    app.save_checkpoint()  # Hold in the snapshot
+    [second] = app._evaluate_ladder(25.0)
+    app._trade_failed(second)  # Hold only in the log
+    app.checkpoint.close()
+    soon = TradingApp.simulated(start=1_700_000_030.0, records_dir=tmp_path)
+    assert soon.restore_checkpoint()
+    assert soon._evaluate_ladder(25.0) == []
+    assert not soon._all_executed()
+    soon.checkpoint.close()
+    later = TradingApp.simulated(start=1_700_000_000.0 + app.config.TRADE_RETRY_INTERVAL,
+                                 records_dir=tmp_path)
+    assert later.restore_checkpoint()
+    assert later._evaluate_ladder(25.0) == [first, second]
+
+def test_checkpoint_from_another_day_is_skipped(tmp_path):
+    app = TradingApp.simulated(start=1_700_000_000.0, records_dir=tmp_path)
+    app.ladder.add_symbol("MSFT")
+    app._evaluate_ladder(15.0)
+    app.save_checkpoint()
+    app._evaluate_ladder(25.0)  # Only in the log
+    app.checkpoint.close()
+    next_day = TradingApp.simulated(start=1_700_000_000.0 + 86400, records_dir=tmp_path)
+    next_day.ladder.add_symbol("MSFT")
+    assert not next_day.restore_checkpoint()
+    assert next_day.ladder.fired_levels("MSFT") == []
+
+def test_report_closes_bars_of_quiet_symbols(tmp_path):
+    app = TradingApp.simulated(start=1_700_000_000.0, records_dir=tmp_path)
+    app.bars.on_tick("MSFT", app.clock.time(), 100.0)
+    app.clock.advance(120.0)  # MSFT goes quiet until the close
+    app.send_trading_report()
+    assert len(app.bars.bars("MSFT", 60.0)) == 1
+
+def test_seeded_base_price_is_checkpointed(tmp_path):
+    app = TradingApp.simulated(start=1_700_000_000.0, records_dir=tmp_path)
+    assert app.connect_to_server(7497)
+    app._begin_session()
+    app.save_checkpoint()
+    assert not app._checkpoint_due()
+    app.monitor_spx()
+    assert app.spx_base_price
+    assert app.trading_summary['spx_base_price'] == app.spx_base_price
+    assert app._checkpoint_due()
+    app.market.disconnect()
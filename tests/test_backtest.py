@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+from src.backtest import run_backtest
+from src.config import TradingConfig
+from src.strategy.drop_ladder import DropLadder
+
+def bars(days: int = 300):
+    index = pd.date_range("2020-01-01", periods=days, freq="D")
+    rng = np.random.default_rng(0)
+    spx = pd.Series(4000 * np.exp(np.cumsum(rng.normal(0, 0.03, days))), index, name="SPX")
+    stocks = pd.DataFrame({"MSFT": 300 + rng.normal(0, 1, days).cumsum(),
+                           "AAPL": 150 + rng.normal(0, 1, days).cumsum()}, index)
+    return spx, stocks
+
+def test_backtest_fires_what_the_live_ladder_fires():
+    spx, stocks = bars()
+    result = run_backtest(spx, stocks, levels=[20, 10, 30], quantities=[2, 1, 3], session="M")
+    assert len(result.trades)
+
+    ladder = DropLadder(stocks.columns, [20, 10, 30], [2, 1, 3])
+    sessions = stocks.index.to_period("M")
+    expected = []
+    for i, drop in enumerate(result.drawdown.to_numpy()):
+        if i and sessions[i] != sessions[i - 1]:
+            ladder.reset()
+        expected += [(stocks.index[i], order.symbol, order.level, order.quantity)
+                     for order in ladder.evaluate(drop)]
+    trades = result.trades
+    actual = list(zip(trades['date'], trades['symbol'], trades['level'], trades['quantity']))
+    assert sorted(actual) == sorted(expected)
+
+def test_quantities_are_kept_when_levels_come_from_config():
+    spx, stocks = bars()
+    levels = TradingConfig().SPX_DROP_LEVELS
+    result = run_backtest(spx, stocks, quantities=[5] * len(levels))
+    assert set(result.trades['quantity']) == {5}
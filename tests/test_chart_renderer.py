@@ -0,0 +1,50 @@
+from dataclasses import replace
+import numpy as np
+import pytest
+from src.config import TradingConfig
+from src.trading import TickColumns
+from src.utils.chart_renderer import ChartRenderer
+from src.utils.clock import SimulatedClock
+
+START = 1_700_000_000.0
+
+def tick_source(symbol, start, end) -> TickColumns:
+    ts = np.arange(START - 60.0, START + 1.0, 0.5)
+    prices = 100.0 + np.sin(ts)
+    nan = np.full_like(ts, np.nan)
+    return TickColumns(ts, nan, nan, prices, np.ones_like(ts)).between(start, end)
+
+def make_renderer(tmp_path, **options) -> ChartRenderer:
+    config = replace(TradingConfig().relocated(tmp_path), **options)
+    return ChartRenderer(tick_source, clock=SimulatedClock(start=START), config=config)
+
+def test_captures_within_one_step_share_a_render(tmp_path):
+    renderer = make_renderer(tmp_path)
+    renderer.clock.advance(0.25)
+    first = renderer.capture("MSFT")
+    renderer.clock.advance(0.5)
+    assert renderer.capture("MSFT") == first
+    # The cache hit did not use up a filename
+    assert renderer._timestamp_seq == 0
+    renderer.clock.advance(0.5)  # Next step
+    later = renderer.capture("MSFT")
+    renderer.close()
+    assert later != first
+    assert first.exists() and later.exists()
+
+def test_unrounded_charts_within_one_second_get_their_own_files(tmp_path):
+    renderer = make_renderer(tmp_path, CHART_RESOLUTION=0.0)
+    pending = [renderer.submit("MSFT", at) for at in (START, START + 0.25, START + 0.5)]
+    paths = [p.future.result() for p in pending]
+    assert len(set(paths)) == 3
+    assert all(path.exists() for path in paths)
+    # The same window again reuses the finished render
+    assert renderer.submit("MSFT", START + 0.25).path == paths[1]
+    renderer.close()
+
+def test_submit_after_close_frees_its_slot(tmp_path):
+    renderer = make_renderer(tmp_path)
+    renderer.close()
+    for _ in range(renderer.config.SCREENSHOT_QUEUE_SIZE + 1):
+        with pytest.raises(RuntimeError):
+            renderer.submit("MSFT")
@@ -0,0 +1,39 @@
+from src.utils.checkpoint import Checkpointer
+
+def fired(level: float) -> dict:
+    return {'type': 'fired', 'day': "2026-10-14", 'symbol': "MSFT", 'level': level}
+
+def test_torn_tail_is_dropped_and_not_appended_to(tmp_path):
+    checkpoint = Checkpointer(tmp_path)
+    checkpoint.log(fired(10))
+    checkpoint.log(fired(20))
+    checkpoint.close()
+    with open(checkpoint.wal_path, 'a') as f:
+        f.write('{"type":"fired","day":"2026-')  # Crash mid-write
+
+    restarted = Checkpointer(tmp_path)
+    snapshot, events = restarted.load()
+    assert snapshot is None
+    assert [event['level'] for event in events] == [10, 20]
+    assert restarted.log(fired(30)) == 3
+    restarted.close()
+
+    _, events = Checkpointer(tmp_path).load()
+    assert [event['seq'] for event in events] == [1, 2, 3]
+
+def test_events_covered_by_snapshot_are_not_replayed(tmp_path, monkeypatch):
+    checkpoint = Checkpointer(tmp_path)
+    for level in (10, 20, 30):
+        checkpoint.log(fired(level))
+    # Crash after the snapshot is in place but before the log is truncated
+    monkeypatch.setattr(checkpoint, '_rewrite_log', lambda: None)
+    checkpoint.save({'fired': {"MSFT": [10, 20]}}, seq=2)
+    checkpoint.close()
+    assert len(checkpoint.wal_path.read_text().splitlines()) == 3
+
+    restarted = Checkpointer(tmp_path)
+    snapshot, events = restarted.load()
+    assert snapshot['wal_seq'] == 2
+    assert [event['level'] for event in events] == [30]
+    assert restarted.log(fired(40)) == 4
+    restarted.close()
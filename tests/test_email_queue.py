@@ -0,0 +1,109 @@
+from email.message import EmailMessage
+import socketserver
+import threading
+from src.utils.email_queue import EmailQueue, SmtpConfig
+from src.utils.email_sender import EmailSender
+
+class FakeSmtpServer(socketserver.ThreadingTCPServer):
+    """Local SMTP stand-in: no TLS or AUTH, optionally rejecting the first messages"""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, reject: int = 0):
+        super().__init__(('127.0.0.1', 0), FakeSmtpHandler)
+        self.reject = reject
+        self.connections = 0
+        self.messages = []
+        self.lock = threading.Lock()
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+class FakeSmtpHandler(socketserver.StreamRequestHandler):
+    def reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self) -> None:
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self.reply("220 fake")
+        for raw in self.rfile:
+            command = raw.decode().strip().upper()
+            if command == "DATA":
+                self.reply("354 go ahead")
+                lines = []
+                for line in self.rfile:
+                    if line in (b".\r\n", b".\n"):
+                        break
+                    lines.append(line)
+                with server.lock:
+                    if server.reject > 0:
+                        server.reject -= 1
+                        self.reply("451 try again later")
+                        continue
+                    server.messages.append(b"".join(lines))
+                self.reply("250 queued")
+            elif command == "QUIT":
+                self.reply("221 bye")
+                return
+            else:  # EHLO, HELO, MAIL, RCPT, RSET, NOOP
+                self.reply("250 ok")
+
+def smtp_config(server: FakeSmtpServer) -> SmtpConfig:
+    return SmtpConfig("127.0.0.1", server.port, use_tls=False, login=False, timeout=5.0)
+
+def message(subject: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg['From'], msg['To'], msg['Subject'] = "bot@example.com", "me@example.com", subject
+    msg.set_content("report")
+    return msg
+
+def test_spooled_mail_is_sent_when_the_sender_starts(tmp_path, monkeypatch):
+    server = FakeSmtpServer()
+    spool = tmp_path / "outbox"
+    spool.mkdir()
+    # Left behind by a run that crashed before delivering it
+    (spool / "1_crashed.eml").write_bytes(message("left over").as_bytes())
+
+    monkeypatch.setenv('TRADING_EMAIL', "bot@example.com")
+    monkeypatch.setenv('TRADING_EMAIL_PASSWORD', "secret")
+    monkeypatch.setenv('SMTP_SERVER', "127.0.0.1")
+    monkeypatch.setenv('SMTP_PORT', str(server.port))
+    monkeypatch.setenv('SMTP_STARTTLS', "0")
+    monkeypatch.setenv('SMTP_LOGIN', "0")
+    sender = EmailSender(records_dir=tmp_path)
+    assert sender.queue.flush(timeout=5.0)
+    sender.close()
+    server.shutdown()
+    assert len(server.messages) == 1
+    assert b"left over" in server.messages[0]
+    assert not list(spool.glob("*.eml"))
+
+def test_failed_delivery_is_retried_with_backoff(tmp_path):
+    server = FakeSmtpServer(reject=2)
+    delivered = []
+    email_queue = EmailQueue(smtp_config(server), "bot@example.com", None, tmp_path,
+                             backoff=0.01, on_delivered=delivered.append)
+    email_queue.enqueue(message("retried"), {'attempt': 'first'})
+    assert email_queue.flush(timeout=5.0)
+    email_queue.stop()
+    server.shutdown()
+    assert len(server.messages) == 1
+    # Every failure drops the connection before backing off
+    assert server.connections == 3
+    assert delivered == [{'attempt': 'first'}]
+    assert email_queue.sent_count == 1
+
+def test_connection_is_reused_across_messages(tmp_path):
+    server = FakeSmtpServer()
+    email_queue = EmailQueue(smtp_config(server), "bot@example.com", None, tmp_path)
+    for number in range(3):
+        email_queue.enqueue(message(f"report {number}"))
+    assert email_queue.flush(timeout=5.0)
+    email_queue.stop()
+    server.shutdown()
+    assert len(server.messages) == 3
+    assert server.connections == 1
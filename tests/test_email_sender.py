@@ -0,0 +1,58 @@
+from email.mime.multipart import MIMEMultipart
+import io
+import os
+import time
+import zipfile
+from src.utils.clock import SimulatedClock
+from src.utils.email_sender import AttachmentConfig, EmailSender
+
+def make_sender(tmp_path, monkeypatch) -> EmailSender:
+    monkeypatch.delenv('TRADING_EMAIL', raising=False)
+    monkeypatch.delenv('TRADING_EMAIL_PASSWORD', raising=False)
+    (tmp_path / "screenshots").mkdir()
+    (tmp_path / "reports").mkdir()
+    return EmailSender(clock=SimulatedClock(start=time.time() - 60.0), records_dir=tmp_path)
+
+def selected(sender: EmailSender):
+    return [arcname for _, arcname in sender._select_attachments([])]
+
+def test_sent_files_are_not_attached_again(tmp_path, monkeypatch):
+    sender = make_sender(tmp_path, monkeypatch)
+    (tmp_path / "screenshots" / "MSFT_1.png").write_bytes(b"png")
+    (tmp_path / "reports" / "report.csv").write_text("date,symbol\n")
+    included = sender._attach_trading_records(MIMEMultipart())
+    assert sorted(included) == ["reports/report.csv", "screenshots/MSFT_1.png"]
+
+    sender._mark_sent({'attachments': included})
+    assert selected(sender) == []
+    # A file changed since it was sent goes out again
+    (tmp_path / "reports" / "report.csv").write_text("date,symbol\n2026-10-14,MSFT\n")
+    assert selected(sender) == ["reports/report.csv"]
+
+def test_files_from_before_the_session_are_skipped(tmp_path, monkeypatch):
+    sender = make_sender(tmp_path, monkeypatch)
+    old = tmp_path / "screenshots" / "MSFT_old.png"
+    old.write_bytes(b"png")
+    before = sender.session_start - 3600.0
+    os.utime(old, (before, before))
+    (tmp_path / "screenshots" / "MSFT_new.png").write_bytes(b"png")
+    assert selected(sender) == ["screenshots/MSFT_new.png"]
+
+    sender.attachment_config = AttachmentConfig(scope="unsent")
+    assert selected(sender) == ["screenshots/MSFT_new.png", "screenshots/MSFT_old.png"]
+
+def test_bundle_is_capped_at_max_bytes(tmp_path, monkeypatch):
+    sender = make_sender(tmp_path, monkeypatch)
+    sender.attachment_config = AttachmentConfig(max_bytes=1500)
+    for number in range(3):
+        (tmp_path / "screenshots" / f"MSFT_{number}.png").write_bytes(os.urandom(600))
+    msg = MIMEMultipart()
+    included = sender._attach_trading_records(msg)
+    assert sorted(included) == ["screenshots/MSFT_0.png", "screenshots/MSFT_1.png"]
+
+    attachment = msg.get_payload()[-1].get_payload(decode=True)
+    assert len(attachment) <= 1500
+    assert sorted(zipfile.ZipFile(io.BytesIO(attachment)).namelist()) == sorted(included)
+    # The deferred file goes out with the next report
+    sender._mark_sent({'attachments': included})
+    assert selected(sender) == ["screenshots/MSFT_2.png"]
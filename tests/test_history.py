@@ -0,0 +1,67 @@
+from dataclasses import replace
+from datetime import date, datetime, timedelta
+import pytz
+from src.trading import (
+    DailyBar, DailyBarCache, IBSession, MarketData, SimulatedIB, SimulatorConfig, TickStore
+)
+from src.utils.clock import SimulatedClock
+
+def make_cache(tmp_path, today: date, hour: float = 8.0) -> DailyBarCache:
+    """Cache whose clock is at ``hour`` ET on ``today``; before the open by default"""
+    start = pytz.timezone('US/Eastern').localize(datetime.combine(today, datetime.min.time()))
+    clock = SimulatedClock(start=start.timestamp() + hour * 3600)
+    ib = SimulatedIB(SimulatorConfig(seed=1), clock)
+    market = MarketData(IBSession(ib=ib), tick_store=TickStore(tmp_path / "ticks"))
+    assert market.connect(7497)
+    return DailyBarCache(market, tmp_path / "history")
+
+def get_bars(cache: DailyBarCache, days: int, today: date):
+    return cache.market.session.run(cache.get_daily_bars_async("SPX", days, today))
+
+def bar(day: date) -> DailyBar:
+    return DailyBar(day, 100.0, 101.0, 99.0, 100.5)
+
+def test_grown_window_is_backfilled(tmp_path):
+    today = date(2026, 10, 14)
+    cache = make_cache(tmp_path, today)
+    cache.save("SPX", [bar(today - timedelta(days=1))])
+    bars = get_bars(cache, 20, today)
+    assert cache.requests == 1
+    assert len(bars) == 20
+    assert bars[-1].day == today - timedelta(days=1)
+    assert [b.day for b in bars] == sorted(b.day for b in bars)
+    # Now complete: answered from disk
+    assert get_bars(cache, 20, today) == bars
+    assert cache.requests == 1
+    cache.market.disconnect()
+
+def test_holiday_is_not_a_missing_day(tmp_path):
+    thanksgiving = date(2026, 11, 26)
+    today = thanksgiving + timedelta(days=1)
+    cache = make_cache(tmp_path, today)
+    cache.save("SPX", [bar(thanksgiving - timedelta(days=offset)) for offset in (3, 2, 1)])
+    assert len(get_bars(cache, 3, today)) == 3
+    assert cache.requests == 0
+    cache.market.disconnect()
+
+def test_current_cache_still_fetches_todays_bar(tmp_path):
+    today = date(2026, 10, 14)
+    cache = make_cache(tmp_path, today, hour=10.0)
+    cached = [bar(today - timedelta(days=offset)) for offset in (2, 1)]
+    cache.save("SPX", cached)
+    ib = cache.market.ib
+    serve_history = ib.reqHistoricalDataAsync
+
+    async def with_partial_bar(*args, **kwargs):
+        bars = await serve_history(*args, **kwargs)
+        bars.append(replace(bars[-1], date=today, high=120.0))
+        return bars
+
+    ib.reqHistoricalDataAsync = with_partial_bar
+    bars = get_bars(cache, 2, today)
+    assert cache.requests == 1
+    assert bars[:-1] == cached
+    assert bars[-1].day == today and bars[-1].high == 120.0
+    # The partial bar is never cached
+    assert cache.load("SPX") == cached
+    cache.market.disconnect()
@@ -0,0 +1,41 @@
+import time
+import pandas as pd
+import pytest
+from src.utils.journal import CsvJournal, ParquetJournal, TransactionJournal
+
+def transaction(symbol: str) -> dict:
+    return {'date': pd.Timestamp("2026-10-14 10:00"), 'symbol': symbol, 'price': 100.0,
+            'quantity': 1, 'total_cost': 100.0, 'spx_drop_percentage': 10.0,
+            'screenshot_path': None}
+
+def test_journal_backends_must_implement_storage():
+    with pytest.raises(TypeError):
+        TransactionJournal()  # type: ignore[abstract]
+
+def test_quiet_spell_is_synced_after_interval(tmp_path, monkeypatch):
+    journal = CsvJournal(tmp_path / "transactions.csv", fsync_batch=100, fsync_interval=0.05)
+    synced = []
+    monkeypatch.setattr(journal, '_fsync', lambda: synced.append(time.monotonic()))
+    journal.record_transaction(transaction("MSFT"))
+    time.sleep(0.3)
+    assert len(synced) == 1
+    journal.close()
+
+def test_parquet_recovery_skips_rows_already_in_a_part(tmp_path):
+    journal = ParquetJournal(tmp_path, fsync_batch=100)
+    journal.record_transaction(transaction("MSFT"))
+    journal.record_transaction(transaction("AAPL"))
+    # Crash after the part is written but before its staging file is removed
+    journal._staging.close()
+    journal._write_part(journal._number, journal._rows)
+    ParquetJournal(tmp_path).close()
+    df = pd.concat(pd.read_parquet(part) for part in sorted(tmp_path.glob("part-*.parquet")))
+    assert df['symbol'].tolist() == ["MSFT", "AAPL"]
+    assert not list(tmp_path.glob("staging-*.csv"))
+
+def test_parquet_recovers_staged_rows(tmp_path):
+    journal = ParquetJournal(tmp_path, fsync_batch=100)
+    journal.record_transaction(transaction("MSFT"))
+    journal._staging.close()  # Crash before any part is written
+    ParquetJournal(tmp_path).close()
+    assert pd.read_parquet(tmp_path / "part-00001.parquet")['symbol'].tolist() == ["MSFT"]
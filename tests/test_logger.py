@@ -0,0 +1,45 @@
+import logging
+from dataclasses import replace
+from src.config import TradingConfig
+from src.utils import logger as logger_module
+from src.utils.logger import DroppingQueueHandler, setup_logger, shutdown_logging
+
+def queue_handlers(logger: logging.Logger):
+    return [h for h in logger.handlers if isinstance(h, DroppingQueueHandler)]
+
+def test_module_loggers_write_through_the_app_pipeline(tmp_path):
+    logger = setup_logger("trading_app", TradingConfig().relocated(tmp_path))
+    [handler] = queue_handlers(logger)
+    assert handler in logging.getLogger("src").handlers
+    assert logging.getLogger("src.trading.market").isEnabledFor(logging.INFO)
+
+def test_setting_up_again_keeps_one_pipeline(tmp_path):
+    config = TradingConfig().relocated(tmp_path / "first")
+    logger = setup_logger("setup_twice", config)
+    assert setup_logger("setup_twice", config) is logger
+    [handler] = queue_handlers(logger)
+    listener = logger_module._listeners["setup_twice"][1]
+    # Another records directory moves the file instead of adding a second one
+    setup_logger("setup_twice", TradingConfig().relocated(tmp_path / "second"))
+    [moved] = queue_handlers(logger)
+    assert moved is not handler
+    assert logger_module._listeners["setup_twice"][1] is not listener
+    assert listener._thread is None  # Stopped
+    logger.info("moved")
+    shutdown_logging()
+    assert not (tmp_path / "first" / "logs" / "setup_twice.log").exists()
+    assert "moved" in (tmp_path / "second" / "logs" / "setup_twice.log").read_text()
+    assert queue_handlers(logger) == []
+
+def test_log_file_rotates_by_size(tmp_path, monkeypatch):
+    monkeypatch.delenv('LOG_ROTATION', raising=False)
+    config = replace(TradingConfig().relocated(tmp_path), LOG_MAX_BYTES=1000,
+                     LOG_BACKUP_COUNT=2)
+    logger = setup_logger("rotating", config)
+    for i in range(100):
+        logger.debug(f"record {i:03d} " + "x" * 40)
+    shutdown_logging()
+    logs = sorted(path.name for path in (tmp_path / "logs").iterdir())
+    assert logs == ["rotating.log", "rotating.log.1", "rotating.log.2"]
+    assert all((tmp_path / "logs" / name).stat().st_size <= 1000 for name in logs)
+    assert "record 099" in (tmp_path / "logs" / "rotating.log").read_text()
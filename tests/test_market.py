@@ -0,0 +1,64 @@
+import pytest
+from src.exceptions.trading_exceptions import MarketDataException
+from src.trading import (
+    IBSession, MarketData, OrderManager, SimulatedIB, SimulatorConfig, TickStore
+)
+from src.utils.clock import SimulatedClock
+
+START = 1_700_000_000.0
+
+def make_market(tmp_path, **sim_options) -> MarketData:
+    clock = SimulatedClock(start=START)
+    options = dict(seed=1, price_paths={'MSFT': [100.0, 101.0, 102.0, 103.0]})
+    options.update(sim_options)
+    ib = SimulatedIB(SimulatorConfig(**options), clock)
+    market = MarketData(IBSession(ib=ib), tick_store=TickStore(tmp_path, capacity=1024))
+    assert market.connect(7497)
+    return market
+
+def test_first_price_comes_from_the_feed(tmp_path):
+    market = make_market(tmp_path)
+    assert market.get_market_price("MSFT") == pytest.approx(100.0)
+    assert market.get_market_price("SPX") > 0
+    market.disconnect()
+
+def test_batch_reports_unknown_symbols_as_missing(tmp_path):
+    market = make_market(tmp_path, unknown_symbols={'NOPE'})
+    batch = market.get_market_prices(["SPX", "MSFT", "NOPE", "MSFT"])
+    assert set(batch.prices) == {"SPX", "MSFT"}
+    assert batch.missing == ["NOPE"]
+    market.disconnect()
+
+def test_unknown_symbol_raises(tmp_path):
+    market = make_market(tmp_path, unknown_symbols={'NOPE'})
+    with pytest.raises(MarketDataException):
+        market.get_market_price("NOPE")
+    market.disconnect()
+
+def test_ticks_are_recorded(tmp_path):
+    market = make_market(tmp_path)
+    market.get_market_price("MSFT")
+    market.sleep(1)
+    ticks = market.get_ticks("MSFT")
+    assert ticks.prices()[:4].tolist() == pytest.approx([100.0, 101.0, 102.0, 103.0])
+    timestamps = ticks.ts.tolist()
+    assert timestamps == sorted(timestamps)
+    assert START <= timestamps[0] <= market.clock.time()
+    market.disconnect()
+
+def test_orders_share_the_market_data_connection(tmp_path):
+    market = make_market(tmp_path)
+    orders = OrderManager(market.session)
+    price = market.get_market_price("MSFT")
+    assert orders.place_buy_order("MSFT", 2, price)
+    fill_price = orders.last_result.avg_fill_price
+    assert fill_price == pytest.approx(market.get_market_price("MSFT"), rel=0.05)
+    assert orders.get_positions() == {"MSFT": 2}
+    # One qualified contract per symbol for market data and orders
+    assert orders.session.contracts["MSFT"] is market.get_contract("MSFT")
+    market.disconnect()
+
+def test_connect_settles_on_virtual_time(tmp_path):
+    market = make_market(tmp_path)
+    assert market.clock.time() >= START + 1.0  # The post-connect settle
+    market.disconnect()
@@ -0,0 +1,64 @@
+from datetime import date, datetime
+import pytz
+from src.utils.market_calendar import MarketCalendar
+
+EASTERN = pytz.timezone('US/Eastern')
+
+def at(*args) -> float:
+    return EASTERN.localize(datetime(*args)).timestamp()
+
+def make_calendar() -> MarketCalendar:
+    return MarketCalendar(clock=lambda: at(2026, 10, 14, 12, 0))
+
+def test_good_friday_is_closed():
+    calendar = make_calendar()
+    assert not calendar.is_trading_day(date(2026, 4, 3))
+    assert not calendar.is_trading_day(date(2024, 3, 29))
+    assert calendar.is_trading_day(date(2026, 4, 6))  # Easter Monday trades
+
+def test_juneteenth_is_closed_from_2022():
+    calendar = make_calendar()
+    assert not calendar.is_trading_day(date(2026, 6, 19))
+    assert not calendar.is_trading_day(date(2022, 6, 20))  # Observed Monday
+    assert calendar.is_trading_day(date(2021, 6, 18))
+
+def test_saturday_holiday_is_observed_on_friday():
+    calendar = make_calendar()
+    assert date(2026, 7, 4).weekday() == 5
+    assert not calendar.is_trading_day(date(2026, 7, 3))
+
+def test_new_year_on_saturday_is_not_observed():
+    calendar = make_calendar()
+    assert date(2022, 1, 1).weekday() == 5
+    assert calendar.is_trading_day(date(2021, 12, 31))
+
+def test_early_closes():
+    calendar = make_calendar()
+    day_after_thanksgiving = date(2026, 11, 27)
+    christmas_eve = date(2026, 12, 24)
+    for day in (day_after_thanksgiving, christmas_eve):
+        assert calendar.is_early_close(day)
+        assert calendar.session(day) == (at(day.year, day.month, day.day, 9, 30),
+                                         at(day.year, day.month, day.day, 13, 0))
+    assert not calendar.is_early_close(date(2026, 11, 25))
+    # Christmas Eve on a Saturday has no early close
+    assert not calendar.is_trading_day(date(2022, 12, 24))
+
+def test_special_closures():
+    calendar = make_calendar()
+    assert not calendar.is_trading_day(date(2025, 1, 9))
+    assert not calendar.is_trading_day(date(2018, 12, 5))
+    assert not calendar.is_trading_day(date(2012, 10, 29))
+    assert calendar.is_trading_day(date(2025, 1, 10))
+
+def test_next_open_skips_weekend_and_holiday():
+    calendar = make_calendar()
+    friday_evening = at(2026, 10, 16, 17, 0)
+    assert calendar.next_open(friday_evening) == at(2026, 10, 19, 9, 30)
+    assert calendar.seconds_until_close(at(2026, 10, 17, 12, 0)) == 0.0
+    # Wednesday before Thanksgiving, after the close: next open is Friday
+    assert calendar.next_open(at(2026, 11, 25, 16, 30)) == at(2026, 11, 27, 9, 30)
+    assert calendar.seconds_until_close(at(2026, 11, 26, 12, 0)) == 0.0
+    # Friday after Thanksgiving closes at 13:00
+    assert calendar.seconds_until_close(at(2026, 11, 27, 12, 0)) == 3600.0
+    assert calendar.next_close(at(2026, 11, 26, 12, 0)) == at(2026, 11, 27, 13, 0)
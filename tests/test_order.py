@@ -0,0 +1,77 @@
+from src.trading import IBSession, OrderManager, SimulatedIB, SimulatorConfig
+from src.utils.clock import SimulatedClock
+
+START = 1_700_000_000.0
+
+def make_manager(**sim_options) -> OrderManager:
+    clock = SimulatedClock(start=START)
+    ib = SimulatedIB(SimulatorConfig(seed=1, **sim_options), clock)
+    return OrderManager(IBSession(ib=ib))
+
+def test_buy_order_fills():
+    manager = make_manager()
+    assert manager.place_buy_order("MSFT", 3, 100.0)
+    result = manager.last_result
+    assert result.is_filled
+    assert result.filled == 3
+    assert manager.get_positions() == {"MSFT": 3}
+
+def test_rejected_order_is_not_a_fill():
+    manager = make_manager(reject_symbols={"MSFT"})
+    assert not manager.place_buy_order("MSFT", 1, 100.0)
+    assert manager.last_result.status == "Inactive"
+
+def test_unfilled_order_is_cancelled_at_deadline():
+    manager = make_manager(fill_latency=10.0)
+    assert not manager.place_buy_order("MSFT", 1, 100.0, timeout=2.0)
+    assert manager.last_result.status == "Cancelled"
+    assert manager.last_result.filled == 0
+    # Nothing is left working or tracked
+    assert not manager.tracker._orders
+    assert manager.get_positions() == {}
+
+def test_partial_fill_at_deadline_counts_as_fill():
+    manager = make_manager(fill_latency=10.0, partial_fills=2)
+    assert manager.place_buy_order("MSFT", 2, 100.0, timeout=6.0)
+    result = manager.last_result
+    assert result.status == "Cancelled"
+    assert result.is_partial
+    assert result.filled == 1
+    assert manager.get_positions() == {"MSFT": 1}
+
+def test_insufficient_funds_places_no_order():
+    manager = make_manager(net_liquidation=1000.0)
+    assert not manager.place_buy_order("MSFT", 10, 100.0)
+    assert manager.ib.trades() == []
+
+def count_calls(manager: OrderManager, name: str) -> list:
+    calls = []
+    method = getattr(manager.ib, name)
+
+    def counted(*args, **kwargs):
+        calls.append(args)
+        return method(*args, **kwargs)
+
+    setattr(manager.ib, name, counted)
+    return calls
+
+def test_contract_is_qualified_once():
+    manager = make_manager()
+    qualified = count_calls(manager, 'qualifyContractsAsync')
+    assert manager.place_buy_order("MSFT", 1, 100.0)
+    assert manager.place_buy_order("MSFT", 1, 100.0)
+    assert len(qualified) == 1
+    assert manager.session.contracts["MSFT"].conId
+
+def test_account_summary_is_cached_and_kept_current():
+    manager = make_manager(net_liquidation=10000.0)
+    requests = count_calls(manager, 'reqAccountSummaryAsync')
+    assert manager.get_available_funds() == 5000.0
+    # Pushed updates arrive through accountSummaryEvent, without new requests
+    manager.ib._set_account_value('NetLiquidation', 20000.0)
+    assert manager.get_available_funds() == 10000.0
+    assert len(requests) == 1
+    # A new connection subscribes again
+    manager.ib.disconnectedEvent.emit()
+    assert manager.get_available_funds() == 5000.0
+    assert len(requests) == 2
@@ -0,0 +1,52 @@
+from datetime import datetime
+from src.config import TradingConfig
+from src.utils.clock import SimulatedClock
+from src.utils.reporter import Reporter
+
+class ListJournal:
+    def __init__(self):
+        self.records = []
+
+    def record_transaction(self, transaction: dict) -> None:
+        self.records.append(transaction)
+
+    def close(self) -> None:
+        pass
+
+def saved(symbol: str, price: float) -> dict:
+    return {'date': datetime(2026, 10, 14, 10, 0), 'symbol': symbol, 'price': price,
+            'quantity': 1, 'total_cost': price, 'spx_drop_percentage': 10.0,
+            'screenshot_path': None}
+
+def make_reporter(tmp_path) -> Reporter:
+    return Reporter(ListJournal(), SimulatedClock(start=1_700_000_000.0),
+                    TradingConfig().relocated(tmp_path))
+
+def test_restored_transactions_are_reported_once(tmp_path):
+    reporter = make_reporter(tmp_path)
+    reporter.restore([saved("MSFT", 100.0), saved("AAPL", 200.0)])
+    assert reporter.journal.records == []  # Already journaled before the restart
+
+    csv_path, html_path = reporter.generate_report()
+    reporter.record_transaction("MSFT", 90.0, 1, 20.0)
+    reporter.generate_report()
+    reporter.generate_report()
+
+    rows = csv_path.read_text().splitlines()
+    assert len(rows) == 1 + 3
+    assert [row.split(',')[1] for row in rows[1:]] == ["MSFT", "AAPL", "MSFT"]
+    html = html_path.read_text()
+    assert [f"<tr><th>{index}</th>" in html for index in range(4)] == [True] * 3 + [False]
+    assert len(reporter.journal.records) == 1
+
+def test_failed_html_write_does_not_duplicate_csv_rows(tmp_path):
+    reporter = make_reporter(tmp_path)
+    reporter.record_transaction("MSFT", 90.0, 1, 20.0)
+    html_path = reporter.html_report_path
+    reporter.html_report_path = tmp_path  # A directory: the HTML write fails
+    assert reporter.generate_report() == []
+
+    reporter.html_report_path = html_path
+    csv_path, _ = reporter.generate_report()
+    assert len(csv_path.read_text().splitlines()) == 1 + 1
+    assert "<tr><th>0</th>" in html_path.read_text()
@@ -0,0 +1,31 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.config import TradingConfig
+from src.utils.clock import SimulatedClock
+from src.utils.screenshotter import Screenshotter
+
+def make_screenshotter(tmp_path) -> Screenshotter:
+    return Screenshotter(TradingConfig().relocated(tmp_path))
+
+def test_concurrent_filepaths_are_unique(tmp_path):
+    screenshotter = make_screenshotter(tmp_path)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        paths = list(pool.map(lambda _: screenshotter._filepath("MSFT"), range(2000)))
+    screenshotter.close()
+    assert len(set(paths)) == len(paths)
+
+def test_submit_after_close_frees_its_slot(tmp_path):
+    screenshotter = make_screenshotter(tmp_path)
+    screenshotter.close()
+    for _ in range(screenshotter.config.SCREENSHOT_QUEUE_SIZE + 1):
+        with pytest.raises(RuntimeError):
+            screenshotter.submit("MSFT")
+
+def test_filenames_follow_the_injected_clock(tmp_path):
+    clock = SimulatedClock(start=1_700_000_000.25)
+    screenshotter = Screenshotter(TradingConfig().relocated(tmp_path), clock=clock)
+    first, second = screenshotter._filepath("MSFT"), screenshotter._filepath("MSFT")
+    screenshotter.close()
+    # 2023-11-14 22:13:20.250 UTC
+    assert first.name == "MSFT_20231114_221320_250.png"
+    assert second.name == "MSFT_20231114_221320_250_1.png"
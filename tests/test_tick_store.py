@@ -0,0 +1,68 @@
+from datetime import date, datetime
+import shutil
+import numpy as np
+import pytz
+from src.trading.tick_store import TickStore
+
+DAY = date(2026, 10, 14)
+OPEN = pytz.timezone('US/Eastern').localize(datetime(2026, 10, 14, 9, 30)).timestamp()
+NEXT_DAY = OPEN + 86400.0
+
+def record(store: TickStore, stamps) -> None:
+    for ts in stamps:
+        store.record("MSFT", ts, ts - 0.5, ts + 0.5, ts, 1.0)
+
+def test_wrap_spill_and_rollover_keep_every_tick(tmp_path):
+    store = TickStore(tmp_path, capacity=4)
+    stamps = [OPEN + i for i in range(11)]  # Two spills and a compaction
+    record(store, stamps)
+    # The live window is the latest capacity ticks, in order
+    assert store.window("MSFT").ts.tolist() == stamps[-4:]
+    record(store, [NEXT_DAY])  # Rollover archives and compresses the day
+    store.close()
+
+    day_dir = tmp_path / DAY.isoformat()
+    assert [p.name for p in day_dir.iterdir()] == ["MSFT.npz"]
+    ticks = store.load_day("MSFT", DAY)
+    assert ticks.ts.tolist() == stamps
+    assert ticks.last.tolist() == stamps
+    assert ticks.bid.tolist() == [ts - 0.5 for ts in stamps]
+
+def test_spilled_parts_load_before_the_day_ends(tmp_path):
+    store = TickStore(tmp_path, capacity=4)
+    stamps = [OPEN + i for i in range(10)]
+    record(store, stamps)
+    store.close()
+    # Two full parts written; the last two ticks are still only live
+    assert store.load_day("MSFT", DAY).ts.tolist() == stamps[:8]
+
+def test_restart_continues_the_day(tmp_path):
+    stamps = [OPEN + i for i in range(13)]
+    store = TickStore(tmp_path, capacity=4)
+    record(store, stamps[:6])
+    store.close()
+
+    store = TickStore(tmp_path, capacity=4)
+    record(store, stamps[6:])
+    record(store, [NEXT_DAY])
+    store.close()
+    assert store.load_day("MSFT", DAY).ts.tolist() == stamps
+
+def test_parts_left_by_a_crash_after_compression_are_not_loaded_twice(tmp_path):
+    store = TickStore(tmp_path, capacity=4)
+    stamps = [OPEN + i for i in range(9)]
+    record(store, stamps)
+    store.close()
+    day_dir = tmp_path / DAY.isoformat()
+    saved = tmp_path / "saved"
+    shutil.copytree(day_dir, saved)
+
+    store = TickStore(tmp_path, capacity=4)
+    record(store, [NEXT_DAY])
+    store.close()
+    # Crash between writing the daily file and deleting its parts
+    for part in saved.iterdir():
+        shutil.copy(part, day_dir / part.name)
+    ticks = store.load_day("MSFT", DAY)
+    assert ticks.ts.tolist() == stamps
+    assert np.all(np.diff(ticks.ts) > 0)
@@ -0,0 +1,80 @@
+import pytest
+from ib_insync import Stock, Ticker, util
+from src.strategy.drop_ladder import DropLadder
+from src.trading.triggers import DropTrigger
+from src.utils.clock import SimulatedClock
+
+START = 1_700_000_000.0
+
+class TickerMarket:
+    """The slice of MarketData DropTrigger uses, fed by hand"""
+
+    def __init__(self):
+        self.clock = SimulatedClock(start=START)
+        self.ticker = Ticker(contract=Stock("SPX"))
+
+    def subscribe(self, symbol: str) -> Ticker:
+        return self.ticker
+
+    def ticker_price(self, symbol: str, ticker: Ticker):
+        return ticker.last
+
+    def tick(self, price: float) -> None:
+        self.ticker.last = price
+        self.ticker.updateEvent.emit(self.ticker)
+
+def make_trigger(min_interval: float = 1.0, confirm_ticks: int = 1) -> DropTrigger:
+    ladder = DropLadder(["MSFT"], [10, 20])
+    trigger = DropTrigger(TickerMarket(), "SPX", 100.0, ladder,
+                          min_interval=min_interval, confirm_ticks=confirm_ticks)
+    trigger.start()
+    return trigger
+
+def run(awaitable):
+    return util.getLoop().run_until_complete(awaitable)
+
+def test_updates_are_throttled_to_min_interval():
+    trigger = make_trigger(min_interval=1.0)
+    market = trigger.market
+    for price in (99.0, 98.0, 97.0):
+        market.tick(price)
+    assert trigger.evaluations == 1
+    assert trigger.last_drop == 1.0
+    market.clock.advance(1.0)
+    market.tick(96.0)
+    assert trigger.evaluations == 2
+    trigger.stop()
+
+def test_trailing_evaluation_sees_the_last_tick_of_a_burst():
+    trigger = make_trigger(min_interval=1.0)
+    market = trigger.market
+    market.tick(99.0)
+    market.tick(85.0)  # Throttled: evaluated after min_interval
+    assert trigger.last_drop == 1.0
+    assert run(trigger.wait_async(timeout=5.0)) == 15.0
+    assert trigger.evaluations == 2
+    assert market.clock.time() == START + 1.0
+    trigger.stop()
+
+def test_drop_must_hold_for_confirm_ticks():
+    trigger = make_trigger(min_interval=0.0, confirm_ticks=2)
+    market = trigger.market
+    fired = []
+    trigger.add_listener(fired.append)
+    market.tick(85.0)
+    market.tick(99.0)  # A single bad print does not fire
+    market.tick(85.0)
+    assert fired == []
+    market.tick(86.0)
+    assert fired == [pytest.approx(14.0)]
+    trigger.stop()
+
+def test_firing_without_a_waiter_is_kept_for_the_next_wait():
+    trigger = make_trigger(min_interval=0.0)
+    market = trigger.market
+    market.tick(85.0)  # Fires while nobody waits, e.g. during a trade
+    assert run(trigger.wait_async(timeout=5.0)) == 15.0
+    assert market.clock.time() == START  # Returned at once
+    # Taken: the next wait times out
+    assert run(trigger.wait_async(timeout=5.0)) is None
+    trigger.stop()